@@ -1,10 +1,13 @@
 
-import pandas as pd
 from fyers_apiv3 import fyersModel
-import datetime as dt
-import pytz
 import numpy as np
 import time
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from fyers_candle_store import CandleStore, fetch_ohlc
+from fyers_resample import fetch_resolutions
 
 
 #generate trading session
@@ -14,34 +17,12 @@ access_token = open("access_token.txt",'r').read()
 # Initialize the FyersModel instance with your client_id, access_token, and enable async mode
 fyers = fyersModel.FyersModel(client_id=client_id, is_async=False, token=access_token, log_path="D:\FyiersApiAutomation\logs")
 
+# Local candle store, only bars after the last stored candle are requested
+candle_store = CandleStore()
+
 def fetchOHLC2(ticker,interval,duration):
-    range_from = dt.date.today()-dt.timedelta(duration)
-    range_to = dt.date.today()
-
-    from_date_string = range_from.strftime("%Y-%m-%d")
-    to_date_string = range_to.strftime("%Y-%m-%d")
-    data = {
-        "symbol":ticker,
-        "resolution":interval,
-        "date_format":"1",
-        "range_from":from_date_string,
-        "range_to":to_date_string,
-        "cont_flag":"1"
-    }
-
-    response = fyers.history(data=data)['candles']
-
-    # Create a DataFrame
-    columns = ['Timestamp','Open','High','Low','Close','Volume']
-    df = pd.DataFrame(response, columns=columns)
-
-    # Convert Timestamp to datetime in UTC
-    df['Timestamp2'] = pd.to_datetime(df['Timestamp'],unit='s').dt.tz_localize(pytz.utc)
-
-    # Convert Timestamp to IST
-    ist = pytz.timezone('Asia/Kolkata')
-    df['Timestamp2'] = df['Timestamp2'].dt.tz_convert(ist)
-    df.drop(columns=['Timestamp'], inplace=True)
+    # epoch Timestamp is the time axis, see fyers_epoch.with_ist for an IST column
+    df = fetch_ohlc(fyers, candle_store, ticker, interval, duration)
 
     return (df)
 
@@ -371,10 +352,16 @@ tickers = ['NSE:ABB-EQ','NSE:ACC-EQ','NSE:ABBOTINDIA-EQ','NSE:ADANIENSOL-EQ',
 
 
 def main():
+    # fetch 5 minute bars for the whole universe concurrently (within the API rate limits),
+    # the daily bars are built from them instead of a second history call per ticker
+    ohlc_maps = fetch_resolutions(fyers, tickers, [('5', 5), ('D', 30)], store=candle_store)
+    ohlc_map = ohlc_maps['5']
+    ohlc_day_map = ohlc_maps['D']
+
     for ticker in tickers:
         try:
-            ohlc = fetchOHLC2(ticker, '5',5)
-            ohlc_day = fetchOHLC2(ticker, 'D',30)
+            ohlc = ohlc_map[ticker]
+            ohlc_day = ohlc_day_map[ticker]
             pattern, momentum = candle_pattern(ohlc,ohlc_day,7)
             print("Ticker: ", ticker, ": Pattern: ", pattern, " and Momentum: ",momentum)
             #time.sleep(1)
@@ -3,6 +3,12 @@ import datetime as dt
 from fyers_apiv3 import fyersModel
 import pandas as pd
 import pytz
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from fyers_resample import resample_frame
+from fyers_epoch import with_ist
 
 client_id = open("client_ID.txt",'r').read()
 access_token = open("access_token.txt",'r').read()
@@ -58,13 +64,10 @@ def pivotpoints_today(ohlc_day):
 # Fetch OHLC data using the function
 stock_df = fetchOHLC2("NSE:NIFTY50-INDEX","30",50)
 
-stock_df['Timestamp2'] = pd.to_datetime(stock_df['Timestamp2'])
-stock_df.drop(columns=['Timestamp'], inplace=True)
-stock_df.set_index('Timestamp2', inplace=True)
 print(stock_df)
 
-daily_df = stock_df.resample('D').agg({'Open':'first','High':'max','Low':'min','Close':'last','Volume':'sum'})
-daily_df.dropna(inplace=True)
+# Build daily candles from the 30 minute ones (grouped by IST trading date)
+daily_df = with_ist(resample_frame(stock_df, 'D'))
 print(daily_df)
 
 pivot,r1,r2,r3,s1,s2,s3 = pivotpoints_today(daily_df)
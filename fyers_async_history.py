@@ -0,0 +1,110 @@
+"""
+Async batch history client for scanning a whole ticker universe.
+
+fetch_history_batch() issues the fyers.history calls for many symbols
+concurrently. A TokenBucket keeps the calls inside the broker's
+per-second and per-minute quotas, so a 200 ticker scan takes roughly
+as long as the quota allows instead of ~200 sequential round trips.
+Calls without their own limiter share DEFAULT_LIMITER, so back to back
+batches (e.g. one per resolution) draw on the same quota.
+"""
+
+import asyncio
+import logging
+import time
+import datetime as dt
+
+from fyers_candle_store import candle_columns, candles_to_frame, plan_fetch, sort_unique, history_request
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    asyncio rate limiter with one token bucket per quota, e.g. the fyers
+    limits of 10 calls per second and 200 calls per minute. A call goes
+    through only when every bucket has a token left.
+    """
+
+    def __init__(self, per_second=10, per_minute=200):
+        self.quotas = [(per_second, 1.0), (per_minute, 60.0)]
+        self.tokens = [float(calls) for calls, period in self.quotas]
+        self.updated = time.monotonic()
+        self._lock = None
+        self._loop = None
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self.updated
+        self.updated = now
+        self.tokens = [min(calls, tokens + elapsed * calls / period)
+                       for tokens, (calls, period) in zip(self.tokens, self.quotas)]
+
+    async def acquire(self):
+        # every asyncio.run() has its own loop and a lock belongs to one loop
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._lock = asyncio.Lock()
+            self._loop = loop
+        async with self._lock:
+            while True:
+                self._refill()
+                wait = max((1 - tokens) * period / calls
+                           for tokens, (calls, period) in zip(self.tokens, self.quotas))
+                if wait <= 0:
+                    self.tokens = [tokens - 1 for tokens in self.tokens]
+                    return
+                await asyncio.sleep(wait)
+
+
+DEFAULT_LIMITER = TokenBucket()
+
+
+async def _history(fyers, request):
+    # FyersModel(is_async=True) returns coroutines, the sync client is run on a worker thread
+    if getattr(fyers, 'is_async', False):
+        return await fyers.history(data=request)
+    return await asyncio.to_thread(fyers.history, data=request)
+
+
+async def fetch_history_batch(fyers, symbols, resolution, duration, store=None, limiter=None, concurrency=10, errors=None):
+    """
+    Fetch the last `duration` days of `resolution` candles for every symbol
+    and return {symbol: DataFrame} in the fetchOHLC2 layout (Timestamp is
+    kept). With a CandleStore only the missing bars are requested.
+    Symbols whose request failed are left out of the result, logged and,
+    with an errors dict, recorded there as {symbol: exception}.
+    """
+    if limiter is None:
+        limiter = DEFAULT_LIMITER
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch(symbol):
+        async with semaphore:
+            await limiter.acquire()
+            if store is None:
+                range_from = dt.date.today() - dt.timedelta(duration)
+                request = history_request(symbol, resolution, range_from, dt.date.today())
+                response = await _history(fyers, request)
+                return sort_unique(candle_columns(response['candles']))
+            request, fetch_from_ts, start_ts = plan_fetch(store, symbol, resolution, duration)
+            response = await _history(fyers, request)
+            store.merge(symbol, resolution, response['candles'], fetch_from_ts)
+            return store.window(symbol, resolution, start_ts)
+
+    results = await asyncio.gather(*(fetch(symbol) for symbol in symbols), return_exceptions=True)
+
+    frames = {}
+    for symbol, result in zip(symbols, results):
+        if isinstance(result, Exception):
+            logger.warning("API error for ticker %s: %s", symbol, result)
+            if errors is not None:
+                errors[symbol] = result
+            continue
+        frames[symbol] = candles_to_frame(result)
+    return frames
+
+
+def fetch_history(fyers, symbols, resolution, duration, store=None, limiter=None, concurrency=10, errors=None):
+    """blocking wrapper around fetch_history_batch() for the synchronous scripts"""
+    return asyncio.run(fetch_history_batch(fyers, symbols, resolution, duration, store, limiter, concurrency, errors))
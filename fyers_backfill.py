@@ -0,0 +1,116 @@
+"""
+Chunked history backfill for fyers.history.
+
+The date range is split into fixed windows up front, the windows are
+fetched concurrently while a shared RateLimiter keeps the request rate under
+the broker quota, and the raw candle lists are turned into one frame at the
+end (sorted, duplicated boundary bars dropped) instead of growing a
+DataFrame with pd.concat on every window.
+"""
+
+import threading
+import time
+import datetime as dt
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+
+from fyers_candle_store import COLUMNS, candle_columns, sort_unique, history_request
+from fyers_epoch import ist_midnight
+
+
+class RateLimiter:
+    """thread-safe limiter that lets at most `rate` calls start per second"""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate
+        self._lock = threading.Lock()
+        self._next = time.monotonic()
+
+    def wait(self):
+        with self._lock:
+            start = max(time.monotonic(), self._next)
+            self._next = start + self.interval
+        delay = start - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+
+def plan_windows(from_date, to_date, chunk_days=50):
+    """
+    Split from_date..to_date (both inclusive) into consecutive windows of at
+    most chunk_days days. Windows never share a day, so the only duplicates
+    left to drop are bars the API repeats at a window edge.
+    """
+    windows = []
+    start = from_date
+    while start <= to_date:
+        end = min(start + dt.timedelta(chunk_days - 1), to_date)
+        windows.append((start, end))
+        start = end + dt.timedelta(1)
+    return windows
+
+
+def backfill_candles(fyers, ticker, interval, from_date, to_date=None, chunk_days=50, rate=8, workers=4):
+    """
+    Fetch ticker/interval from from_date to to_date (default today) and
+    return the candles as sorted, de-duplicated column arrays.
+
+    fyers only needs a history(data=...) method, so LocalHistory below can
+    stand in for the real client.
+    """
+    if to_date is None:
+        to_date = dt.date.today()
+    windows = plan_windows(from_date, to_date, chunk_days)
+    limiter = RateLimiter(rate)
+
+    def fetch(window):
+        limiter.wait()
+        return fyers.history(data=history_request(ticker, interval, window[0], window[1]))['candles']
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        chunks = list(executor.map(fetch, windows))
+
+    candles = [candle for chunk in chunks for candle in chunk]
+    return sort_unique(candle_columns(candles))
+
+
+def backfill_frame(fyers, ticker, interval, from_date, to_date=None, chunk_days=50, rate=8, workers=4):
+    """backfill_candles() as a DataFrame with the fyers Timestamp/Open/High/Low/Close/Volume columns"""
+    columns = backfill_candles(fyers, ticker, interval, from_date, to_date, chunk_days, rate, workers)
+    return pd.DataFrame(columns, columns=COLUMNS)
+
+
+class LocalHistory:
+    """
+    Local stand-in for fyers.history serving candles from a DataFrame with an
+    epoch Timestamp column. range_from/range_to are IST dates and both ends
+    are inclusive like the real API. With overlap_days > 0 each response also
+    repeats that many days before range_from, to mimic duplicated window edges.
+    """
+
+    def __init__(self, df, overlap_days=0):
+        self.candles = df[COLUMNS].to_numpy()
+        self.timestamps = df['Timestamp'].to_numpy(dtype=np.int64)
+        self.overlap_days = overlap_days
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def history(self, data):
+        with self._lock:
+            self.calls += 1
+        range_from = dt.datetime.strptime(data['range_from'], "%Y-%m-%d").date() - dt.timedelta(self.overlap_days)
+        range_to = dt.datetime.strptime(data['range_to'], "%Y-%m-%d").date()
+        start = np.searchsorted(self.timestamps, ist_midnight(range_from), side='left')
+        end = np.searchsorted(self.timestamps, ist_midnight(range_to + dt.timedelta(1)), side='left')
+        return {'s': 'ok', 'candles': self.candles[start:end].tolist()}
+
+
+if __name__ == "__main__":
+    # Backfill the bundled 5 minute NIFTY dump through the local stand-in
+    source = pd.read_csv("output_full.csv")
+    local = LocalHistory(source, overlap_days=1)
+    started = time.perf_counter()
+    df = backfill_frame(local, "NSE:NIFTY50-INDEX", "5", dt.date(2025, 1, 1), dt.date(2025, 5, 30), rate=50)
+    print("Fetched {} candles in {} calls, {:.3f}s".format(len(df), local.calls, time.perf_counter() - started))
+    print("Matches source:", np.array_equal(df['Timestamp'].to_numpy(), np.sort(source['Timestamp'].unique())))
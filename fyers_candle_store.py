@@ -0,0 +1,171 @@
+"""
+Local candle store for fyers.history data.
+
+Candles are kept on disk per (symbol, resolution) as columnar .npz files
+(one array per OHLCV column). fetch_ohlc() serves a `duration` window from
+the store and only asks fyers.history for the bars after the last stored
+candle, so a re-run or the next loop cycle costs one small delta call.
+"""
+
+import os
+import datetime as dt
+import numpy as np
+import pandas as pd
+
+from fyers_epoch import ist_midnight, ist_date
+
+
+COLUMNS = ['Timestamp','Open','High','Low','Close','Volume']
+COLUMN_DTYPES = {'Timestamp': np.int64, 'Open': np.float64, 'High': np.float64,
+                 'Low': np.float64, 'Close': np.float64, 'Volume': np.int64}
+
+
+class CandleStore:
+    def __init__(self, root="candle_store"):
+        self.root = root
+        self._cache = {}
+        self._covered_from = {}
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, symbol, resolution):
+        name = "{}_{}.npz".format(symbol.replace(":", "_"), resolution)
+        return os.path.join(self.root, name)
+
+    def load(self, symbol, resolution):
+        """returns dict of column arrays for a symbol/resolution or None if nothing is stored"""
+        key = (symbol, resolution)
+        if key in self._cache:
+            return self._cache[key]
+        path = self._path(symbol, resolution)
+        if not os.path.isfile(path):
+            return None
+        with np.load(path) as npz:
+            data = {col: npz[col] for col in COLUMNS}
+            self._covered_from[key] = int(npz['CoveredFrom'])
+        self._cache[key] = data
+        return data
+
+    def last_timestamp(self, symbol, resolution):
+        data = self.load(symbol, resolution)
+        if data is None or len(data['Timestamp']) == 0:
+            return None
+        return int(data['Timestamp'][-1])
+
+    def covered_from(self, symbol, resolution):
+        """epoch seconds from which the stored candles are complete, None if nothing is stored"""
+        if self.load(symbol, resolution) is None:
+            return None
+        return self._covered_from[(symbol, resolution)]
+
+    def merge(self, symbol, resolution, candles, covered_from):
+        """
+        Merge raw fyers candles ([ts, o, h, l, c, v] rows) fetched from
+        covered_from (epoch seconds) up to now into the store. Newer candles
+        replace stored ones with the same timestamp so a bar that was still
+        forming on the previous fetch gets corrected.
+        """
+        key = (symbol, resolution)
+        new_data = candle_columns(candles)
+
+        old = self.load(symbol, resolution)
+        if old is not None:
+            keep = old['Timestamp'] < covered_from
+            if len(new_data['Timestamp']) > 0:
+                keep &= old['Timestamp'] < new_data['Timestamp'].min()
+            merged = {col: np.concatenate([old[col][keep], new_data[col]]) for col in COLUMNS}
+            covered_from = min(covered_from, self._covered_from[key])
+        else:
+            merged = new_data
+
+        # fyers returns candles in order, but guard against overlapping windows
+        merged = sort_unique(merged)
+
+        path = self._path(symbol, resolution)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, CoveredFrom=np.int64(covered_from), **merged)
+        os.replace(tmp_path, path)
+        self._cache[key] = merged
+        self._covered_from[key] = covered_from
+        return merged
+
+    def window(self, symbol, resolution, start_ts):
+        """returns the stored columns from start_ts (epoch seconds) onwards"""
+        data = self.load(symbol, resolution)
+        if data is None:
+            return candle_columns([])
+        start = np.searchsorted(data['Timestamp'], start_ts, side='left')
+        return {col: data[col][start:] for col in COLUMNS}
+
+
+def candle_columns(candles):
+    """converts raw fyers candles ([ts, o, h, l, c, v] rows) to typed column arrays"""
+    if len(candles) == 0:
+        return {col: np.empty(0, dtype=COLUMN_DTYPES[col]) for col in COLUMNS}
+    raw = np.asarray(candles, dtype=np.float64)
+    return {col: raw[:, i].astype(COLUMN_DTYPES[col]) for i, col in enumerate(COLUMNS)}
+
+
+def sort_unique(columns):
+    """sorts columns by Timestamp keeping the last row for duplicated timestamps"""
+    order = np.argsort(columns['Timestamp'], kind='stable')
+    ts = columns['Timestamp'][order]
+    last = np.ones(len(ts), dtype=bool)
+    last[:-1] = ts[1:] != ts[:-1]
+    return {col: columns[col][order][last] for col in COLUMNS}
+
+
+def history_request(ticker, interval, range_from, range_to):
+    return {
+        "symbol":ticker,
+        "resolution":interval,
+        "date_format":"1",
+        "range_from":range_from.strftime("%Y-%m-%d"),
+        "range_to":range_to.strftime("%Y-%m-%d"),
+        "cont_flag":"1"
+    }
+
+
+def plan_fetch(store, ticker, interval, duration):
+    """
+    Work out the fyers.history request needed to cover the last `duration`
+    days of ticker/interval. Only the days from the last stored candle to
+    today are requested; the full window is requested when the store is
+    empty or does not reach back far enough.
+    Returns (request, fetch_from_ts, start_ts).
+    """
+    range_from = dt.date.today() - dt.timedelta(duration)
+    range_to = dt.date.today()
+    start_ts = ist_midnight(range_from)
+
+    covered_from = store.covered_from(ticker, interval)
+    last_ts = store.last_timestamp(ticker, interval)
+    if covered_from is None or covered_from > start_ts:
+        fetch_from = range_from
+    elif last_ts is None:
+        fetch_from = max(ist_date(covered_from), range_from)
+    else:
+        # refetch the day of the last stored bar, it may have been incomplete
+        fetch_from = max(ist_date(last_ts), range_from)
+    return history_request(ticker, interval, fetch_from, range_to), ist_midnight(fetch_from), start_ts
+
+
+def fetch_candles(fyers, store, ticker, interval, duration):
+    """top up the store for ticker/interval and return the columns covering the last `duration` days"""
+    request, fetch_from_ts, start_ts = plan_fetch(store, ticker, interval, duration)
+    response = fyers.history(data=request)['candles']
+    store.merge(ticker, interval, response, fetch_from_ts)
+    return store.window(ticker, interval, start_ts)
+
+
+def candles_to_frame(columns):
+    """
+    builds the OHLCV DataFrame keyed on the epoch Timestamp column,
+    use fyers_epoch.with_ist() to add an IST datetime column for display
+    """
+    return pd.DataFrame(columns, columns=COLUMNS)
+
+
+def fetch_ohlc(fyers, store, ticker, interval, duration):
+    """store-backed equivalent of the fetchOHLC2 helpers"""
+    return candles_to_frame(fetch_candles(fyers, store, ticker, interval, duration))
@@ -0,0 +1,182 @@
+"""
+Market depth recorder with fixed-size per-symbol ring buffers.
+
+Every symbol gets a DepthRing preallocated for `capacity` records of
+top-5 bid/ask prices and quantities plus totalbuyqty/totalsellqty, so a
+full session on dozens of symbols runs in constant memory (oldest records
+are overwritten). DepthRecorder fills the rings by polling fyers.depth or
+from DepthUpdate/SymbolUpdate websocket messages (on_message), and
+window()/last() export a time range as one sorted array. Ring reads and
+writes are locked, so the polling thread and readers can share a ring.
+"""
+
+import time
+import threading
+import numpy as np
+import pandas as pd
+
+LEVELS = 5
+SESSION_SECONDS = 6 * 3600 + 15 * 60  # 9:15 - 15:30
+
+DEPTH_DTYPE = np.dtype([
+    ('time', np.float64),
+    ('ltp', np.float64),
+    ('bid_price', np.float64, LEVELS),
+    ('bid_qty', np.int32, LEVELS),
+    ('ask_price', np.float64, LEVELS),
+    ('ask_qty', np.int32, LEVELS),
+    ('total_buy_qty', np.int64),
+    ('total_sell_qty', np.int64),
+])
+
+
+def decode_depth(depth, timestamp):
+    """fyers.depth response['d'][symbol] -> DEPTH_DTYPE record"""
+    record = np.zeros((), dtype=DEPTH_DTYPE)
+    record['time'] = timestamp
+    record['ltp'] = depth.get('ltp', np.nan)
+    for side, key in (('bid', 'bids'), ('ask', 'ask')):
+        levels = depth.get(key, [])[:LEVELS]
+        record[side + '_price'][:len(levels)] = [level['price'] for level in levels]
+        record[side + '_qty'][:len(levels)] = [level['volume'] for level in levels]
+    record['total_buy_qty'] = depth.get('totalbuyqty', 0)
+    record['total_sell_qty'] = depth.get('totalsellqty', 0)
+    return record
+
+
+class DepthRing:
+    """preallocated circular buffer of DEPTH_DTYPE records in arrival order, safe to share between threads"""
+
+    def __init__(self, capacity=SESSION_SECONDS):
+        self.data = np.zeros(capacity, dtype=DEPTH_DTYPE)
+        self.next = 0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self.count
+
+    def append(self, record):
+        with self._lock:
+            self.data[self.next] = record
+            self.next = (self.next + 1) % len(self.data)
+            self.count = min(self.count + 1, len(self.data))
+
+    def latest(self):
+        """copy of the most recent record or None"""
+        with self._lock:
+            if self.count == 0:
+                return None
+            return self.data[self.next - 1].copy()
+
+    def _segments(self):
+        # oldest part first: [next:] only holds data once the ring has wrapped
+        if self.count < len(self.data):
+            return [self.data[:self.count]]
+        return [self.data[self.next:], self.data[:self.next]]
+
+    def window(self, start=None, end=None):
+        """copy of the records with start <= time < end (epoch seconds, None = open ended)"""
+        parts = []
+        with self._lock:
+            for segment in self._segments():
+                lo = 0 if start is None else np.searchsorted(segment['time'], start, side='left')
+                hi = len(segment) if end is None else np.searchsorted(segment['time'], end, side='left')
+                parts.append(segment[lo:hi])
+            return np.concatenate(parts) if parts else np.empty(0, dtype=DEPTH_DTYPE)
+
+    def last(self, n):
+        """copy of the n most recent records"""
+        with self._lock:
+            n = min(n, self.count)
+            idx = (self.next - n + np.arange(n)) % len(self.data)
+            return self.data[idx]
+
+
+def depth_frame(records):
+    """flatten DEPTH_DTYPE records to bid_price1..5/bid_qty1..5/... columns"""
+    columns = {'time': records['time'], 'ltp': records['ltp']}
+    for name in ('bid_price', 'bid_qty', 'ask_price', 'ask_qty'):
+        for level in range(LEVELS):
+            columns['{}{}'.format(name, level + 1)] = records[name][:, level]
+    columns['total_buy_qty'] = records['total_buy_qty']
+    columns['total_sell_qty'] = records['total_sell_qty']
+    return pd.DataFrame(columns)
+
+
+class DepthRecorder:
+    """
+    Depth for a list of symbols in per-symbol DepthRings. Either call
+    start() to poll fyers.depth every `interval` seconds (limiter: any
+    object with wait(), e.g. fyers_backfill.RateLimiter), or pass websocket
+    messages to on_message().
+    """
+
+    def __init__(self, fyers, symbols, capacity=SESSION_SECONDS, interval=1.0, limiter=None):
+        self.fyers = fyers
+        self.symbols = list(symbols)
+        self.interval = interval
+        self.limiter = limiter
+        self.rings = {symbol: DepthRing(capacity) for symbol in self.symbols}
+        self.symbol_state = {symbol: (np.nan, 0, 0) for symbol in self.symbols}  # ltp/totals from websocket SymbolUpdate
+        self._stop = threading.Event()
+        self._thread = None
+
+    def poll_once(self):
+        for symbol in self.symbols:
+            if self.limiter is not None:
+                self.limiter.wait()
+            try:
+                response = self.fyers.depth(data={"symbol": symbol, "ohlcv_flag": "1"})
+                depth = response.get('d', {}).get(symbol)
+                if response.get('s') != 'ok' or depth is None:
+                    print("Depth error for", symbol, response.get('message'))
+                    continue
+                record = decode_depth(depth, time.time())
+            except Exception as e:
+                # a failed call (network, bad payload) skips this symbol for one poll, the thread keeps going
+                print("Depth error for", symbol, repr(e))
+                continue
+            self.rings[symbol].append(record)
+
+    def on_message(self, message):
+        """FyersDataSocket callback for DepthUpdate ('dp') and SymbolUpdate ('sf') messages"""
+        symbol = message.get('symbol')
+        if symbol not in self.rings:
+            return
+        if message.get('type') == 'sf':
+            self.symbol_state[symbol] = (message.get('ltp', np.nan), message.get('tot_buy_qty', 0), message.get('tot_sell_qty', 0))
+            return
+        if message.get('type') != 'dp':
+            return
+        record = np.zeros((), dtype=DEPTH_DTYPE)
+        record['time'] = time.time()
+        for side in ('bid', 'ask'):
+            record[side + '_price'] = [message.get('{}_price{}'.format(side, level), 0) for level in range(1, LEVELS + 1)]
+            record[side + '_qty'] = [message.get('{}_size{}'.format(side, level), 0) for level in range(1, LEVELS + 1)]
+        record['ltp'], record['total_buy_qty'], record['total_sell_qty'] = self.symbol_state[symbol]
+        self.rings[symbol].append(record)
+
+    def window(self, symbol, start=None, end=None):
+        return self.rings[symbol].window(start, end)
+
+    def frame(self, symbol, start=None, end=None):
+        return depth_frame(self.window(symbol, start, end))
+
+    def _run(self):
+        next_poll = time.monotonic()
+        while not self._stop.is_set():
+            self.poll_once()
+            next_poll += self.interval
+            self._stop.wait(max(0.0, next_poll - time.monotonic()))
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
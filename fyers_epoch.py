@@ -0,0 +1,78 @@
+"""
+Epoch-second time helpers for the candle data layer.
+
+Candles are kept with int64 epoch seconds (the fyers Timestamp) as the time
+axis. Bucketing to 5m/15m/60m/daily bars and IST date lookups are plain
+integer arithmetic on that axis. with_ist() adds a tz-aware IST column only
+when a frame is printed, plotted or written to CSV.
+"""
+
+import datetime as dt
+import numpy as np
+import pandas as pd
+
+IST_OFFSET = 19800  # seconds between UTC and IST
+DAY = 86400
+NSE_OPEN = 9 * 3600 + 15 * 60
+MCX_OPEN = 9 * 3600
+DAILY = ('D', '1D')
+
+
+def ist_midnight(day):
+    """epoch seconds of 00:00 IST on the given date"""
+    return (day - dt.date(1970, 1, 1)).days * DAY - IST_OFFSET
+
+
+def ist_date(ts):
+    """IST calendar date of an epoch timestamp"""
+    return dt.date(1970, 1, 1) + dt.timedelta(days=(int(ts) + IST_OFFSET) // DAY)
+
+
+def ist_day_number(timestamps):
+    """IST trading date of each timestamp as days since 1970-01-01"""
+    return (np.asarray(timestamps) + IST_OFFSET) // DAY
+
+
+def ist_seconds_of_day(timestamps):
+    """seconds after IST midnight of each timestamp"""
+    return (np.asarray(timestamps) + IST_OFFSET) % DAY
+
+
+def resolution_seconds(resolution):
+    if resolution in DAILY:
+        return DAY
+    return int(resolution) * 60
+
+
+def session_start(symbol):
+    """session open in seconds after IST midnight"""
+    if symbol.startswith("MCX:"):
+        return MCX_OPEN
+    return NSE_OPEN
+
+
+def bucket_timestamps(timestamps, resolution, session_open=NSE_OPEN):
+    """
+    epoch label of the `resolution` bar each timestamp falls into.
+    Intraday buckets start at session_open, daily bars are labelled 00:00 UTC
+    of the IST trading date like fyers daily candles.
+    """
+    day = ist_day_number(timestamps) * DAY
+    if resolution in DAILY:
+        return day
+    size = resolution_seconds(resolution)
+    offset = (np.asarray(timestamps) + IST_OFFSET - day - session_open) // size * size
+    return day + session_open + offset - IST_OFFSET
+
+
+def to_ist(timestamps):
+    """tz-aware IST DatetimeIndex for epoch seconds"""
+    index = pd.DatetimeIndex(np.asarray(timestamps, dtype='int64').astype('datetime64[s]'))
+    return index.tz_localize('UTC').tz_convert('Asia/Kolkata')
+
+
+def with_ist(df, column='Timestamp2', source='Timestamp'):
+    """returns a copy of df with an IST datetime column built from the epoch column"""
+    df = df.copy()
+    df[column] = to_ist(df[source].to_numpy())
+    return df
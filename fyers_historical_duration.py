@@ -3,6 +3,7 @@ import pandas as pd
 from fyers_apiv3 import fyersModel
 import pytz
 import datetime as dt
+from ohlcv_dataset import OHLCVDataset
 
 client_id = open("client_ID.txt",'r').read()
 access_token = open("access_token.txt",'r').read()
@@ -38,10 +39,12 @@ def fetchOHLC2(ticker,interval,duration):
     ist = pytz.timezone('Asia/Kolkata')
     df['Timestamp2'] = df['Timestamp2'].dt.tz_convert(ist)
 
-    #return (df)
-    return df[['Timestamp2', 'Open', 'High', 'Low', 'Close', 'Volume']]
+    # Timestamp (epoch) is kept, the dataset partitions on it
+    return df[['Timestamp', 'Timestamp2', 'Open', 'High', 'Low', 'Close', 'Volume']]
 
-response_df = fetchOHLC2("MCX:CRUDEOIL25OCTFUT","30",2)
+ticker, interval = "MCX:CRUDEOIL25OCTFUT", "30"
+response_df = fetchOHLC2(ticker, interval, 2)
 print(response_df)
 
-response_df.to_csv('nifty50_5min.csv',index=False)
+# Merge into ohlcv_dataset/MCX_CRUDEOIL25OCTFUT/30/ instead of overwriting a shared CSV
+OHLCVDataset().write(ticker, interval, response_df)
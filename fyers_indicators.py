@@ -0,0 +1,186 @@
+"""
+Array kernels for the ATR/supertrend indicators used by the strategies.
+
+The functions take plain numpy arrays (or anything np.asarray accepts) and
+reproduce the pandas versions in fyers_strategy_indicator_ohlc.py bar for
+bar: true range with a NaN first bar, ATR as ewm(com=n, min_periods=n).mean()
+and the supertrend band/line rules including their NaN handling. The band
+recursion is sequential, so supertrend() is one pass over Python floats
+instead of three df.loc loops.
+
+wilder_smooth() is Wilder's smoothing seeded with the SMA of the first n
+values, run by pandas' compiled ewm(alpha=1/n, adjust=False); the Wilder
+ATR of the backtests, wilder_rsi()/rsi(wilder=True) and adx() are built on it.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def true_range(high, low, close, first_bar_range=False):
+    """
+    max(high-low, |high-prev close|, |low-prev close|); the first bar is NaN,
+    or high-low with first_bar_range=True
+    """
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    close = np.asarray(close, dtype=np.float64)
+    prev_close = np.concatenate([[np.nan], close[:-1]])
+    tr = np.maximum(np.abs(high - low), np.abs(high - prev_close))
+    tr = np.maximum(tr, np.abs(low - prev_close))
+    if first_bar_range and len(tr):
+        tr[0] = high[0] - low[0]
+    return tr
+
+
+def ewm_mean(values, com=None, min_periods=0, alpha=None, adjust=True):
+    """Series.ewm(com=com or alpha=alpha, min_periods=min_periods, adjust=adjust).mean() of an array"""
+    values = pd.Series(np.asarray(values, dtype=np.float64))
+    return values.ewm(com=com, alpha=alpha, min_periods=min_periods, adjust=adjust).mean().to_numpy()
+
+
+def atr(high, low, close, n, wilder=False):
+    """
+    Average True Range, ewm(com=n, min_periods=n) of the true range, or
+    with wilder=True wilder_smooth() of it (mean of TR[1..n], then Wilder smoothing)
+    """
+    if wilder:
+        return wilder_smooth(true_range(high, low, close), n)
+    return ewm_mean(true_range(high, low, close), n, n)
+
+
+def wilder_smooth(values, n, start=1):
+    """
+    Wilder's smoothing: the mean of values[start:start+n] at index start+n-1,
+    then (prev*(n-1) + value)/n, NaN before the seed. start=1 skips the
+    first bar of a true range or price difference.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    out = np.full(len(values), np.nan)
+    seed = start + n - 1
+    if seed >= len(values):
+        return out
+    series = values[seed:].copy()
+    series[0] = np.mean(values[start:seed+1])
+    # adjust=False with alpha=1/n is prev*(1-1/n) + value/n, the same recursion
+    out[seed:] = pd.Series(series).ewm(alpha=1.0 / n, adjust=False).mean().to_numpy()
+    return out
+
+
+def directional_movement(high, low):
+    """(+DM, -DM): the larger of the up move and the down move if positive, else 0 (0 on the first bar)"""
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    up = np.concatenate([[np.nan], high[1:] - high[:-1]])
+    down = np.concatenate([[np.nan], low[:-1] - low[1:]])
+    plus = np.where((up > down) & (up > 0), up, 0.0)
+    minus = np.where((down > up) & (down > 0), down, 0.0)
+    return plus, minus
+
+
+def adx(high, low, close, n=14):
+    """
+    Wilder's ADX. Returns (+DI, -DI, DX, ADX) arrays: TR, +DM and -DM are
+    Wilder-smoothed from bar 1, DX = 100*|+DI - -DI|/(+DI + -DI) and ADX is
+    DX Wilder-smoothed from its first value (first ADX at bar 2n-1).
+    """
+    tr = true_range(high, low, close)
+    plus, minus = directional_movement(high, low)
+    tr_n = wilder_smooth(tr, n)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        di_plus = 100 * (wilder_smooth(plus, n) / tr_n)
+        di_minus = 100 * (wilder_smooth(minus, n) / tr_n)
+        dx = 100 * (np.abs(di_plus - di_minus) / np.abs(di_plus + di_minus))
+    return di_plus, di_minus, dx, wilder_smooth(dx, n, start=n)
+
+
+def wilder_rsi(close, n=14):
+    """Wilder's RSI: 100 - 100/(1 + smoothed gain/smoothed loss), first value at bar n"""
+    close = np.asarray(close, dtype=np.float64)
+    delta = np.concatenate([[np.nan], np.diff(close)])
+    gain = wilder_smooth(np.where(delta > 0, delta, 0.0), n)
+    loss = wilder_smooth(np.where(delta < 0, -delta, 0.0), n)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return 100 - (100 / (1 + gain / loss))
+
+
+def rsi(close, n=14, wilder=False, min_periods=1):
+    """
+    RSI of a close array, one pass either way: rolling(n, min_periods)
+    means of gains and losses with the first bar's change counted as 0
+    (rsi() of the strategy), or with wilder=True wilder_rsi(). A window
+    with no down moves is 100 and one with no moves at all is NaN (0/0).
+    """
+    if wilder:
+        return wilder_rsi(close, n)
+    delta = pd.Series(np.asarray(close, dtype=np.float64)).diff()
+    gain = delta.where(delta > 0, 0)
+    loss = -delta.where(delta < 0, 0)
+    rs = gain.rolling(window=n, min_periods=min_periods).mean() / loss.rolling(window=n, min_periods=min_periods).mean()
+    return (100 - (100 / (1 + rs))).to_numpy(copy=True)
+
+
+def supertrend(high, low, close, period=7, multiplier=3):
+    """
+    Supertrend of OHLC arrays. Returns (final_upper, final_lower, strend,
+    direction) arrays; direction is 1 while the line is the lower band,
+    -1 while it is the upper band and 0 before the first band cross.
+    """
+    close = np.asarray(close, dtype=np.float64)
+    mid = (np.asarray(high, dtype=np.float64) + np.asarray(low, dtype=np.float64)) / 2
+    band = multiplier * atr(high, low, close, period)
+    basic_upper = (mid + band).tolist()
+    basic_lower = (mid - band).tolist()
+    upper = list(basic_upper)
+    lower = list(basic_lower)
+    c = close.tolist()
+    strend = [np.nan] * len(c)
+
+    # comparisons against NaN are False and min()/max() keep their first
+    # argument on NaN, exactly like the scalar loops this replaces
+    started = False
+    for i in range(period, len(c)):
+        if c[i-1] <= upper[i-1]:
+            upper[i] = min(basic_upper[i], upper[i-1])
+        if c[i-1] >= lower[i-1]:
+            lower[i] = max(basic_lower[i], lower[i-1])
+
+        if not started:
+            # the line starts at the first close crossing a final band
+            if c[i-1] <= upper[i-1] and c[i] > upper[i]:
+                strend[i] = lower[i]
+                started = True
+            elif c[i-1] >= lower[i-1] and c[i] < lower[i]:
+                strend[i] = upper[i]
+                started = True
+            continue
+
+        prev = strend[i-1]
+        if prev == upper[i-1] and c[i] <= upper[i]:
+            strend[i] = upper[i]
+        elif prev == upper[i-1] and c[i] >= upper[i]:
+            strend[i] = lower[i]
+        elif prev == lower[i-1] and c[i] >= lower[i]:
+            strend[i] = lower[i]
+        elif prev == lower[i-1] and c[i] <= lower[i]:
+            strend[i] = upper[i]
+
+    upper = np.asarray(upper)
+    lower = np.asarray(lower)
+    strend = np.asarray(strend)
+    direction = np.where(strend == lower, 1, np.where(strend == upper, -1, 0)).astype(np.int8)
+    return upper, lower, strend, direction
+
+
+def supertrend_frame(DF, period=7, multiplier=3):
+    """DF copy with ATR, BasicUpper/Lower, FinalUpper/Lower, Strend and Direction columns"""
+    df = DF.copy()
+    df['ATR'] = atr(df['High'], df['Low'], df['Close'], period)
+    df["BasicUpper"] = ((df['High'] + df['Low']) / 2) + multiplier * df['ATR']
+    df["BasicLower"] = ((df['High'] + df['Low']) / 2) - multiplier * df['ATR']
+    upper, lower, strend, direction = supertrend(df['High'], df['Low'], df['Close'], period, multiplier)
+    df['FinalUpper'] = upper
+    df['FinalLower'] = lower
+    df['Strend'] = strend
+    df['Direction'] = direction
+    return df
@@ -0,0 +1,77 @@
+"""
+Moving averages over raw arrays: SMA, weighted (any weights), linear WMA,
+HMA and TEMA.
+
+Everything works along the last axis, so the same call handles one close
+series or a symbols x bars matrix (fyers_universe.align). The windowed
+averages are one whole-array multiply-add per lag, adding the newest bar
+first exactly like the scalar loops in indicators/sma_2.py and wma_1.py,
+so the values are identical to theirs rather than equal up to rounding
+(a cumulative sum or np.convolve would sum in a different order). Bars
+before the first full window are NaN.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def _weighted_sum(values, weights):
+    # sum of values[i-j] * weights[j] for j = 0, 1, ... added in that order
+    values = np.asarray(values, dtype=np.float64)
+    bars = values.shape[-1]
+    period = len(weights)
+    out = np.full(values.shape, np.nan)
+    if period < 1 or bars < period:
+        return out
+    total = np.zeros(values.shape[:-1] + (bars - period + 1,))
+    for j, weight in enumerate(weights):
+        lagged = values[..., period-1-j:bars-j]
+        total = total + (lagged if weight is None else lagged * weight)
+    out[..., period-1:] = total
+    return out
+
+
+def sma(values, period):
+    """mean of the last `period` bars"""
+    return _weighted_sum(values, [None] * period) / period
+
+
+def wma(values, weights):
+    """
+    weighted moving average, weights[0] for the current bar, weights[1]
+    for the one before, ... (e.g. [0.4, 0.3, 0.2, 0.1]); the weights are
+    used as given, pass them normalised for an average
+    """
+    return _weighted_sum(values, list(weights))
+
+
+def linear_weights(period):
+    """period, period-1, ..., 1 normalised to sum to 1, newest bar first"""
+    return [(period - j) / (period * (period + 1) / 2) for j in range(period)]
+
+
+def linear_wma(values, period):
+    """linearly weighted moving average, the current bar weighted `period`, the oldest 1"""
+    return wma(values, linear_weights(period))
+
+
+def hma(values, period):
+    """Hull moving average: linear WMA over sqrt(period) of 2*WMA(period/2) - WMA(period)"""
+    raw = 2 * linear_wma(values, max(period // 2, 1)) - linear_wma(values, period)
+    return linear_wma(raw, max(int(np.sqrt(period)), 1))
+
+
+def ema(values, span, adjust=False):
+    """ewm(span=span, adjust=adjust).mean() along the last axis"""
+    values = np.asarray(values, dtype=np.float64)
+    rows = np.atleast_2d(values)
+    out = pd.DataFrame(rows.T).ewm(span=span, adjust=adjust).mean().to_numpy().T
+    return out.reshape(values.shape)
+
+
+def tema(values, span, adjust=False):
+    """triple EMA: 3*EMA - 3*EMA(EMA) + EMA(EMA(EMA))"""
+    ema1 = ema(values, span, adjust)
+    ema2 = ema(ema1, span, adjust)
+    ema3 = ema(ema2, span, adjust)
+    return 3 * ema1 - 3 * ema2 + ema3
@@ -1,6 +1,8 @@
 
 import datetime
+import time
 from fyers_apiv3 import fyersModel
+from fyers_depth_recorder import DepthRecorder
 
 #generate trading session
 client_id = open("client_ID.txt",'r').read()
@@ -33,6 +35,13 @@ print("Upper Circuit: ", upper_ckt)
 lower_ckt = response['d'][symbol]['lower_ckt']
 print("Lower Circuit: ", lower_ckt)
 
+# Record top-5 depth for several symbols into fixed-size ring buffers (one snapshot per symbol per second)
+depth_recorder = DepthRecorder(fyers, ["NSE:NIFTY25JUNFUT", "NSE:BANKNIFTY25JUNFUT"], interval=1.0)
+depth_recorder.start()
+time.sleep(10)
+depth_recorder.stop()
+print(depth_recorder.frame("NSE:NIFTY25JUNFUT"))
+
 
 # Fetch order details
 orders = fyers.orderbook()
@@ -1,6 +1,7 @@
 
 import datetime
 from fyers_apiv3 import fyersModel
+from fyers_quote_service import QuoteService
 
 #generate trading session
 client_id = open("client_ID.txt",'r').read()
@@ -10,70 +11,19 @@ access_token = open("access_token.txt",'r').read()
 fyers = fyersModel.FyersModel(client_id=client_id, is_async=False, token=access_token, log_path="D:\FyiersApiAutomation\logs")
 
 
-# Fetch quote details
-data = {
-    "symbols":"NSE:SBIN-EQ,NSE:YESBANK-EQ"
-}
-response = fyers.quotes(data=data)
-print(response)
-
-stockname = response['d'][0]['n']
-print("Stockname: ", stockname)
-
-exchange = response['d'][0]['v']['exchange']
-print("Exchange: ", exchange)
-
-today_high_price = response['d'][0]['v']['high_price']
-print("Today High Price: ", today_high_price)
-
-today_low_price = response['d'][0]['v']['low_price']
-print("Today Low Price: ", today_low_price)
-
-today_open_price = response['d'][0]['v']['open_price']
-print("Today Open Price: ", today_open_price)
-
-prev_close_price = response['d'][0]['v']['prev_close_price']
-print("Prev Close Price: ", prev_close_price)
-
-today_volume = response['d'][0]['v']['volume']
-print("Today Volume: ", today_volume)
-
-ltp = response['d'][0]['v']['lp']
-print("LTP: ", ltp)
-
-bid = response['d'][0]['v']['bid']
-print("Bid: ", bid)
-
-ask = response['d'][0]['v']['ask']
-print("Ask: ", ask)
-
-
-stockname2 = response['d'][1]['n']
-print("Stockname: ", stockname2)
-
-exchange2 = response['d'][1]['v']['exchange']
-print("Exchange: ", exchange2)
-
-today_high_price2 = response['d'][1]['v']['high_price']
-print("Today High Price: ", today_high_price2)
-
-today_low_price2 = response['d'][1]['v']['low_price']
-print("Today Low Price: ", today_low_price2)
-
-today_open_price2 = response['d'][1]['v']['open_price']
-print("Today Open Price: ", today_open_price2)
-
-prev_close_price2 = response['d'][1]['v']['prev_close_price']
-print("Prev Close Price: ", prev_close_price2)
-
-today_volume2 = response['d'][1]['v']['volume']
-print("Today Volume: ", today_volume2)
-
-ltp2 = response['d'][1]['v']['lp']
-print("LTP: ", ltp2)
-
-bid2 = response['d'][1]['v']['bid']
-print("Bid: ", bid2)
-
-ask2 = response['d'][1]['v']['ask']
-print("Ask: ", ask2)
+# Fetch quote details, batched and cached (one quote call per refresh cycle for every user of `quotes`)
+quotes = QuoteService(fyers, ttl=1.0)
+snapshot = quotes.snapshot(["NSE:SBIN-EQ", "NSE:YESBANK-EQ"])
+print(snapshot.frame())
+
+for stockname in snapshot.symbols:
+    quote = snapshot[stockname]
+    print("Stockname: ", stockname)
+    print("Today High Price: ", quote['high'])
+    print("Today Low Price: ", quote['low'])
+    print("Today Open Price: ", quote['open'])
+    print("Prev Close Price: ", quote['prev_close'])
+    print("Today Volume: ", quote['volume'])
+    print("LTP: ", quote['ltp'])
+    print("Bid: ", quote['bid'])
+    print("Ask: ", quote['ask'])
@@ -0,0 +1,143 @@
+"""
+Batched fyers quotes with a shared short-TTL cache.
+
+QuoteService.snapshot(symbols) asks fyers.quotes only for the symbols whose
+cached quote is older than `ttl`, packing them into calls of at most
+MAX_SYMBOLS_PER_CALL symbols, and returns a QuoteSnapshot backed by one
+structured array. Strategy code, strike resolution and P&L marking that
+share one QuoteService therefore share one quote call per refresh cycle.
+"""
+
+import time
+import threading
+import numpy as np
+import pandas as pd
+
+MAX_SYMBOLS_PER_CALL = 50  # fyers quotes API limit
+
+# (column, key in response['d'][i]['v'], dtype)
+QUOTE_FIELDS = [
+    ('ltp', 'lp', np.float64),
+    ('bid', 'bid', np.float64),
+    ('ask', 'ask', np.float64),
+    ('open', 'open_price', np.float64),
+    ('high', 'high_price', np.float64),
+    ('low', 'low_price', np.float64),
+    ('prev_close', 'prev_close_price', np.float64),
+    ('change', 'ch', np.float64),
+    ('change_pct', 'chp', np.float64),
+    ('volume', 'volume', np.int64),
+    ('timestamp', 'tt', np.int64),
+]
+QUOTE_DTYPE = np.dtype([(name, dtype) for name, key, dtype in QUOTE_FIELDS])
+
+
+def empty_quotes(count):
+    """QUOTE_DTYPE array with NaN prices and zero volume/timestamp"""
+    quotes = np.zeros(count, dtype=QUOTE_DTYPE)
+    for name, key, dtype in QUOTE_FIELDS:
+        if np.dtype(dtype).kind == 'f':
+            quotes[name] = np.nan
+    return quotes
+
+
+def decode_quotes(response, symbols):
+    """
+    fyers.quotes response -> QUOTE_DTYPE array aligned with symbols.
+    Symbols missing from the response or reported with an error stay NaN.
+    """
+    quotes = empty_quotes(len(symbols))
+    position = {symbol: i for i, symbol in enumerate(symbols)}
+    for item in response.get('d', []):
+        i = position.get(item.get('n'))
+        values = item.get('v', {})
+        if i is None or item.get('s', 'ok') != 'ok' or 'lp' not in values:
+            continue
+        for name, key, dtype in QUOTE_FIELDS:
+            value = values.get(key)
+            if value is not None:
+                quotes[name][i] = value
+    return quotes
+
+
+class QuoteSnapshot:
+    """quotes of a list of symbols taken in one refresh cycle"""
+
+    def __init__(self, symbols, quotes):
+        self.symbols = list(symbols)
+        self.quotes = quotes
+        self.position = {symbol: i for i, symbol in enumerate(self.symbols)}
+
+    def __getitem__(self, symbol):
+        return self.quotes[self.position[symbol]]
+
+    def __contains__(self, symbol):
+        return symbol in self.position
+
+    def ltp(self, symbol):
+        return float(self.quotes['ltp'][self.position[symbol]])
+
+    def ltps(self, symbols=None):
+        """ltp array for symbols (default all, in snapshot order)"""
+        if symbols is None:
+            return self.quotes['ltp']
+        return self.quotes['ltp'][[self.position[symbol] for symbol in symbols]]
+
+    def frame(self):
+        df = pd.DataFrame({name: self.quotes[name] for name in QUOTE_DTYPE.names})
+        df.insert(0, 'symbol', self.symbols)
+        return df
+
+
+class QuoteService:
+    """
+    Thread-safe quote cache in front of fyers.quotes. limiter may be any
+    object with a wait() method (e.g. fyers_backfill.RateLimiter), called
+    before every quote call.
+    """
+
+    def __init__(self, fyers, ttl=1.0, batch_size=MAX_SYMBOLS_PER_CALL, limiter=None):
+        self.fyers = fyers
+        self.ttl = ttl
+        self.batch_size = batch_size
+        self.limiter = limiter
+        self.cache = {}  # symbol -> (fetched_at, QUOTE_DTYPE record)
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def _fetch(self, symbols):
+        now = time.monotonic()
+        for start in range(0, len(symbols), self.batch_size):
+            batch = symbols[start:start + self.batch_size]
+            if self.limiter is not None:
+                self.limiter.wait()
+            self.calls += 1
+            response = self.fyers.quotes(data={"symbols": ",".join(batch)})
+            if response.get('s') not in (None, 'ok'):
+                print("Quote error for", batch, response.get('message'))
+                continue
+            for symbol, quote in zip(batch, decode_quotes(response, batch)):
+                self.cache[symbol] = (now, quote)
+
+    def snapshot(self, symbols, max_age=None):
+        """QuoteSnapshot of symbols, refreshing only quotes older than max_age (default ttl)"""
+        if max_age is None:
+            max_age = self.ttl
+        symbols = list(dict.fromkeys(symbols))
+        with self._lock:
+            now = time.monotonic()
+            stale = [symbol for symbol in symbols
+                     if symbol not in self.cache or now - self.cache[symbol][0] >= max_age]
+            if stale:
+                self._fetch(stale)
+            quotes = empty_quotes(len(symbols))
+            for i, symbol in enumerate(symbols):
+                if symbol in self.cache:
+                    quotes[i] = self.cache[symbol][1]
+        return QuoteSnapshot(symbols, quotes)
+
+    def quote(self, symbol, max_age=None):
+        return self.snapshot([symbol], max_age)[symbol]
+
+    def ltp(self, symbol, max_age=None):
+        return self.snapshot([symbol], max_age).ltp(symbol)
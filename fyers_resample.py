@@ -0,0 +1,99 @@
+"""
+Multi-resolution fetch planning and local resampling.
+
+Instead of asking fyers.history for every resolution a script needs, the
+finest resolution is fetched once per symbol and the coarser ones are
+built locally. Intraday buckets are anchored at the session open (9:15 for
+NSE, 9:00 for MCX) like the broker's own candles, and daily bars are
+labelled the way fyers labels them (00:00 UTC of the trading date).
+
+Note: daily bars built from intraday candles close at the last traded
+price, which can differ slightly from the exchange's official close.
+"""
+
+import datetime as dt
+import numpy as np
+
+from fyers_candle_store import COLUMNS, candles_to_frame
+from fyers_async_history import fetch_history
+from fyers_epoch import DAILY, NSE_OPEN, bucket_timestamps, ist_midnight, resolution_seconds, session_start
+
+INTRADAY_MAX_DAYS = 100  # longest range fyers serves per intraday history request
+
+
+def resample_columns(columns, resolution, session_open=NSE_OPEN):
+    """
+    Aggregate sorted OHLCV column arrays into `resolution` bars:
+    first open, max high, min low, last close and summed volume per bucket.
+    """
+    buckets = bucket_timestamps(columns['Timestamp'], resolution, session_open)
+    if len(buckets) == 0:
+        return {col: columns[col][:0] for col in COLUMNS}
+    starts = np.concatenate([[0], np.flatnonzero(np.diff(buckets)) + 1])
+    ends = np.concatenate([starts[1:], [len(buckets)]])
+    return {
+        'Timestamp': buckets[starts],
+        'Open': columns['Open'][starts],
+        'High': np.maximum.reduceat(columns['High'], starts),
+        'Low': np.minimum.reduceat(columns['Low'], starts),
+        'Close': columns['Close'][ends - 1],
+        'Volume': np.add.reduceat(columns['Volume'], starts),
+    }
+
+
+def resample_frame(df, resolution, session_open=NSE_OPEN):
+    """resample_columns() for a DataFrame with an epoch Timestamp column"""
+    columns = {col: df[col].to_numpy() for col in COLUMNS}
+    return candles_to_frame(resample_columns(columns, resolution, session_open))
+
+
+def can_derive(resolution, base):
+    """True if `resolution` bars can be built from `base` bars"""
+    if resolution == base:
+        return True
+    if base in DAILY:
+        return False
+    return resolution_seconds(resolution) % resolution_seconds(base) == 0
+
+
+def plan_fetches(requirements):
+    """
+    Plan history calls for a list of (resolution, duration) requirements.
+    Returns {base_resolution: (duration, [(resolution, duration), ...])}
+    where every listed resolution is built from the single base fetch.
+    Daily history longer than one intraday request allows gets its own fetch.
+    """
+    pending = sorted(requirements, key=lambda req: resolution_seconds(req[0]))
+    plan = {}
+    for resolution, duration in pending:
+        for base, (base_duration, derived) in plan.items():
+            if can_derive(resolution, base) and (base in DAILY or duration <= INTRADAY_MAX_DAYS):
+                plan[base] = (max(base_duration, duration), derived + [(resolution, duration)])
+                break
+        else:
+            plan[resolution] = (duration, [(resolution, duration)])
+    return plan
+
+
+def fetch_resolutions(fyers, symbols, requirements, store=None, errors=None):
+    """
+    Fetch every (resolution, duration) in requirements for all symbols with
+    one history call per symbol and base resolution.
+    Returns {resolution: {symbol: DataFrame}}; failed calls go to errors
+    as {base resolution: {symbol: exception}}.
+    """
+    results = {}
+    for base, (duration, derived) in plan_fetches(requirements).items():
+        failed = {}
+        frames = fetch_history(fyers, symbols, base, duration, store=store, errors=failed)
+        if errors is not None and failed:
+            errors[base] = failed
+        for resolution, res_duration in derived:
+            start_ts = ist_midnight(dt.date.today() - dt.timedelta(res_duration))
+            results[resolution] = {}
+            for symbol, df in frames.items():
+                window = df[df['Timestamp'] >= start_ts].reset_index(drop=True)
+                if resolution != base:
+                    window = resample_frame(window, resolution, session_start(symbol))
+                results[resolution][symbol] = window
+    return results
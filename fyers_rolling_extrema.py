@@ -0,0 +1,84 @@
+"""
+Rolling highest-high / lowest-low in O(n) and the range indicators built on them.
+
+rolling_max()/rolling_min() use the van Herk/Gil-Werman block scheme: the
+series is cut into blocks of `period` bars, a running max is taken forwards
+and backwards inside every block, and the max of a window is the max of
+the backward value at its first bar and the forward value at its last bar.
+That is two accumulates and one np.maximum over the whole array however
+long the lookback, instead of `period` comparisons per bar. Both work along
+the last axis, so a symbols x bars matrix (fyers_universe.align) is done
+in one call.
+
+Windows are the `period` bars ending at each bar, NaN before the first full
+window; a NaN inside a window makes that window NaN.
+"""
+
+import numpy as np
+
+
+def _rolling_extreme(values, period, accumulate, combine, pad):
+    values = np.asarray(values, dtype=np.float64)
+    bars = values.shape[-1]
+    out = np.full(values.shape, np.nan)
+    if period < 1 or bars < period:
+        return out
+    # pad to whole blocks with a value that never wins
+    blocks = -(-bars // period)
+    padded = np.full(values.shape[:-1] + (blocks * period,), pad)
+    padded[..., :bars] = values
+    shaped = padded.reshape(values.shape[:-1] + (blocks, period))
+    forward = accumulate(shaped, axis=-1).reshape(padded.shape)
+    backward = accumulate(shaped[..., ::-1], axis=-1)[..., ::-1].reshape(padded.shape)
+    # window [i-period+1, i]: backward from its first bar, forward up to its last
+    out[..., period-1:] = combine(backward[..., :bars-period+1], forward[..., period-1:bars])
+    return out
+
+
+def rolling_max(values, period):
+    """highest value of the last `period` bars at every bar"""
+    return _rolling_extreme(values, period, np.maximum.accumulate, np.maximum, -np.inf)
+
+
+def rolling_min(values, period):
+    """lowest value of the last `period` bars at every bar"""
+    return _rolling_extreme(values, period, np.minimum.accumulate, np.minimum, np.inf)
+
+
+def donchian(high, low, period=20):
+    """(upper, middle, lower) Donchian channel: highest high, midpoint, lowest low"""
+    upper = rolling_max(high, period)
+    lower = rolling_min(low, period)
+    return upper, (upper + lower) / 2, lower
+
+
+def _range_position(high, low, close, period):
+    highest = rolling_max(high, period)
+    lowest = rolling_min(low, period)
+    close = np.asarray(close, dtype=np.float64)
+    span = highest - lowest
+    # a window with no range has no position inside it
+    span = np.where(span == 0, np.nan, span)
+    return highest, lowest, close, span
+
+
+def stochastic(high, low, close, period=14, smooth=3):
+    """
+    (%K, %D): %K = 100*(close - lowest low)/(highest high - lowest low) over
+    `period` bars, %D the mean of the last `smooth` %K values; NaN where
+    the window has no range.
+    """
+    highest, lowest, close, span = _range_position(high, low, close, period)
+    k = (close - lowest) * 100 / span
+    # K[i] + K[i-1] + ... summed left to right like the scalar loop
+    total = k.copy()
+    total[..., :smooth-1] = np.nan
+    for lag in range(1, smooth):
+        total[..., smooth-1:] = total[..., smooth-1:] + k[..., smooth-1-lag:k.shape[-1]-lag]
+    return k, total / smooth
+
+
+def williams_r(high, low, close, period=14):
+    """Williams %R: -100*(highest high - close)/(highest high - lowest low), NaN on no range"""
+    highest, lowest, close, span = _range_position(high, low, close, period)
+    return -100 * (highest - close) / span
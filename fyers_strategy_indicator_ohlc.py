@@ -1,10 +1,10 @@
-
 import pandas as pd
 from fyers_apiv3 import fyersModel
-import datetime as dt
-import pytz
-import numpy as np
 import time
+from fyers_candle_store import CandleStore, fetch_ohlc
+from fyers_async_history import fetch_history
+import fyers_indicators
+import fyers_streaming
 
 #generate trading session
 client_id = open("client_ID.txt",'r').read()
@@ -13,34 +13,12 @@ access_token = open("access_token.txt",'r').read()
 # Initialize the FyersModel instance with your client_id, access_token, and enable async mode
 fyers = fyersModel.FyersModel(client_id=client_id, is_async=False, token=access_token, log_path="D:\FyiersApiAutomation\logs")
 
-def fetchOHLC2(ticker,interval,duration):
-    range_from = dt.date.today()-dt.timedelta(duration)
-    range_to = dt.date.today()
-
-    from_date_string = range_from.strftime("%Y-%m-%d")
-    to_date_string = range_to.strftime("%Y-%m-%d")
-    data = {
-        "symbol":ticker,
-        "resolution":interval,
-        "date_format":"1",
-        "range_from":from_date_string,
-        "range_to":to_date_string,
-        "cont_flag":"1"
-    }
-
-    response = fyers.history(data=data)['candles']
-
-    # Create a DataFrame
-    columns = ['Timestamp','Open','High','Low','Close','Volume']
-    df = pd.DataFrame(response, columns=columns)
-
-    # Convert Timestamp to datetime in UTC
-    df['Timestamp2'] = pd.to_datetime(df['Timestamp'],unit='s').dt.tz_localize(pytz.utc)
+# Local candle store, only bars after the last stored candle are requested
+candle_store = CandleStore()
 
-    # Convert Timestamp to IST
-    ist = pytz.timezone('Asia/Kolkata')
-    df['Timestamp2'] = df['Timestamp2'].dt.tz_convert(ist)
-    df.drop(columns=['Timestamp'], inplace=True)
+def fetchOHLC2(ticker,interval,duration):
+    # epoch Timestamp is the time axis, see fyers_epoch.with_ist for an IST column
+    df = fetch_ohlc(fyers, candle_store, ticker, interval, duration)
 
     return (df)
 
@@ -48,63 +26,46 @@ def fetchOHLC2(ticker,interval,duration):
 
 def atr(DF,n):
     "function to calculate True Range and Average True Range"
-    df = DF.copy()
-    df['High-Low']=abs(df['High']-df['Low'])
-    df['High-PrevClose']=abs(df['High']-df['Close'].shift(1))
-    df['Low-PrevClose']=abs(df['Low']-df['Close'].shift(1))
-    df['TR']=df[['High-Low','High-PrevClose','Low-PrevClose']].max(axis=1,skipna=False)
-    df['ATR'] = df['TR'].ewm(com=n,min_periods=n).mean()
-    return df['ATR']
+    return pd.Series(fyers_indicators.atr(DF['High'],DF['Low'],DF['Close'],n), index=DF.index, name='ATR')
 
 def supertrend(DF,period=7,multiplier=3):
-    df = DF.copy()
-    df['ATR'] = atr(df,period)
-    df["BasicUpper"]=((df['High']+df['Low'])/2) + multiplier*df['ATR']
-    df["BasicLower"]=((df['High']+df['Low'])/2) - multiplier*df['ATR']
-    df["FinalUpper"]=df["BasicUpper"]
-    df["FinalLower"]=df["BasicLower"]
-    ind = df.index
-    for i in range(period,len(df)):
-        if df['Close'][i-1]<=df['FinalUpper'][i-1]:
-            df.loc[ind[i],'FinalUpper']=min(df['BasicUpper'][i],df['FinalUpper'][i-1])
-        else:
-            df.loc[ind[i],'FinalUpper']=df['BasicUpper'][i]
-    for i in range(period,len(df)):
-        if df['Close'][i-1]>=df['FinalLower'][i-1]:
-            df.loc[ind[i],'FinalLower']=max(df['BasicLower'][i],df['FinalLower'][i-1])
-        else:
-            df.loc[ind[i],'FinalLower']=df['BasicLower'][i]
-    df['Strend']=np.nan
-    for test in range(period,len(df)):
-        if df['Close'][test-1]<=df['FinalUpper'][test-1] and df['Close'][test]>df['FinalUpper'][test]:
-            df.loc[ind[test],'Strend']=df['FinalLower'][test]
-            break
-        if df['Close'][test-1]>=df['FinalLower'][test-1] and df['Close'][test]<df['FinalLower'][test]:
-            df.loc[ind[test],'Strend']=df['FinalUpper'][test]
-            break
-    for i in range(test+1,len(df)):
-        if df['Strend'][i-1]==df['FinalUpper'][i-1] and df['Close'][i]<=df['FinalUpper'][i]:
-            df.loc[ind[i],'Strend']=df['FinalUpper'][i]
-        elif  df['Strend'][i-1]==df['FinalUpper'][i-1] and df['Close'][i]>=df['FinalUpper'][i]:
-            df.loc[ind[i],'Strend']=df['FinalLower'][i]
-        elif df['Strend'][i-1]==df['FinalLower'][i-1] and df['Close'][i]>=df['FinalLower'][i]:
-            df.loc[ind[i],'Strend']=df['FinalLower'][i]
-        elif df['Strend'][i-1]==df['FinalLower'][i-1] and df['Close'][i]<=df['FinalLower'][i]:
-            df.loc[ind[i],'Strend']=df['FinalUpper'][i]
-    return df['Strend']
-
-
-def rsi(df, period):
-    delta = df['Close'].diff()
-    gain = delta.where(delta > 0, 0)
-    loss = -delta.where(delta < 0, 0)
-    avg_gain = gain.rolling(window=period, min_periods=1).mean()
-    avg_loss = loss.rolling(window=period, min_periods=1).mean()
-    rs = avg_gain / avg_loss
-    rsi = 100 - (100 / (1 + rs))
-    df['rsi'] = rsi
+    # single pass over numpy arrays, identical to the former df.loc loops bar for bar
+    final_upper, final_lower, strend, direction = fyers_indicators.supertrend(DF['High'],DF['Low'],DF['Close'],period,multiplier)
+    return pd.Series(strend, index=DF.index, name='Strend')
+
+
+def rsi(df, period, wilder=False):
+    # rolling (min_periods=1) means of gains/losses, or Wilder's RSI with wilder=True
+    df['rsi'] = fyers_indicators.rsi(df['Close'], period, wilder)
     return df['rsi']
 
+def update_indicators(ticker, ohlc):
+    """
+    supertrend(7,3) and rsi(14, rsi_wilder) of the last bar of ohlc, updating the ticker's
+    streaming indicators with only the bars that arrived since the last cycle. The state
+    covers every bar since start-up, not only the fetched window, so the values can differ
+    from supertrend(ohlc,7,3)/rsi(ohlc,14) by their longer warm-up.
+    """
+    state = indicator_state.get(ticker)
+    if state is None:
+        state = indicator_state[ticker] = {'st': fyers_streaming.Supertrend(7,3), 'rsi': fyers_streaming.RSI(14, wilder=rsi_wilder),
+                                           'snapshot': None, 'forming_ts': None}
+    else:
+        # rewind the forming candle fed last cycle, it may have changed since
+        state['st'].restore(state['snapshot'][0])
+        state['rsi'].restore(state['snapshot'][1])
+
+    new_bars = ohlc if state['forming_ts'] is None else ohlc[ohlc['Timestamp'] >= state['forming_ts']]
+    completed = new_bars.iloc[:-1]
+    for high, low, close in zip(completed['High'].tolist(), completed['Low'].tolist(), completed['Close'].tolist()):
+        state['st'].update(high, low, close)
+        state['rsi'].update(close)
+    # state before the forming candle, restored next cycle even if no bar has completed yet
+    last = new_bars.iloc[-1]
+    state['forming_ts'] = last['Timestamp']
+    state['snapshot'] = (state['st'].snapshot(), state['rsi'].snapshot())
+    return state['st'].update(float(last['High']), float(last['Low']), float(last['Close'])), state['rsi'].update(float(last['Close']))
+
 def placeOrder(inst ,t_type,qty,order_type,price=0, price_stop=0):
     exch = inst[:3]
     symb = inst[4:]
@@ -143,19 +104,22 @@ def placeOrder(inst ,t_type,qty,order_type,price=0, price_stop=0):
 
 
 def main(capital):
+    # fetch the whole universe concurrently (within the API rate limits) before checking signals
+    ohlc_map = fetch_history(fyers, tickers, "5", 5, store=candle_store)
+
     #initialise the indicator
     for ticker in tickers:
         print("Checking for: ",ticker)
         try:
-            ohlc = fetchOHLC2(ticker,"5",5)
-            ohlc["st1"] = supertrend(ohlc,7,3)
-            ohlc['rsi'] = rsi(ohlc,14)
+            ohlc = ohlc_map[ticker]
+            # streaming supertrend(7,3)/rsi(14) of the last bar, in constant time per new bar
+            st1, rsi_now = update_indicators(ticker, ohlc)
             quantity = int(capital/ohlc["Close"].iloc[-1])
             quantity = round(quantity,0)
             print(quantity)
 
             #Check if BUY Stoploss is hit or supertrend changes
-            if (indicator_dir[ticker][0] == "BUY") and ((ohlc['Low'].iloc[-1] < indicator_dir[ticker][2]) or ohlc['st1'].iloc[-1] > ohlc['Close'].iloc[-1]):
+            if (indicator_dir[ticker][0] == "BUY") and ((ohlc['Low'].iloc[-1] < indicator_dir[ticker][2]) or st1 > ohlc['Close'].iloc[-1]):
                 print(ticker, " BUY stoploss is hit")
                 oid = placeOrder(ticker ,"SELL",quantity,"MARKET",price=0, price_stop=0)
                 indicator_dir[ticker][0] = 0
@@ -163,7 +127,7 @@ def main(capital):
                 indicator_dir[ticker][2] = 0
 
             #check if SELL stoploss is hit or supertrend changes
-            elif (indicator_dir[ticker][0] == "SELL") and ((ohlc['High'].iloc[-1] > indicator_dir[ticker][2]) or ohlc['st1'].iloc[-1] < ohlc['Close'].iloc[-1]):
+            elif (indicator_dir[ticker][0] == "SELL") and ((ohlc['High'].iloc[-1] > indicator_dir[ticker][2]) or st1 < ohlc['Close'].iloc[-1]):
                 print(ticker, " SELL stoploss is hit")
                 oid = placeOrder(ticker ,"BUY",quantity,"MARKET",price=0, price_stop=0)
                 indicator_dir[ticker][0] = 0
@@ -171,7 +135,7 @@ def main(capital):
                 indicator_dir[ticker][2] = 0
 
             #BUY to be taken if st1 is green, rsi > 20 and either in no trade or SELL trade
-            if (ohlc['st1'].iloc[-1] < ohlc['Close'].iloc[-1]) and (ohlc['rsi'].iloc[-1] > 20) and (indicator_dir[ticker][0] == 0):
+            if (st1 < ohlc['Close'].iloc[-1]) and (rsi_now > 20) and (indicator_dir[ticker][0] == 0):
                 print(ticker, " Take BUY trade")
                 oid = placeOrder(ticker ,"BUY",quantity,"MARKET",price=0, price_stop=0)
                 indicator_dir[ticker][0] = "BUY"
@@ -180,7 +144,7 @@ def main(capital):
                 indicator_dir[ticker][2] = stoploss
 
             #SELL to be taken if st1 is red, rsi < 70 and either in no trade or BUY trade
-            elif (ohlc['st1'].iloc[-1] > ohlc['Close'].iloc[-1]) and (ohlc['rsi'].iloc[-1] < 70) and (indicator_dir[ticker][0] == 0):
+            elif (st1 > ohlc['Close'].iloc[-1]) and (rsi_now < 70) and (indicator_dir[ticker][0] == 0):
                 print(ticker, " Take SELL trade")
                 oid = placeOrder(ticker ,"SELL",quantity,"MARKET",price=0, price_stop=0)
                 indicator_dir[ticker][0] = "SELL"
@@ -245,7 +209,9 @@ tickers = ['NSE:ABB-EQ','NSE:ACC-EQ','NSE:AUBANK-EQ','NSE:ABBOTINDIA-EQ','NSE:AD
            'NSE:ZEEL-EQ','NSE:ZOMATO-EQ','NSE:ZYDUSLIFE-EQ']
 
 capital = 5000 #position size
+rsi_wilder = False #rolling mean rsi the 20/70 thresholds were tuned on, True for Wilder's RSI (seeded average, then Wilder smoothing)
 indicator_dir = {} #directory to store super trend status for each ticker
+indicator_state = {} #streaming supertrend/rsi state for each ticker, seeded from the first fetch
 
 for ticker in tickers:
     indicator_dir[ticker] = [0,0,0]  #(1 current trade) 0/BUY/SELL # (2 entry price)  # (3 sl price) 0.5% of entry price
@@ -0,0 +1,312 @@
+"""
+Incremental indicators with constant work per new bar.
+
+Each indicator is seeded once from history with run() and then fed one bar
+at a time with update(). The state is a handful of floats plus, for the
+rolling indicators, a deque of the last `period` inputs. Every update()
+returns what the batch function gives for the last bar of the full series:
+the recursive ones (EWM, ATR, Supertrend, Wilder RSI) use the same
+recurrences and agree bit for bit, the rolling ones (RSI from rolling
+means, Bollinger) use running sums and agree up to float rounding:
+
+    EWM         Series.ewm(com/span/alpha, min_periods, adjust).mean()
+    ATR         fyers_indicators.atr (EWM or Wilder smoothing)
+    Supertrend  fyers_indicators.supertrend
+    RSI         rsi() in fyers_strategy_indicator_ohlc.py (rolling means of gains/losses)
+                or fyers_indicators.wilder_rsi
+    EMA         Series.ewm(span=span).mean()
+    Bollinger   rolling(period).mean() +/- multiplier * rolling(period).std()
+
+snapshot() returns a picklable copy of the state and restore() puts it
+back, e.g. to rewind the still-forming last candle before its final
+version arrives.
+"""
+
+import copy
+import math
+from collections import deque
+import numpy as np
+
+
+class StreamingIndicator:
+    """snapshot/restore and batch run() shared by the indicators below"""
+
+    def snapshot(self):
+        return copy.deepcopy(self.__dict__)
+
+    def restore(self, state):
+        self.__dict__.update(copy.deepcopy(state))
+        return self
+
+    def run(self, *columns):
+        """update() with every row of the given arrays, returning the outputs as an array"""
+        columns = [np.asarray(column, dtype=np.float64).tolist() for column in columns]
+        return np.asarray([self.update(*row) for row in zip(*columns)])
+
+
+class EWM(StreamingIndicator):
+    """exponentially weighted mean, the recurrence of pandas' ewm().mean()"""
+
+    def __init__(self, com=None, span=None, alpha=None, min_periods=0, adjust=True):
+        if alpha is None:
+            if com is None:
+                com = (span - 1) / 2.0
+            alpha = 1.0 / (1.0 + com)
+        self.decay = 1.0 - alpha
+        self.new_wt = 1.0 if adjust else alpha
+        self.adjust = adjust
+        self.min_periods = max(min_periods, 1)
+        self.weighted = np.nan
+        self.old_wt = 1.0
+        self.nobs = 0
+        self.value = np.nan
+
+    def update(self, x):
+        is_obs = x == x
+        self.nobs += is_obs
+        if self.weighted == self.weighted:
+            self.old_wt *= self.decay
+            if is_obs:
+                if self.weighted != x:
+                    self.weighted = (self.old_wt * self.weighted + self.new_wt * x) / (self.old_wt + self.new_wt)
+                self.old_wt = self.old_wt + self.new_wt if self.adjust else 1.0
+        elif is_obs:
+            self.weighted = x
+        self.value = self.weighted if self.nobs >= self.min_periods else np.nan
+        return self.value
+
+
+class RollingMean(StreamingIndicator):
+    """Series.rolling(period, min_periods).mean() from a running sum, equal up to float rounding"""
+
+    def __init__(self, period, min_periods=None):
+        self.period = period
+        self.min_periods = max(period if min_periods is None else min_periods, 1)
+        self.window = deque()
+        self.nobs = 0
+        self.sum = 0.0
+        self.value = np.nan
+
+    def update(self, x):
+        self.window.append(x)
+        if len(self.window) > self.period:
+            old = self.window.popleft()
+            if old == old:
+                self.nobs -= 1
+                self.sum = self.sum - old if self.nobs else 0.0
+        if x == x:
+            self.nobs += 1
+            self.sum += x
+        self.value = self.sum / self.nobs if self.nobs >= self.min_periods else np.nan
+        return self.value
+
+
+class RollingVar(StreamingIndicator):
+    """Series.rolling(period, min_periods).var(ddof) from Welford updates, equal up to float rounding"""
+
+    def __init__(self, period, min_periods=None, ddof=1):
+        self.period = period
+        self.min_periods = max(period if min_periods is None else min_periods, 1)
+        self.ddof = ddof
+        self.window = deque()
+        self.nobs = 0
+        self.mean = 0.0
+        self.ssqdm = 0.0
+        self.value = np.nan
+
+    def update(self, x):
+        self.window.append(x)
+        if len(self.window) > self.period:
+            old = self.window.popleft()
+            if old == old:
+                self.nobs -= 1
+                if self.nobs:
+                    delta = old - self.mean
+                    self.mean -= delta / self.nobs
+                    self.ssqdm -= delta * (old - self.mean)
+                else:
+                    self.mean = self.ssqdm = 0.0
+        if x == x:
+            self.nobs += 1
+            delta = x - self.mean
+            self.mean += delta / self.nobs
+            self.ssqdm += delta * (x - self.mean)
+        if self.nobs < self.min_periods or self.nobs <= self.ddof:
+            self.value = np.nan
+        else:
+            # rounding can leave a constant window slightly below zero
+            self.value = max(self.ssqdm / (self.nobs - self.ddof), 0.0)
+        return self.value
+
+
+class ATR(StreamingIndicator):
+    """
+    Average True Range, EWM (com=n) smoothing or with wilder=True
+    fyers_indicators.wilder_smooth: the mean of the first n true ranges,
+    then Wilder smoothing
+    """
+
+    def __init__(self, n, wilder=False):
+        self.n = n
+        self.wilder = wilder
+        if wilder:
+            self.ewm = EWM(alpha=1.0 / n, adjust=False)
+            self.seed = []
+        else:
+            self.ewm = EWM(com=n, min_periods=n)
+        self.bars = 0
+        self.prev_close = np.nan
+        self.tr = np.nan
+        self.value = np.nan
+
+    def update(self, high, low, close):
+        # any NaN (e.g. no previous close on the first bar) makes TR NaN, as in the batch version
+        ranges = (abs(high - low), abs(high - self.prev_close), abs(low - self.prev_close))
+        self.tr = max(ranges) if all(r == r for r in ranges) else np.nan
+        self.prev_close = close
+        self.bars += 1
+        if not self.wilder:
+            self.value = self.ewm.update(self.tr)
+        elif self.bars == 1:
+            # wilder_smooth skips the first bar's true range
+            self.value = np.nan
+        elif len(self.seed) < self.n:
+            self.seed.append(self.tr)
+            self.value = self.ewm.update(np.mean(self.seed)) if len(self.seed) == self.n else np.nan
+        else:
+            self.value = self.ewm.update(self.tr)
+        return self.value
+
+
+class Supertrend(StreamingIndicator):
+    """supertrend line, final bands and direction (1 lower band, -1 upper band, 0 not started)"""
+
+    def __init__(self, period=7, multiplier=3):
+        self.period = period
+        self.multiplier = multiplier
+        self.atr = ATR(period)
+        self.bars = 0
+        self.close = np.nan
+        self.final_upper = np.nan
+        self.final_lower = np.nan
+        self.value = np.nan
+        self.started = False
+        self.direction = 0
+
+    def update(self, high, low, close):
+        mid = (high + low) / 2
+        band = self.multiplier * self.atr.update(high, low, close)
+        upper, lower = mid + band, mid - band
+        prev_close, prev_upper, prev_lower, prev = self.close, self.final_upper, self.final_lower, self.value
+        strend = np.nan
+        if self.bars >= self.period:
+            if prev_close <= prev_upper:
+                upper = min(upper, prev_upper)
+            if prev_close >= prev_lower:
+                lower = max(lower, prev_lower)
+            if not self.started:
+                if prev_close <= prev_upper and close > upper:
+                    strend = lower
+                    self.started = True
+                elif prev_close >= prev_lower and close < lower:
+                    strend = upper
+                    self.started = True
+            elif prev == prev_upper and close <= upper:
+                strend = upper
+            elif prev == prev_upper and close >= upper:
+                strend = lower
+            elif prev == prev_lower and close >= lower:
+                strend = lower
+            elif prev == prev_lower and close <= lower:
+                strend = upper
+        self.bars += 1
+        self.close, self.final_upper, self.final_lower, self.value = close, upper, lower, strend
+        self.direction = 1 if strend == lower else -1 if strend == upper else 0
+        return self.value
+
+
+class RSI(StreamingIndicator):
+    """
+    RSI from rolling (min_periods=1) means of gains and losses, as rsi() in
+    the strategy, or with wilder=True Wilder's RSI (fyers_indicators.wilder_rsi):
+    the mean of the first `period` gains/losses, then Wilder smoothing
+    """
+
+    def __init__(self, period, wilder=False):
+        self.period = period
+        self.wilder = wilder
+        if wilder:
+            self.gain = EWM(alpha=1.0 / period, adjust=False)
+            self.loss = EWM(alpha=1.0 / period, adjust=False)
+            self.seed = []
+        else:
+            self.gain = RollingMean(period, min_periods=1)
+            self.loss = RollingMean(period, min_periods=1)
+        self.prev_close = np.nan
+        self.value = np.nan
+
+    def update(self, close):
+        delta = close - self.prev_close
+        self.prev_close = close
+        if self.wilder:
+            avg_gain, avg_loss = self._wilder(delta)
+        else:
+            # delta.where(delta > 0, 0) and -delta.where(delta < 0, 0), including the -0.0 losses
+            avg_gain = self.gain.update(delta if delta > 0 else 0.0)
+            avg_loss = self.loss.update(-(delta if delta < 0 else 0.0))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rs = np.float64(avg_gain) / avg_loss
+            self.value = float(100 - (100 / (1 + rs)))
+        return self.value
+
+    def _wilder(self, delta):
+        if delta != delta:
+            # no change on the first bar
+            return np.nan, np.nan
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+        if len(self.seed) < self.period:
+            self.seed.append((gain, loss))
+            if len(self.seed) < self.period:
+                return np.nan, np.nan
+            # the smoothing starts from the plain mean of the first `period` changes
+            gain = np.mean([g for g, l in self.seed])
+            loss = np.mean([l for g, l in self.seed])
+        return self.gain.update(gain), self.loss.update(loss)
+
+
+class EMA(StreamingIndicator):
+    """Series.ewm(span=span).mean()"""
+
+    def __init__(self, span, min_periods=0):
+        self.ewm = EWM(span=span, min_periods=min_periods)
+        self.value = np.nan
+
+    def update(self, close):
+        self.value = self.ewm.update(close)
+        return self.value
+
+
+class Bollinger(StreamingIndicator):
+    """middle band (rolling mean) and upper/lower bands at multiplier rolling std (ddof=1)"""
+
+    def __init__(self, period=20, multiplier=2.0):
+        self.multiplier = multiplier
+        self.mean = RollingMean(period)
+        self.var = RollingVar(period)
+        self.middle = self.upper = self.lower = self.std = np.nan
+        self.value = np.nan
+
+    def update(self, close):
+        self.middle = self.mean.update(close)
+        self.std = math.sqrt(self.var.update(close))
+        self.upper = self.middle + self.std * self.multiplier
+        self.lower = self.middle - self.std * self.multiplier
+        self.value = self.middle
+        return self.value
+
+    def percent_b(self, close):
+        return (close - self.lower) / (self.upper - self.lower)
+
+    def bandwidth(self):
+        return (self.upper - self.lower) / self.middle
@@ -0,0 +1,186 @@
+"""
+Supertrend for many (period, multiplier) pairs in one pass.
+
+supertrend_grid() computes the True Range once, the ATR once per distinct
+period and then runs the band recursion of every pair together: one
+vectorized step per bar over a pairs x bars array. A sweep of hundreds of
+pairs therefore costs about as much as a few single supertrend calls.
+
+The repo's scripts use different ATRs and band rules, and each is kept
+exactly so a script gets the same numbers from the grid as from its own loop:
+
+    atr='ewm'          ewm(com=n, min_periods=n), NaN first TR  (fyers_indicators)
+    atr='sma'          rolling(n).mean()                       (heikin-ashi_supertrend.py)
+    atr='wilder'       SMA of TR[1..n] then (prev*(n-1)+TR)/n  (heikin_ashi_backtest.py)
+    atr='sma_partial'  mean of the last n TRs, fewer at start  (supertrend_area_calculator.py)
+
+    rule='fyers'    final bands + first band cross starts the line (fyers_indicators.supertrend)
+    rule='ha'       close beyond the previous band flips, bands ratchet while it holds
+    rule='classic'  final bands, the line follows the band the close respects
+    rule='area'     final bands from bar 1, close beyond a band sets the direction
+"""
+
+import itertools
+import numpy as np
+import pandas as pd
+
+from fyers_indicators import ewm_mean, true_range, wilder_smooth
+
+ATR_METHODS = ('ewm', 'sma', 'wilder', 'sma_partial')
+RULES = ('fyers', 'ha', 'classic', 'area')
+
+
+def param_grid(periods, multipliers):
+    """every (period, multiplier) pair of the two lists"""
+    return list(itertools.product(periods, multipliers))
+
+
+def average_true_range(tr, period, method='ewm'):
+    """ATR of a True Range array by one of ATR_METHODS"""
+    if method == 'ewm':
+        return ewm_mean(tr, period, period)
+    if method == 'sma':
+        return pd.Series(tr).rolling(window=period).mean().to_numpy()
+    if method == 'wilder':
+        return wilder_smooth(tr, period)
+    if method == 'sma_partial':
+        atr = np.empty(len(tr))
+        for i in range(min(period, len(tr))):
+            atr[i] = np.mean(tr[:i+1])
+        if len(tr) >= period:
+            atr[period-1:] = np.lib.stride_tricks.sliding_window_view(tr, period).mean(axis=-1)
+        return atr
+    raise ValueError("unknown ATR method: {}".format(method))
+
+
+class SupertrendGrid:
+    """
+    pairs x bars arrays of final upper/lower bands, supertrend line and
+    direction (1 up, -1 down, 0 none yet); grid[(period, multiplier)]
+    gives the (supertrend, direction) rows of one pair.
+    """
+
+    def __init__(self, params, upper, lower, supertrend, direction):
+        self.params = list(params)
+        self.upper = upper
+        self.lower = lower
+        self.supertrend = supertrend
+        self.direction = direction
+        self.row = {pair: i for i, pair in enumerate(self.params)}
+
+    def __getitem__(self, pair):
+        i = self.row[pair]
+        return self.supertrend[i], self.direction[i]
+
+    def frame(self, index=None):
+        """Supertrend_{period}_{multiplier} and Direction_{period}_{multiplier} columns"""
+        columns = {}
+        for (period, multiplier), i in self.row.items():
+            columns['Supertrend_{}_{}'.format(period, multiplier)] = self.supertrend[i]
+            columns['Direction_{}_{}'.format(period, multiplier)] = self.direction[i]
+        return pd.DataFrame(columns, index=index)
+
+
+def supertrend_grid(high, low, close, params, atr='ewm', rule='fyers'):
+    """SupertrendGrid of every (period, multiplier) in params for one OHLC series"""
+    if rule not in RULES:
+        raise ValueError("unknown supertrend rule: {}".format(rule))
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    close = np.asarray(close, dtype=np.float64)
+    params = list(params)
+    periods = np.array([period for period, multiplier in params])
+    multipliers = np.array([multiplier for period, multiplier in params], dtype=np.float64)
+
+    # TR once, ATR once per distinct period
+    tr = true_range(high, low, close, first_bar_range=(atr != 'ewm'))
+    atr_by_period = {period: average_true_range(tr, period, atr) for period in sorted(set(periods.tolist()))}
+    atr_rows = np.array([atr_by_period[period] for period in periods.tolist()]).reshape(len(params), len(close))
+
+    # bar-major pairs: row i of each array is bar i for every pair
+    hl2 = (high + low) / 2
+    upper = np.ascontiguousarray((hl2 + (multipliers[:, None] * atr_rows)).T)
+    lower = np.ascontiguousarray((hl2 - (multipliers[:, None] * atr_rows)).T)
+    supertrend = np.full(upper.shape, np.nan)
+    direction = np.zeros(upper.shape, dtype=np.int8)
+    _RECURSIONS[rule](close, upper, lower, supertrend, direction, periods)
+    return SupertrendGrid(params, upper.T, lower.T, supertrend.T, direction.T)
+
+
+def _fyers(close, upper, lower, supertrend, direction, periods):
+    # min()/max() of the scalar version keep their first argument unless the second beats it
+    started = np.zeros(len(periods), dtype=bool)
+    for i in range(1, len(close)):
+        active = i >= periods
+        c0, c1 = close[i-1], close[i]
+        pu, pl, prev = upper[i-1], lower[i-1], supertrend[i-1]
+        u = np.where(active & (c0 <= pu) & (pu < upper[i]), pu, upper[i])
+        l = np.where(active & (c0 >= pl) & (pl > lower[i]), pl, lower[i])
+        upper[i], lower[i] = u, l
+        up_cross = active & ~started & (c0 <= pu) & (c1 > u)
+        down_cross = active & ~started & ~up_cross & (c0 >= pl) & (c1 < l)
+        on_upper = started & (prev == pu)
+        on_lower = started & ~on_upper & (prev == pl)
+        to_upper = down_cross | (on_upper & (c1 <= u)) | (on_lower & (c1 < l))
+        to_lower = up_cross | (on_upper & (c1 > u)) | (on_lower & (c1 >= l))
+        supertrend[i] = np.where(to_upper, u, np.where(to_lower, l, np.nan))
+        started |= up_cross | down_cross
+    direction[:] = np.where(supertrend == lower, 1, np.where(supertrend == upper, -1, 0))
+
+
+def _ha(close, upper, lower, supertrend, direction, periods):
+    up = np.ones(len(periods), dtype=bool)
+    direction[:] = 1
+    for i in range(1, len(close)):
+        active = i >= periods
+        c = close[i]
+        flip_up = active & (c > upper[i-1])
+        flip_down = active & ~flip_up & (c < lower[i-1])
+        hold = active & ~flip_up & ~flip_down
+        up = np.where(flip_up, True, np.where(flip_down, False, up))
+        lower[i] = np.where(hold & up & (lower[i] < lower[i-1]), lower[i-1], lower[i])
+        upper[i] = np.where(hold & ~up & (upper[i] > upper[i-1]), upper[i-1], upper[i])
+        supertrend[i] = np.where(active, np.where(up, lower[i], upper[i]), np.nan)
+        direction[i] = np.where(up, 1, -1)
+
+
+def _final_bands(i, close, upper, lower, active):
+    prev_close = close[i-1]
+    keep_upper = active & ~((upper[i] < upper[i-1]) | (prev_close > upper[i-1]))
+    keep_lower = active & ~((lower[i] > lower[i-1]) | (prev_close < lower[i-1]))
+    upper[i] = np.where(keep_upper, upper[i-1], upper[i])
+    lower[i] = np.where(keep_lower, lower[i-1], lower[i])
+
+
+def _classic(close, upper, lower, supertrend, direction, periods):
+    direction[:] = 1
+    for i in range(1, len(close)):
+        active = i >= periods + 1
+        _final_bands(i, close, upper, lower, active)
+        c, prev = close[i], supertrend[i-1]
+        on_upper = active & (prev == upper[i-1])
+        on_lower = active & ~on_upper & (prev == lower[i-1])
+        to_upper = (on_upper & (c <= upper[i])) | (on_lower & ~(c >= lower[i]))
+        to_lower = (on_upper & ~(c <= upper[i])) | (on_lower & (c >= lower[i]))
+        start = active & ~on_upper & ~on_lower
+        supertrend[i] = np.where(to_upper | start, upper[i], np.where(to_lower, lower[i], np.nan))
+        # bullish is the default whenever the line (re)starts on the upper band
+        direction[i] = np.where(to_upper, -1, 1)
+
+
+def _area(close, upper, lower, supertrend, direction, periods):
+    if len(close):
+        supertrend[0] = close[0]
+        direction[0] = 1
+    active = np.ones(len(periods), dtype=bool)
+    for i in range(1, len(close)):
+        _final_bands(i, close, upper, lower, active)
+        c = close[i]
+        below = c <= lower[i]
+        above = ~below & (c >= upper[i])
+        direction[i] = np.where(below, -1, np.where(above, 1, direction[i-1]))
+        supertrend[i] = np.where(below, lower[i], np.where(above, upper[i],
+                                 np.where(direction[i] == 1, lower[i], upper[i])))
+
+
+_RECURSIONS = {'fyers': _fyers, 'ha': _ha, 'classic': _classic, 'area': _area}
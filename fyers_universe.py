@@ -0,0 +1,334 @@
+"""
+Universe-wide indicators over aligned symbols x bars matrices.
+
+align() puts the OHLCV columns of many symbols on one shared time axis
+(bars a symbol does not have are NaN), and every indicator below takes
+those 2-D arrays and works along the time axis for all rows at once:
+rolling windows are built from one shifted add per lag, and recursive
+indicators (EWM, ATR, supertrend) take one vectorized step per bar over
+the whole universe instead of one Python loop per symbol. Scanning 200
+tickers therefore costs about as much as scanning a few.
+
+A NaN marks a bar the symbol does not have. Every indicator runs over each
+row's own bars only: the listed bars are packed to the front of the row,
+computed there and put back on the shared axis (NaN at the missing bars),
+so a gap in one symbol never enters its windows or recursions. Each row
+therefore equals the per-ticker function on that symbol's frame: the EWM
+family and supertrend bit for bit (same recurrences as fyers_indicators),
+the rolling means/std up to float rounding.
+"""
+
+import numpy as np
+import pandas as pd
+
+from fyers_epoch import with_ist
+
+FIELDS = ('Open', 'High', 'Low', 'Close', 'Volume')
+
+
+def _columns(item, columns):
+    """columns x bars float64 array from a DataFrame or a structured bar array"""
+    if not isinstance(item, pd.DataFrame):
+        return np.array([item[column] for column in columns], dtype=np.float64)
+    names = list(item.columns)
+    try:
+        # one conversion of the whole frame is much cheaper than one per column
+        values = item.to_numpy(dtype=np.float64)
+    except (TypeError, ValueError):
+        values, names = item[columns].to_numpy(dtype=np.float64), columns
+    return values[:, [names.index(column) for column in columns]].T
+
+
+def align(data, fields=FIELDS):
+    """
+    {symbol: DataFrame or bar array with an epoch Timestamp} ->
+    (symbols, timestamps, {field: symbols x bars float64 array})
+    """
+    symbols = list(data)
+    columns = ['Timestamp'] + list(fields)
+    blocks = [_columns(data[symbol], columns) for symbol in symbols]
+    stamps = [block[0].astype(np.int64) for block in blocks]
+    timestamps = np.unique(np.concatenate(stamps)) if stamps else np.empty(0, dtype=np.int64)
+    stacked = np.full((len(fields), len(symbols), len(timestamps)), np.nan)
+    for row, block in enumerate(blocks):
+        stacked[:, row, np.searchsorted(timestamps, stamps[row])] = block[1:]
+    matrices = dict(zip(fields, stacked))
+    return symbols, timestamps, matrices
+
+
+def _packed_order(listed):
+    """
+    per-row column order moving every row's listed bars to the front in time
+    order, None when no row has a missing bar before a listed one
+    """
+    if not (~listed[:, :-1] & listed[:, 1:]).any():
+        return None
+    return np.argsort(~listed, axis=1, kind='stable')
+
+
+def _on_own_bars(listed, arrays, function, *args):
+    """
+    function(*arrays, *args) over every row's listed bars only, with the
+    results (an array or a tuple of arrays) back on the shared time axis
+    """
+    listed = np.asarray(listed, dtype=bool)
+    order = _packed_order(listed)
+    if order is None:
+        return function(*arrays, *args)
+    result = function(*[np.take_along_axis(np.asarray(a, dtype=np.float64), order, axis=1) for a in arrays], *args)
+
+    def unpack(values):
+        out = np.full(values.shape, np.nan)
+        np.put_along_axis(out, order, values, axis=1)
+        return np.where(listed, out, np.nan)
+
+    if isinstance(result, tuple):
+        return tuple(unpack(values) for values in result)
+    return unpack(result)
+
+
+def _listed(*arrays):
+    """bars where none of the arrays is NaN"""
+    return ~np.any([np.isnan(np.asarray(a, dtype=np.float64)) for a in arrays], axis=0)
+
+
+def _window_sums(values, period):
+    """trailing `period` bar sums (NaN counted as 0) and counts of non-NaN values of every row"""
+    values = np.asarray(values, dtype=np.float64)
+    valid = ~np.isnan(values)
+    filled = np.where(valid, values, 0.0)
+    total = np.zeros(values.shape)
+    count = np.zeros(values.shape, dtype=np.int64)
+    bars = values.shape[1]
+    for lag in range(min(period, bars)):
+        total[:, lag:] += filled[:, :bars - lag]
+        count[:, lag:] += valid[:, :bars - lag]
+    return total, count
+
+
+def rolling_mean(values, period, min_periods=None):
+    """rolling(period, min_periods).mean() of every row over its own bars"""
+    return _on_own_bars(_listed(values), (values,), _rolling_mean, period, min_periods)
+
+
+def _rolling_mean(values, period, min_periods=None):
+    if min_periods is None:
+        min_periods = period
+    total, count = _window_sums(values, period)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(count >= max(min_periods, 1), total / count, np.nan)
+
+
+def rolling_std(values, period, min_periods=None, ddof=1):
+    """rolling(period, min_periods).std(ddof) of every row over its own bars (two-pass per window)"""
+    return _on_own_bars(_listed(values), (values,), _rolling_std, period, min_periods, ddof)
+
+
+def _rolling_std(values, period, min_periods=None, ddof=1):
+    if min_periods is None:
+        min_periods = period
+    values = np.asarray(values, dtype=np.float64)
+    valid = ~np.isnan(values)
+    total, count = _window_sums(values, period)
+    bars = values.shape[1]
+    ssq = np.zeros(values.shape)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = total / count
+        for lag in range(min(period, bars)):
+            dev = values[:, :bars - lag] - mean[:, lag:]
+            ssq[:, lag:] += np.where(valid[:, :bars - lag], dev * dev, 0.0)
+        std = np.sqrt(ssq / (count - ddof))
+    return np.where((count >= max(min_periods, 1)) & (count > ddof), std, np.nan)
+
+
+def ewm_mean(values, com=None, span=None, alpha=None, min_periods=0, adjust=True):
+    """ewm().mean() of every row over its own bars, one vectorized step of pandas' recurrence per bar"""
+    if alpha is None:
+        if com is None:
+            com = (span - 1) / 2.0
+        alpha = 1.0 / (1.0 + com)
+    return _on_own_bars(_listed(values), (values,), _ewm_mean, alpha, min_periods, adjust)
+
+
+def _ewm_mean(values, alpha, min_periods, adjust):
+    decay = 1.0 - alpha
+    new_wt = 1.0 if adjust else alpha
+    # step over contiguous bar rows of the transposed matrix
+    values = np.ascontiguousarray(np.asarray(values, dtype=np.float64).T)
+    out = np.full(values.shape, np.nan)
+    weighted = np.full(values.shape[1], np.nan)
+    old_wt = np.ones(values.shape[1])
+    nobs = np.zeros(values.shape[1], dtype=np.int64)
+    min_periods = max(min_periods, 1)
+    for t in range(values.shape[0]):
+        cur = values[t]
+        is_obs = cur == cur
+        nobs += is_obs
+        started = weighted == weighted
+        old_wt = np.where(started, old_wt * decay, old_wt)
+        blend = started & is_obs & (weighted != cur)
+        weighted = np.where(blend, (old_wt * weighted + new_wt * cur) / (old_wt + new_wt), weighted)
+        old_wt = np.where(started & is_obs, old_wt + new_wt if adjust else 1.0, old_wt)
+        weighted = np.where(~started & is_obs, cur, weighted)
+        out[t] = np.where(nobs >= min_periods, weighted, np.nan)
+    return np.ascontiguousarray(out.T)
+
+
+def sma(close, period):
+    return rolling_mean(close, period)
+
+
+def ema(close, span, min_periods=0):
+    return ewm_mean(close, span=span, min_periods=min_periods)
+
+
+def true_range(high, low, close):
+    """max(high-low, |high-prev close|, |low-prev close|) per row, prev close is the row's previous own bar"""
+    return _on_own_bars(_listed(high, low, close), (high, low, close), _true_range)
+
+
+def _true_range(high, low, close):
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    close = np.asarray(close, dtype=np.float64)
+    prev_close = np.concatenate([np.full((close.shape[0], 1), np.nan), close[:, :-1]], axis=1)
+    tr = np.maximum(np.abs(high - low), np.abs(high - prev_close))
+    return np.maximum(tr, np.abs(low - prev_close))
+
+
+def atr(high, low, close, n, wilder=False):
+    """fyers_indicators.atr for every row"""
+    return _on_own_bars(_listed(high, low, close), (high, low, close), _atr, n, wilder)
+
+
+def _atr(high, low, close, n, wilder=False):
+    tr = _true_range(high, low, close)
+    if not wilder:
+        return _ewm_mean(tr, 1.0 / (1.0 + n), n, True)
+    # fyers_indicators.wilder_smooth: mean of TR[1..n] at bar n, then the adjust=False recursion
+    seeded = np.full(tr.shape, np.nan)
+    if tr.shape[1] > n:
+        seeded[:, n] = np.mean(tr[:, 1:n+1], axis=1)
+        seeded[:, n+1:] = tr[:, n+1:]
+    return _ewm_mean(seeded, 1.0 / n, 1, False)
+
+
+def rsi(close, period):
+    """rsi() of fyers_strategy_indicator_ohlc: rolling (min_periods=1) mean gain / mean loss"""
+    return _on_own_bars(_listed(close), (close,), _rsi, period)
+
+
+def _rsi(close, period):
+    close = np.asarray(close, dtype=np.float64)
+    delta = np.diff(close, axis=1, prepend=np.nan)
+    listed = ~np.isnan(close)
+    gain = np.where(listed, np.where(delta > 0, delta, 0.0), np.nan)
+    loss = np.where(listed, np.where(delta < 0, -delta, 0.0), np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rs = _rolling_mean(gain, period, 1) / _rolling_mean(loss, period, 1)
+        return 100 - (100 / (1 + rs))
+
+
+def bollinger(close, period=20, multiplier=2.0):
+    """dict of middle/upper/lower band, percent_b and bandwidth arrays"""
+    close = np.asarray(close, dtype=np.float64)
+    middle = rolling_mean(close, period)
+    std = rolling_std(close, period)
+    upper = middle + std * multiplier
+    lower = middle - std * multiplier
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return {
+            'middle': middle,
+            'upper': upper,
+            'lower': lower,
+            'percent_b': (close - lower) / (upper - lower),
+            'bandwidth': (upper - lower) / middle,
+        }
+
+
+def macd(close, a=12, b=26, c=9):
+    """(MACD, signal) arrays: ewm(span=a) - ewm(span=b) and its ewm(span=c), min_periods = span"""
+    line = ema(close, a, a) - ema(close, b, b)
+    return line, ewm_mean(line, span=c, min_periods=c)
+
+
+def supertrend(high, low, close, period=7, multiplier=3):
+    """fyers_indicators.supertrend for every row: (final_upper, final_lower, strend, direction)"""
+    upper, lower, strend = _on_own_bars(_listed(high, low, close), (high, low, close), _supertrend, period, multiplier)
+    direction = np.where(strend == lower, 1, np.where(strend == upper, -1, 0)).astype(np.int8)
+    return upper, lower, strend, direction
+
+
+def _supertrend(high, low, close, period, multiplier):
+    close = np.asarray(close, dtype=np.float64)
+    mid = (np.asarray(high, dtype=np.float64) + np.asarray(low, dtype=np.float64)) / 2
+    band = multiplier * _atr(high, low, close, period)
+    # bar-major copies so every step reads contiguous rows
+    close = np.ascontiguousarray(close.T)
+    basic_upper = np.ascontiguousarray((mid + band).T)
+    basic_lower = np.ascontiguousarray((mid - band).T)
+    upper = basic_upper.copy()
+    lower = basic_lower.copy()
+    strend = np.full(close.shape, np.nan)
+    started = np.zeros(close.shape[1], dtype=bool)
+
+    for i in range(period, close.shape[0]):
+        c0, c1 = close[i-1], close[i]
+        pu, pl, prev = upper[i-1], lower[i-1], strend[i-1]
+        bu, bl = basic_upper[i], basic_lower[i]
+        # min()/max() of the scalar version keep their first argument unless the second beats it
+        u = np.where((c0 <= pu) & (pu < bu), pu, bu)
+        l = np.where((c0 >= pl) & (pl > bl), pl, bl)
+        upper[i], lower[i] = u, l
+
+        up_cross = ~started & (c0 <= pu) & (c1 > u)
+        down_cross = ~started & ~up_cross & (c0 >= pl) & (c1 < l)
+        on_upper = started & (prev == pu)
+        on_lower = started & ~on_upper & (prev == pl)
+        to_upper = down_cross | (on_upper & (c1 <= u)) | (on_lower & (c1 < l))
+        to_lower = up_cross | (on_upper & (c1 > u)) | (on_lower & (c1 >= l))
+        strend[i] = np.where(to_upper, u, np.where(to_lower, l, np.nan))
+        started |= up_cross | down_cross
+
+    return np.ascontiguousarray(upper.T), np.ascontiguousarray(lower.T), np.ascontiguousarray(strend.T)
+
+
+def _last_index(values):
+    """column of the last non-NaN value of every row (0 if none)"""
+    valid = ~np.isnan(values)
+    return np.where(valid.any(axis=1), values.shape[1] - 1 - np.argmax(valid[:, ::-1], axis=1), 0)
+
+
+def last_valid(values):
+    """last non-NaN value of every row (NaN if none)"""
+    values = np.asarray(values, dtype=np.float64)
+    return values[np.arange(values.shape[0]), _last_index(values)]
+
+
+def scan(data, st_period=7, st_multiplier=3, rsi_period=14):
+    """
+    last close, supertrend, direction and rsi of every symbol in
+    {symbol: OHLCV frame} (e.g. fyers_async_history.fetch_history output) as one DataFrame
+    """
+    symbols, timestamps, m = align(data, ('High', 'Low', 'Close'))
+    if len(timestamps) == 0:
+        return pd.DataFrame(columns=['symbol', 'Timestamp', 'Close', 'st', 'direction', 'rsi'])
+    upper, lower, strend, direction = supertrend(m['High'], m['Low'], m['Close'], st_period, st_multiplier)
+    rows, last = np.arange(len(symbols)), _last_index(m['Close'])
+    return pd.DataFrame({
+        'symbol': symbols,
+        'Timestamp': timestamps[last],
+        'Close': m['Close'][rows, last],
+        'st': strend[rows, last],
+        'direction': direction[rows, last],
+        'rsi': rsi(m['Close'], rsi_period)[rows, last],
+    })
+
+
+if __name__ == "__main__":
+    from ohlcv_dataset import OHLCVDataset
+
+    # scan every daily series in the local dataset in one pass
+    dataset = OHLCVDataset()
+    symbols = dataset.symbols("D")
+    print(with_ist(scan({symbol: dataset.query(symbol, "D") for symbol in symbols})))
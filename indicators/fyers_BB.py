@@ -1,45 +1,26 @@
 
 import pandas as pd
 from fyers_apiv3 import fyersModel
-import datetime as dt
-import pytz
+import os
+import sys
 import matplotlib.pyplot as plt
 from typing import Tuple, Optional
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from fyers_candle_store import CandleStore, fetch_ohlc
+from fyers_epoch import with_ist
+
 client_id = open("client_ID.txt",'r').read()
 access_token = open("access_token.txt",'r').read()
 
 fyers = fyersModel.FyersModel(client_id=client_id, is_async=False, token=access_token, log_path="D:\FyiersApiAutomation\logs")
 
-def fetchOHLC2(ticker,interval,duration):
-
-    range_from = dt.date.today() - dt.timedelta(duration)
-    range_to = dt.date.today()
-
-    from_date_string = range_from.strftime("%Y-%m-%d")
-    to_date_string = range_to.strftime("%Y-%m-%d")
+# Local candle store, only bars after the last stored candle are requested
+candle_store = CandleStore()
 
-    data = {
-        "symbol":ticker,
-        "resolution":interval,
-        "date_format":"1",
-        "range_from":from_date_string,
-        "range_to":to_date_string,
-        "cont_flag":"1"
-    }
-    
-    response = fyers.history(data=data)['candles']
-
-    # Create a Dataframe
-    columns = ['Timestamp','Open','High','Low','Close','Volume']
-    df = pd.DataFrame(response, columns=columns)
-
-    # Convert Timestamp to datetime in UTC
-    df['Timestamp2'] = pd.to_datetime(df['Timestamp'],unit='s').dt.tz_localize(pytz.utc)
+def fetchOHLC2(ticker,interval,duration):
+    df = with_ist(fetch_ohlc(fyers, candle_store, ticker, interval, duration))
 
-    # Convert Timestamp to IST
-    ist = pytz.timezone('Asia/Kolkata')
-    df['Timestamp2'] = df['Timestamp2'].dt.tz_convert(ist)
     return (df)
 
 def Bollinger_Bands(DF,period,multiplier):
@@ -72,7 +53,6 @@ bb_df = Bollinger_Bands(response_df,20,2.0)
 print(bb_df)
 
 df = pd.DataFrame(bb_df)
-df['Timestamp2'] = pd.to_datetime(df['Timestamp2'])
 df.set_index('Timestamp2',inplace=True)
 print(df)
 
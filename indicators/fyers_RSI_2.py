@@ -1,7 +1,12 @@
 
+import os
+import sys
 import pandas as pd
 import numpy as np
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from fyers_indicators import rsi
+
 file_name = "sbi_1min.csv"
 data = pd.read_csv(file_name, parse_dates=['Timestamp2'])
 data = data.sort_values('Timestamp2')
@@ -25,47 +30,15 @@ RSI = 100 – 100 / ( 1 + RS)
 '''
 
 #RSI
-RSI = np.empty(len(data))
 window_size = 7
-U = []
-D = []
-
-for i in range (len(data)):
-
-    if i>=1:
-        change = data.loc[i,"Close"] - data.loc[i-1,"Close"]
-        if change > 0:
-            U.append(abs(change))
-            D.append(0)
-        else:
-            U.append(0)
-            D.append(abs(change))
 
-        avg_U=0
-        avg_D=0
-        if i>6:
-            for j in range (0,window_size):
-                avg_U = avg_U +  U[i-j]
-                avg_D = avg_D +  D[i-j]
-
-            avg_U = avg_U / window_size
-            avg_D = avg_D / window_size
-            if avg_D == 0:
-                RS = 0
-            else:
-                RS = avg_U/avg_D
-            rsi = 100 - (100/(1 + RS))
-            RSI[i] = rsi
-        else:
-            avg_U=0
-            avg_D=0
-            RSI[i] = None
-
-    else:
-        U.append(0)
-        D.append(0)
-        RSI[i] = None
+# one rolling pass over the close; bar 0 has no change, so the first
+# window of 7 changes ends on bar 7
+RSI = rsi(data['Close'], window_size, min_periods=window_size)
+RSI[:window_size] = np.nan
+# a window without any move is 0/0 (NaN) in rsi(); the old loop reported 0 there
+flat = data['Close'].diff().abs().rolling(window_size).sum().to_numpy() == 0
+RSI[flat] = 0
 
 data['RSI'] = RSI
 print(data)
-
@@ -1,43 +1,23 @@
-import pandas as pd
-import datetime as dt 
 from fyers_apiv3 import fyersModel
-import pytz
+import os
+import sys
 import  matplotlib.pyplot as plt
-import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from fyers_candle_store import CandleStore, fetch_ohlc
+from fyers_epoch import with_ist
+from fyers_indicators import directional_movement, wilder_smooth
 
 client_id = open("client_ID.txt",'r').read()
 access_token = open("access_token.txt",'r').read()
 
 fyers = fyersModel.FyersModel(client_id=client_id, is_async=False, token=access_token, log_path="D:\FyiersApiAutomation\logs")
 
+# Local candle store, only bars after the last stored candle are requested
+candle_store = CandleStore()
+
 def fetchOHLC2(ticker,interval,duration):
-    range_from = dt.date.today() - dt.timedelta(duration)
-    range_to = dt.date.today()
-
-    from_date_string = range_from.strftime("%Y-%m-%d")
-    to_date_string = range_to.strftime("%Y-%m-%d")
-
-    data = {
-        "symbol":ticker,
-        "resolution":interval,
-        "date_format":"1",
-        "range_from":from_date_string,
-        "range_to":to_date_string,
-        "cont_flag":"1"
-    }
-    
-    response = fyers.history(data=data)['candles']
-
-    # Create a Dataframe
-    columns = ['Timestamp','Open','High','Low','Close','Volume']
-    df = pd.DataFrame(response, columns=columns)
-
-    # Convert Timestamp to datetime in UTC
-    df['Timestamp2'] = pd.to_datetime(df['Timestamp'],unit='s').dt.tz_localize(pytz.utc)
-
-    # Convert Timestamp to IST
-    ist = pytz.timezone('Asia/Kolkata')
-    df['Timestamp2'] = df['Timestamp2'].dt.tz_convert(ist)
+    df = with_ist(fetch_ohlc(fyers, candle_store, ticker, interval, duration))
 
     return (df)
     #return df[['Timestamp2', 'Open', 'High', 'Low', 'Close', 'Volume']]
@@ -63,51 +43,17 @@ Calculate Average directional index (ADX). It is the 14 period moving average of
     df2['High-PrevClose'] = abs(df2['High'] - df2['Close'].shift(1))
     df2['Low-PrevClose'] = abs(df2['Low'] - df2['Close'].shift(1))
     df2['TR'] = df2[['High-Low', 'High-PrevClose','Low-PrevClose']].max(axis=1,skipna=False)
-    df2['DMplus'] = np.where((df2['High']-df2['High'].shift(1))>(df2['Low'].shift(1)-df2['Low']),df2['High']-df2['High'].shift(1),0)
-    df2['DMplus'] = np.where(df2['DMplus']<0,0,df2['DMplus'])
-    df2['DMminus'] = np.where((df2['Low'].shift(1)-df2['Low'])>(df2['High']-df2['High'].shift(1)),df2['Low'].shift(1)-df2['Low'],0)
-    df2['DMminus'] = np.where(df2['DMminus']<0,0,df2['DMminus'])
-    TRn = []
-    DMplusN = []
-    DMminusN = []
-    TR = df2['TR'].tolist()
-    DMplus = df2['DMplus'].tolist()
-    DMminus = df2['DMminus'].tolist()
-    for i in range(len(df2)):
-        if i<n:
-            TRn.append(np.NaN)
-            DMplusN.append(np.NaN)
-            DMminusN.append(np.NaN)
-
-        elif i==n:
-            TRn.append(df2['TR'].rolling(n).sum().tolist()[n])
-            DMplusN.append(df2['DMplus'].rolling(n).sum().tolist()[n])
-            DMminusN.append(df2['DMminus'].rolling(n).sum().tolist()[n])
-
-        elif i>n:
-            TRn.append(TRn[i-1] - (TRn[i-1]/n) + TR[i])
-            DMplusN.append(DMplusN[i-1] - (DMplusN[i-1]/n) - DMplus[i])
-            DMminusN.append((DMminusN[i-1]-DMminusN[i-1]/n) - DMminus[i])
-
-    df2['TRn'] = np.array(TRn)
-    df2['DMplusN'] = np.array(DMplusN)
-    df2['DMminusN'] = np.array(DMminusN)
+    df2['DMplus'], df2['DMminus'] = directional_movement(df2['High'], df2['Low'])
+    # Wilder sums (n x the Wilder average) from bar 1, +DM and -DM are both added
+    df2['TRn'] = n * wilder_smooth(df2['TR'], n)
+    df2['DMplusN'] = n * wilder_smooth(df2['DMplus'], n)
+    df2['DMminusN'] = n * wilder_smooth(df2['DMminus'], n)
     df2['DIplusN'] = 100*(df2['DMplusN']/df2['TRn'])
     df2['DIminusN'] = 100*(df2['DMminusN']/df2['TRn'])
     df2['DIdiff'] = abs(df2['DIplusN'] - df2['DIminusN'])
     df2['DIsum'] = abs(df2['DIplusN'] + df2['DIminusN'])
     df2['DX'] = 100*(df2['DIdiff']/df2['DIsum'])
-    ADX = []
-    DX = df2['DX'].tolist()
-    for j in range(len(df2)):
-        if j < 2*n-1:
-            ADX.append(np.NaN)
-        elif j == 2*n-1:
-            ADX.append(df2['DX'][j-n+1:j+1].mean())
-        elif j > 2*n-1:
-            ADX.append(((n-1)*ADX[j-1] + DX[j])/n)
-    
-    df2['ADX'] = np.array(ADX)
+    df2['ADX'] = wilder_smooth(df2['DX'], n, start=n)
     return df2
 
 
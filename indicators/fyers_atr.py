@@ -1,10 +1,13 @@
 
-import datetime as dt
 from fyers_apiv3 import fyersModel
-import pandas as pd
-import pytz
+import os
+import sys
 import matplotlib.pyplot as plt
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from fyers_candle_store import CandleStore, fetch_ohlc
+from fyers_epoch import with_ist
+
 #generate trading session
 client_id = open("client_ID.txt",'r').read()
 access_token = open("access_token.txt",'r').read()
@@ -12,33 +15,11 @@ access_token = open("access_token.txt",'r').read()
 # Initialize the FyersModel instance with your client_id, access_token, and enable async mode
 fyers = fyersModel.FyersModel(client_id=client_id, is_async=False, token=access_token, log_path="D:\FyiersApiAutomation\logs")
 
+# Local candle store, only bars after the last stored candle are requested
+candle_store = CandleStore()
+
 def fetchOHLC2(ticker,interval,duration):
-    range_from = dt.date.today()-dt.timedelta(duration)
-    range_to = dt.date.today()
-
-    from_date_string = range_from.strftime("%Y-%m-%d")
-    to_date_string = range_to.strftime("%Y-%m-%d")
-    data = {
-        "symbol":ticker,
-        "resolution":interval,
-        "date_format":"1",
-        "range_from":from_date_string,
-        "range_to":to_date_string,
-        "cont_flag":"1"
-    }
-
-    response = fyers.history(data=data)['candles']
-
-    # Create a DataFrame
-    columns = ['Timestamp','Open','High','Low','Close','Volume']
-    df = pd.DataFrame(response, columns=columns)
-
-    # Convert Timestamp to datetime in UTC
-    df['Timestamp2'] = pd.to_datetime(df['Timestamp'],unit='s').dt.tz_localize(pytz.utc)
-
-    # Convert Timestamp to IST
-    ist = pytz.timezone('Asia/Kolkata')
-    df['Timestamp2'] = df['Timestamp2'].dt.tz_convert(ist)
+    df = with_ist(fetch_ohlc(fyers, candle_store, ticker, interval, duration))
     df.drop(columns=['Timestamp'], inplace=True)
 
     return (df)
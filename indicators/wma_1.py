@@ -1,25 +1,18 @@
 
+import os
+import sys
 import pandas as pd 
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from fyers_moving_average import wma
+
 # Weighted moving average
 file_path = "sbi_1min.csv"
 data = pd.read_csv(file_path,parse_dates=['Timestamp2'])
 data = data.sort_values('Timestamp2')
 
-wma_list = []
-period = 4
-wma_value = 0
 wma_percent = [0.40,0.30,0.20,0.10]
 
-for i in range(len(data)):
-    if i >= period - 1:
-        wma_value = 0
-        for j in range(0,period):
-            wma_value = wma_value + (data.iloc[i-j]['Close'])*wma_percent[j]
-        wma_list.append(wma_value)
-    
-    else:
-        wma_list.append(None)
-
-data['WMA'] = wma_list
+# weight 0.4 on the current close down to 0.1 on the one 3 bars back
+data['WMA'] = wma(data['Close'], wma_percent)
 print(data)
\ No newline at end of file
@@ -0,0 +1,167 @@
+"""
+Fixed-width binary bar files (.bars) for long OHLCV histories.
+
+Layout: a 64 byte header followed by `count` little-endian records of
+
+    Timestamp int64 | Open High Low Close float64 (or float32) | Volume int64
+
+sorted by Timestamp. open_bars() memory-maps the records without reading
+them, and slice_bars() narrows a mapping to a time range with a binary
+search, so a backtest over one month of a multi-year 1 minute history only
+pages in that month. csv_to_bars() converts any CSV ohlcv_loader can read.
+
+    python ohlcv_bars.py output_full.csv sbi_1min.csv    # writes output_full.bars, sbi_1min.bars
+"""
+
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+from ohlcv_loader import COLUMNS, ohlcv_dtype, parse_ohlcv_csv
+from fyers_epoch import with_ist
+
+MAGIC = b'OHLCVBAR'
+VERSION = 1
+HEADER_SIZE = 64
+HEADER_DTYPE = np.dtype([
+    ('magic', 'S8'),
+    ('version', '<u4'),
+    ('price_bytes', '<u4'),  # 8 for float64 prices, 4 for float32
+    ('count', '<u8'),
+    ('reserved', 'V40'),
+])
+
+
+def bar_dtype(price_dtype=np.float64):
+    """on-disk record dtype (little-endian whatever the platform)"""
+    return ohlcv_dtype(price_dtype).newbyteorder('<')
+
+
+def _price_dtype(price_bytes):
+    if price_bytes == 8:
+        return np.float64
+    if price_bytes == 4:
+        return np.float32
+    raise ValueError("Unsupported price width {} in bar file".format(price_bytes))
+
+
+def read_header(path):
+    """returns (price_dtype, count) of a bar file"""
+    header = np.fromfile(path, dtype=HEADER_DTYPE, count=1)
+    if len(header) == 0 or header['magic'][0] != MAGIC:
+        raise ValueError("{} is not a bar file".format(path))
+    if header['version'][0] != VERSION:
+        raise ValueError("{} has unsupported bar file version {}".format(path, header['version'][0]))
+    return _price_dtype(int(header['price_bytes'][0])), int(header['count'][0])
+
+
+def _header(price_dtype, count):
+    header = np.zeros(1, dtype=HEADER_DTYPE)
+    header['magic'] = MAGIC
+    header['version'] = VERSION
+    header['price_bytes'] = np.dtype(price_dtype).itemsize
+    header['count'] = count
+    return header
+
+
+def to_bars(data, price_dtype=np.float64):
+    """structured bar array from a structured array, a DataFrame or a dict of OHLCV columns"""
+    out = np.empty(len(data['Timestamp']), dtype=bar_dtype(price_dtype))
+    for col in COLUMNS:
+        out[col] = np.asarray(data[col])
+    return out
+
+
+def write_bars(path, data, price_dtype=np.float64):
+    """write OHLCV data sorted by Timestamp to a bar file (atomically replaced)"""
+    bars = to_bars(data, price_dtype)
+    bars = bars[np.argsort(bars['Timestamp'], kind='stable')]
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        _header(price_dtype, len(bars)).tofile(f)
+        bars.tofile(f)
+    os.replace(tmp_path, path)
+    return len(bars)
+
+
+def append_bars(path, data):
+    """
+    Append bars newer than the last one in the file; older or equal
+    timestamps are skipped. The header count is updated after the records
+    are written, so an interrupted append leaves the old bars readable.
+    Returns the number of bars appended.
+    """
+    if not os.path.isfile(path):
+        return write_bars(path, data)
+    price_dtype, count = read_header(path)
+    bars = to_bars(data, price_dtype)
+    bars = bars[np.argsort(bars['Timestamp'], kind='stable')]
+    if count:
+        last_ts = open_bars(path)['Timestamp'][-1]
+        bars = bars[bars['Timestamp'] > last_ts]
+    if len(bars) == 0:
+        return 0
+    with open(path, 'r+b') as f:
+        f.seek(HEADER_SIZE + count * bar_dtype(price_dtype).itemsize)
+        bars.tofile(f)
+        f.truncate()
+        f.flush()
+        f.seek(0)
+        _header(price_dtype, count + len(bars)).tofile(f)
+    return len(bars)
+
+
+def open_bars(path):
+    """read-only memory map of the records in a bar file (nothing is read up front)"""
+    price_dtype, count = read_header(path)
+    if count == 0:
+        return np.empty(0, dtype=bar_dtype(price_dtype))
+    return np.memmap(path, dtype=bar_dtype(price_dtype), mode='r', offset=HEADER_SIZE, shape=(count,))
+
+
+def slice_bars(bars, start_ts=None, end_ts=None):
+    """view of the bars with start_ts <= Timestamp < end_ts (epoch seconds, None = open ended)"""
+    timestamps = bars['Timestamp']
+    start = 0 if start_ts is None else np.searchsorted(timestamps, start_ts, side='left')
+    end = len(bars) if end_ts is None else np.searchsorted(timestamps, end_ts, side='left')
+    return bars[start:end]
+
+
+def load_bars(path, start_ts=None, end_ts=None):
+    """open_bars() narrowed to a time range"""
+    return slice_bars(open_bars(path), start_ts, end_ts)
+
+
+def bars_to_frame(bars, ist_column=None):
+    """copy bars into a DataFrame with the canonical columns, optionally with an IST datetime column"""
+    df = pd.DataFrame({col: np.asarray(bars[col]) for col in COLUMNS})
+    if ist_column is not None:
+        df = with_ist(df, ist_column)
+    return df
+
+
+def bars_path(csv_path):
+    return os.path.splitext(csv_path)[0] + ".bars"
+
+
+def csv_to_bars(csv_path, path=None, price_dtype=np.float64):
+    """convert an OHLCV CSV (any layout ohlcv_loader understands) into a bar file, returns its path"""
+    if path is None:
+        path = bars_path(csv_path)
+    write_bars(path, parse_ohlcv_csv(csv_path, price_dtype), price_dtype)
+    return path
+
+
+if __name__ == "__main__":
+    for csv_path in sys.argv[1:]:
+        started = time.perf_counter()
+        path = csv_to_bars(csv_path)
+        converted = time.perf_counter() - started
+
+        started = time.perf_counter()
+        bars = open_bars(path)
+        opened = time.perf_counter() - started
+        print("{} -> {}: {} bars, converted in {:.3f}s, mapped in {:.5f}s".format(
+            csv_path, path, len(bars), converted, opened))
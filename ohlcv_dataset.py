@@ -0,0 +1,139 @@
+"""
+Partitioned OHLCV dataset: one bar file per symbol, resolution and IST month.
+
+    ohlcv_dataset/
+        index.json                        {"NSE:RELIANCE-EQ|D": {"2021-01": [first_ts, last_ts, count], ...}}
+        NSE_RELIANCE-EQ/D/2021-01.bars
+        NSE_RELIANCE-EQ/D/2021-02.bars
+        MCX_CRUDEOIL25OCTFUT/30/2025-10.bars
+
+query("NSE:RELIANCE-EQ", "D", t0, t1) looks up the partitions overlapping
+[t0, t1) in the index, memory-maps only those and cuts the edges with a
+binary search on their sorted timestamps, so a scan over hundreds of symbols
+reads exactly the slices it needs.
+"""
+
+import os
+import json
+import bisect
+import numpy as np
+
+from fyers_candle_store import sort_unique
+from fyers_epoch import IST_OFFSET, DAY
+from ohlcv_bars import bar_dtype, bars_to_frame, open_bars, slice_bars, write_bars
+from ohlcv_loader import COLUMNS, parse_ohlcv_csv
+
+
+def month_keys(timestamps):
+    """IST calendar month ('YYYY-MM') of each epoch timestamp"""
+    days = ((np.asarray(timestamps, dtype=np.int64) + IST_OFFSET) // DAY).astype('datetime64[D]')
+    return days.astype('datetime64[M]').astype(str)
+
+
+def _safe_name(symbol):
+    return symbol.replace(":", "_")
+
+
+class OHLCVDataset:
+    """
+    Symbol/resolution/month partitioned bar files with a JSON index of the
+    first and last timestamp of every partition.
+    """
+
+    def __init__(self, root="ohlcv_dataset"):
+        self.root = root
+        self.index_path = os.path.join(root, "index.json")
+        os.makedirs(root, exist_ok=True)
+        if os.path.isfile(self.index_path):
+            with open(self.index_path) as f:
+                self.index = json.load(f)
+        else:
+            self.index = {}
+
+    def _key(self, symbol, resolution):
+        return "{}|{}".format(symbol, resolution)
+
+    def partition_path(self, symbol, resolution, month):
+        return os.path.join(self.root, _safe_name(symbol), str(resolution), month + ".bars")
+
+    def _save_index(self):
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.index, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.index_path)
+
+    def symbols(self, resolution=None):
+        """symbols in the dataset, optionally only those with `resolution` bars"""
+        keys = [key.rsplit("|", 1) for key in self.index]
+        return sorted({symbol for symbol, res in keys if resolution is None or res == str(resolution)})
+
+    def partitions(self, symbol, resolution):
+        """sorted month keys stored for symbol/resolution"""
+        return sorted(self.index.get(self._key(symbol, resolution), {}))
+
+    def write(self, symbol, resolution, data):
+        """
+        Merge OHLCV data (structured array, DataFrame or column dict with an
+        epoch Timestamp) into the month partitions it covers. Bars with a
+        timestamp already stored replace the stored ones.
+        """
+        columns = sort_unique({col: np.asarray(data[col]) for col in COLUMNS})
+        if len(columns['Timestamp']) == 0:
+            return
+        entry = self.index.setdefault(self._key(symbol, resolution), {})
+        months = month_keys(columns['Timestamp'])
+        starts = np.concatenate([[0], np.flatnonzero(months[1:] != months[:-1]) + 1, [len(months)]])
+
+        for start, end in zip(starts[:-1], starts[1:]):
+            month = str(months[start])
+            part = {col: columns[col][start:end] for col in COLUMNS}
+            path = self.partition_path(symbol, resolution, month)
+            if month in entry and os.path.isfile(path):
+                stored = np.array(open_bars(path))
+                part = sort_unique({col: np.concatenate([stored[col], part[col]]) for col in COLUMNS})
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            write_bars(path, part)
+            entry[month] = [int(part['Timestamp'][0]), int(part['Timestamp'][-1]), len(part['Timestamp'])]
+        self._save_index()
+
+    def import_csv(self, symbol, resolution, csv_path):
+        """add an OHLCV CSV in any layout ohlcv_loader understands"""
+        self.write(symbol, resolution, parse_ohlcv_csv(csv_path))
+
+    def query(self, symbol, resolution, start_ts=None, end_ts=None):
+        """
+        Bars of symbol/resolution with start_ts <= Timestamp < end_ts (None =
+        open ended) as a structured array. A range inside one month is a
+        zero-copy memory-mapped view.
+        """
+        entry = self.index.get(self._key(symbol, resolution), {})
+        months = sorted(entry)
+        last_ts = [entry[month][1] for month in months]
+        first = 0 if start_ts is None else bisect.bisect_left(last_ts, start_ts)
+        slices = []
+        for month in months[first:]:
+            if end_ts is not None and entry[month][0] >= end_ts:
+                break
+            bars = open_bars(self.partition_path(symbol, resolution, month))
+            slices.append(slice_bars(bars, start_ts, end_ts))
+        if not slices:
+            return np.empty(0, dtype=bar_dtype())
+        if len(slices) == 1:
+            return slices[0]
+        return np.concatenate(slices)
+
+    def frame(self, symbol, resolution, start_ts=None, end_ts=None, ist_column=None):
+        """query() as a DataFrame, optionally with an IST datetime column"""
+        return bars_to_frame(self.query(symbol, resolution, start_ts, end_ts), ist_column)
+
+
+if __name__ == "__main__":
+    # Load the bundled 5 minute NIFTY dump and pull one week back out of it
+    import datetime as dt
+    from fyers_epoch import ist_midnight
+
+    dataset = OHLCVDataset()
+    dataset.import_csv("NSE:NIFTY50-INDEX", "5", "output_full.csv")
+    print("Partitions:", dataset.partitions("NSE:NIFTY50-INDEX", "5"))
+    week = dataset.frame("NSE:NIFTY50-INDEX", "5", ist_midnight(dt.date(2025, 2, 24)), ist_midnight(dt.date(2025, 3, 3)), 'Timestamp2')
+    print(week)
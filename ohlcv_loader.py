@@ -0,0 +1,135 @@
+"""
+One loader for the OHLCV CSV layouts used around this repo:
+
+    Timestamp2,Open,High,Low,Close,Volume          (fetchOHLC2 dumps, sbi_1min.csv)
+    Timestamp,Open,...,Volume,Timestamp2           (epoch + IST string, output.csv)
+    Datetime,...,Dividends,Stock Splits            (yfinance, nifty50_15min.csv)
+    timestamp,close,open,high,low,volume           (nifty_Sarea_cal_5min.csv)
+    Date,Open,High,Low,Close                       (nifty_1d_data_3Y.csv)
+    ,minute,symbol,open,high,low,close             (websocket OHLC dumps)
+
+Every layout is normalised to the canonical columns Timestamp (int64 epoch
+seconds), Open/High/Low/Close (float64 or float32) and Volume (int64, 0 when
+the file has none), sorted by time with duplicated timestamps dropped.
+The parsed result is cached in a binary sidecar next to the CSV, so later
+loads memory-map it instead of parsing text again.
+"""
+
+import os
+import re
+import numpy as np
+import pandas as pd
+
+from fyers_epoch import IST_OFFSET, with_ist
+
+COLUMNS = ['Timestamp','Open','High','Low','Close','Volume']
+PRICE_COLUMNS = ['Open','High','Low','Close']
+
+# candidate time columns, in order of preference (lower-cased names)
+EPOCH_COLUMNS = ['timestamp', 'epoch', 'time']
+DATETIME_COLUMNS = ['timestamp2', 'datetime', 'date', 'timestamp', 'minute', 'time']
+
+_TZ_SUFFIX = re.compile(r'(Z|[+-]\d{2}:?\d{2})$')
+
+
+def ohlcv_dtype(price_dtype=np.float64):
+    return np.dtype([('Timestamp', np.int64)] + [(col, price_dtype) for col in PRICE_COLUMNS] + [('Volume', np.int64)])
+
+
+def _find_column(names, candidates):
+    lower = {name.strip().lower(): name for name in names}
+    for candidate in candidates:
+        if candidate in lower:
+            return lower[candidate]
+    return None
+
+
+def _epoch_seconds(values):
+    """epoch seconds for a column of epoch numbers or datetime strings (naive strings are taken as IST)"""
+    if pd.api.types.is_numeric_dtype(values):
+        return values.to_numpy(dtype=np.int64)
+    sample = str(values.iloc[0]).strip()
+    if _TZ_SUFFIX.search(sample):
+        parsed = pd.to_datetime(values, format='ISO8601', utc=True).dt.tz_convert(None)
+        offset = 0
+    else:
+        parsed = pd.to_datetime(values, format='ISO8601')
+        offset = IST_OFFSET
+    return parsed.to_numpy().astype('datetime64[s]').astype(np.int64) - offset
+
+
+def detect_schema(names):
+    """
+    Map the canonical columns to the names used in a CSV header.
+    Returns {canonical: csv_name}; Volume maps to None if the file has none.
+    Raises ValueError if no time column or a price column is missing.
+    """
+    schema = {}
+    for col in PRICE_COLUMNS + ['Volume']:
+        schema[col] = _find_column(names, [col.lower()])
+    missing = [col for col in PRICE_COLUMNS if schema[col] is None]
+    time_col = _find_column(names, DATETIME_COLUMNS)
+    if time_col is None or missing:
+        raise ValueError("Unrecognised OHLCV columns {} (missing time/{})".format(list(names), missing))
+    schema['Timestamp'] = time_col
+    return schema
+
+
+def parse_ohlcv_csv(path, price_dtype=np.float64):
+    """parse an OHLCV CSV into a canonical structured array (no caching)"""
+    header = pd.read_csv(path, nrows=0).columns
+    schema = detect_schema(header)
+
+    # prefer an integer epoch column when the file has one next to a datetime string
+    epoch_col = _find_column(header, EPOCH_COLUMNS)
+    usecols = [name for name in set(schema.values()) | {epoch_col} if name is not None]
+    df = pd.read_csv(path, usecols=usecols)
+    if epoch_col is not None and pd.api.types.is_integer_dtype(df[epoch_col]):
+        schema['Timestamp'] = epoch_col
+
+    out = np.empty(len(df), dtype=ohlcv_dtype(price_dtype))
+    out['Timestamp'] = _epoch_seconds(df[schema['Timestamp']])
+    for col in PRICE_COLUMNS:
+        out[col] = df[schema[col]].to_numpy(dtype=price_dtype)
+    out['Volume'] = 0 if schema['Volume'] is None else df[schema['Volume']].fillna(0).to_numpy(dtype=np.int64)
+
+    # sort by time and keep the last row of duplicated timestamps
+    out = out[np.argsort(out['Timestamp'], kind='stable')]
+    last = np.ones(len(out), dtype=bool)
+    last[:-1] = out['Timestamp'][1:] != out['Timestamp'][:-1]
+    return out[last]
+
+
+def sidecar_path(path, price_dtype=np.float64):
+    return "{}.{}.npy".format(path, np.dtype(price_dtype).name)
+
+
+def load_ohlcv_array(path, price_dtype=np.float64, cache=True):
+    """
+    Canonical structured array for an OHLCV CSV. With cache=True the parsed
+    array is written to a sidecar file once and later loads memory-map it
+    (read only) as long as the sidecar is newer than the CSV.
+    """
+    if not cache:
+        return parse_ohlcv_csv(path, price_dtype)
+    sidecar = sidecar_path(path, price_dtype)
+    if os.path.isfile(sidecar) and os.path.getmtime(sidecar) >= os.path.getmtime(path):
+        return np.load(sidecar, mmap_mode='r')
+    data = parse_ohlcv_csv(path, price_dtype)
+    tmp_path = sidecar + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        np.save(f, data)
+    os.replace(tmp_path, sidecar)
+    return np.load(sidecar, mmap_mode='r')
+
+
+def load_ohlcv(path, price_dtype=np.float64, cache=True, ist_column=None):
+    """
+    load_ohlcv_array() as a DataFrame with the canonical columns.
+    Pass ist_column (e.g. 'Timestamp2') to also get an IST datetime column.
+    """
+    data = load_ohlcv_array(path, price_dtype, cache)
+    df = pd.DataFrame({col: data[col] for col in COLUMNS})
+    if ist_column is not None:
+        df = with_ist(df, ist_column)
+    return df
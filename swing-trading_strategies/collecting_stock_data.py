@@ -1,44 +1,22 @@
-import numpy as np
 import pandas as pd
 from fyers_apiv3 import fyersModel
-import pytz
-import datetime as dt
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from fyers_candle_store import CandleStore, fetch_ohlc
+from fyers_epoch import with_ist
 
 client_id = open("client_ID.txt",'r').read()
 access_token = open("access_token.txt",'r').read()
 
 fyers = fyersModel.FyersModel(client_id=client_id, is_async=False, token=access_token, log_path="D:\FyiersApiAutomation\logs")
 
-def fetchOHLC2(ticker,interval,duration):
-    range_from = dt.date.today() - dt.timedelta(duration)
-    range_to = dt.date.today()
-
-    from_date_string = range_from.strftime("%Y-%m-%d")
-    to_date_string = range_to.strftime("%Y-%m-%d")
-
-    data = {
-        "symbol":ticker,
-        "resolution":interval,
-        "date_format":"1",
-        "range_from":from_date_string,
-        "range_to":to_date_string,
-        "cont_flag":"1"
-    }
-    
-    response = fyers.history(data=data)['candles']
-
-    # Create a Dataframe
-    columns = ['Timestamp','Open','High','Low','Close','Volume']
-    df = pd.DataFrame(response, columns=columns)
+# Local candle store, only bars after the last stored candle are requested
+candle_store = CandleStore()
 
-    # Convert Timestamp to datetime in UTC
-    df['Date'] = pd.to_datetime(df['Timestamp'],unit='s').dt.tz_localize(pytz.utc)
-
-    # Convert Timestamp to IST
-    ist = pytz.timezone('Asia/Kolkata')
-    df['Date'] = df['Date'].dt.tz_convert(ist)
-
-    df = df.drop(columns=['Timestamp'])
+def fetchOHLC2(ticker,interval,duration):
+    df = with_ist(fetch_ohlc(fyers, candle_store, ticker, interval, duration), 'Date')
     return df[['Date','Open','High','Low','Close']]
 
 
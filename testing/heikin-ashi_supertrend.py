@@ -1,12 +1,15 @@
-import pandas as pd
+import os
+import sys
 import numpy as np
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from fyers_epoch import with_ist
+from ohlcv_loader import load_ohlcv
+from fyers_supertrend_grid import supertrend_grid
+
 def read_data(file_path):
-    df = pd.read_csv(file_path)
-    df.columns = [col.strip().capitalize() for col in df.columns]
-    df['Timestamp'] = pd.to_datetime(df['Timestamp'])
-    df.sort_values('Timestamp', inplace=True)
-    return df
+    # sorted OHLCV with Timestamp as an IST datetime, whatever the CSV layout
+    return with_ist(load_ohlcv(file_path), 'Timestamp')
 
 def heikin_ashi(df):
     ha_df = df.copy()
@@ -26,39 +29,13 @@ def heikin_ashi(df):
     
     return ha_df
 
-def calculate_atr(df, period):
-    df['H-L'] = df['HA_High'] - df['HA_Low']
-    df['H-PC'] = np.abs(df['HA_High'] - df['HA_Close'].shift())
-    df['L-PC'] = np.abs(df['HA_Low'] - df['HA_Close'].shift())
-    tr = df[['H-L', 'H-PC', 'L-PC']].max(axis=1)
-    atr = tr.rolling(window=period).mean()
-    return atr
-
-def calculate_supertrend(df, period, multiplier):
-    atr = calculate_atr(df, period)
-    hl2 = (df['HA_High'] + df['HA_Low']) / 2
-    upperband = hl2 + (multiplier * atr)
-    lowerband = hl2 - (multiplier * atr)
-
-    supertrend = [np.nan] * len(df)
-    direction = [True] * len(df)  # True = uptrend, False = downtrend
-
-    for i in range(period, len(df)):
-        if df['HA_Close'].iloc[i] > upperband.iloc[i - 1]:
-            direction[i] = True
-        elif df['HA_Close'].iloc[i] < lowerband.iloc[i - 1]:
-            direction[i] = False
-        else:
-            direction[i] = direction[i - 1]
-            if direction[i] and lowerband.iloc[i] < lowerband.iloc[i - 1]:
-                lowerband.iloc[i] = lowerband.iloc[i - 1]
-            if not direction[i] and upperband.iloc[i] > upperband.iloc[i - 1]:
-                upperband.iloc[i] = upperband.iloc[i - 1]
-
-        supertrend[i] = lowerband.iloc[i] if direction[i] else upperband.iloc[i]
-
-    df[f'Supertrend_{period}_{multiplier}'] = supertrend
-    df[f'Direction_{period}_{multiplier}'] = direction
+def calculate_supertrends(df, params):
+    # TR once, ATR once per period and the band recursions of all (period, multiplier) pairs together
+    grid = supertrend_grid(df['HA_High'], df['HA_Low'], df['HA_Close'], params, atr='sma', rule='ha')
+    for period, multiplier in params:
+        supertrend, direction = grid[(period, multiplier)]
+        df[f'Supertrend_{period}_{multiplier}'] = supertrend
+        df[f'Direction_{period}_{multiplier}'] = direction == 1
     return df
 
 def generate_signals(df):
@@ -71,8 +48,7 @@ def generate_signals(df):
 def process(file_path, output_path):
     df = read_data(file_path)
     ha_df = heikin_ashi(df)
-    ha_df = calculate_supertrend(ha_df, 14, 2)
-    ha_df = calculate_supertrend(ha_df, 21, 1)
+    ha_df = calculate_supertrends(ha_df, [(14, 2), (21, 1)])
     ha_df = generate_signals(ha_df)
     
     output_df = ha_df[['Timestamp', 'HA_Open', 'HA_High', 'HA_Low', 'HA_Close', 
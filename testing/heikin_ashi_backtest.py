@@ -1,5 +1,9 @@
+import os
+import sys
 import pandas as pd
-import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from fyers_supertrend_grid import supertrend_grid
 
 # Function to calculate Heikin-Ashi candles
 def calculate_heikin_ashi(data):
@@ -19,80 +23,15 @@ def calculate_heikin_ashi(data):
 
 
 # Function to calculate Supertrend
-import pandas as pd
-import numpy as np
-
-
-def calculate_atr_wilder(df, period):
-    df = df.copy()
-    df['H-L'] = df['HA_High'] - df['HA_Low']
-    df['H-Cp'] = abs(df['HA_High'] - df['HA_Close'].shift(1))
-    df['L-Cp'] = abs(df['HA_Low'] - df['HA_Close'].shift(1))
-    df['TR'] = df[['H-L', 'H-Cp', 'L-Cp']].max(axis=1)
 
-    atr = []
-    tr_list = df['TR'].tolist()
 
-    for i in range(len(tr_list)):
-        if i < period:
-            atr.append(np.nan)
-        elif i == period:
-            atr.append(np.mean(tr_list[1:period+1]))
-        else:
-            atr.append(((atr[i-1] * (period - 1)) + tr_list[i]) / period)
-
-    df['ATR'] = atr
-    df.drop(['H-L', 'H-Cp', 'L-Cp', 'TR'], axis=1, inplace=True)
-    return df
+def calculate_supertrends(df, params):
+    """rounded Supertrend Series for every (atr_period, multiplier), sharing TR and the Wilder ATR per period"""
+    grid = supertrend_grid(df['HA_High'], df['HA_Low'], df['HA_Close'], params, atr='wilder', rule='classic')
+    return [pd.Series(grid[pair][0], index=df.index).round(2) for pair in params]
 
 def calculate_supertrend(df, atr_period, multiplier):
-    df = calculate_atr_wilder(df, atr_period)
-    hl2 = (df['HA_High'] + df['HA_Low']) / 2
-    df['UpperBand'] = hl2 + (multiplier * df['ATR'])
-    df['LowerBand'] = hl2 - (multiplier * df['ATR'])
-    
-    df['FinalUpperBand'] = df['UpperBand']
-    df['FinalLowerBand'] = df['LowerBand']
-    df['Supertrend'] = np.nan
-    df['Trend'] = True  # True for bullish, False for bearish
-
-    for i in range(atr_period + 1, len(df)):
-        curr_close = df.loc[i, 'HA_Close']
-        prev_close = df.loc[i-1, 'HA_Close']
-        
-        # Adjust final upper band
-        if (df.loc[i, 'UpperBand'] < df.loc[i-1, 'FinalUpperBand']) or (prev_close > df.loc[i-1, 'FinalUpperBand']):
-            df.loc[i, 'FinalUpperBand'] = df.loc[i, 'UpperBand']
-        else:
-            df.loc[i, 'FinalUpperBand'] = df.loc[i-1, 'FinalUpperBand']
-        
-        # Adjust final lower band
-        if (df.loc[i, 'LowerBand'] > df.loc[i-1, 'FinalLowerBand']) or (prev_close < df.loc[i-1, 'FinalLowerBand']):
-            df.loc[i, 'FinalLowerBand'] = df.loc[i, 'LowerBand']
-        else:
-            df.loc[i, 'FinalLowerBand'] = df.loc[i-1, 'FinalLowerBand']
-        
-        # Determine Supertrend
-        if df.loc[i-1, 'Supertrend'] == df.loc[i-1, 'FinalUpperBand']:
-            if curr_close <= df.loc[i, 'FinalUpperBand']:
-                df.loc[i, 'Supertrend'] = df.loc[i, 'FinalUpperBand']
-                df.loc[i, 'Trend'] = False
-            else:
-                df.loc[i, 'Supertrend'] = df.loc[i, 'FinalLowerBand']
-                df.loc[i, 'Trend'] = True
-        elif df.loc[i-1, 'Supertrend'] == df.loc[i-1, 'FinalLowerBand']:
-            if curr_close >= df.loc[i, 'FinalLowerBand']:
-                df.loc[i, 'Supertrend'] = df.loc[i, 'FinalLowerBand']
-                df.loc[i, 'Trend'] = True
-            else:
-                df.loc[i, 'Supertrend'] = df.loc[i, 'FinalUpperBand']
-                df.loc[i, 'Trend'] = False
-        else:
-            # Initialize
-            df.loc[i, 'Supertrend'] = df.loc[i, 'FinalUpperBand']
-
-    df['Supertrend'] = df['Supertrend'].round(2)
-    return df['Supertrend']
+    return calculate_supertrends(df, [(atr_period, multiplier)])[0]
 
 
 
@@ -205,8 +144,7 @@ def main():
     print(data)
 
     # Calculate Supertrend indicators
-    data['Supertrend1'] = calculate_supertrend(data, atr_period=21, multiplier=1)
-    data['Supertrend2'] = calculate_supertrend(data, atr_period=14, multiplier=2)
+    data['Supertrend1'], data['Supertrend2'] = calculate_supertrends(data, [(21, 1), (14, 2)])
 
     # Generate buy/sell signals
     data = generate_signals(data)
@@ -1,11 +1,15 @@
-import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 from datetime import datetime
 import warnings
+import os
+import sys
 warnings.filterwarnings('ignore')
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ohlcv_loader import load_ohlcv
+
 def analyze_nifty_drops(csv_file_path):
     """
     Analyze NIFTY50 data to find dates with significant drops (>1%)
@@ -17,49 +21,16 @@ def analyze_nifty_drops(csv_file_path):
     dict: Contains analysis results including dataframes and statistics
     """
     
-    # Read the CSV file
+    # Read the CSV file (any of the OHLCV layouts handled by ohlcv_loader)
     try:
-        df = pd.read_csv(csv_file_path)
+        df = load_ohlcv(csv_file_path, ist_column='Date')
         print(f"Data loaded successfully. Shape: {df.shape}")
-    except Exception as e:
+    except (OSError, ValueError) as e:
         print(f"Error reading CSV file: {e}")
         return None
     
-    # Display column names to help with identification
-    print("\nColumn names in the dataset:")
-    print(df.columns.tolist())
-    
-    # Common column name variations for NIFTY data
-    date_cols = ['Date', 'date', 'DATE', 'Dates', 'Trading Date']
-    close_cols = ['Close', 'close', 'CLOSE', 'Close Price', 'Closing Price']
-    
-    # Identify date and close columns
-    date_col = None
-    close_col = None
-    
-    for col in df.columns:
-        if any(d in col for d in date_cols):
-            date_col = col
-            break
-    
-    for col in df.columns:
-        if any(c in col for c in close_cols):
-            close_col = col
-            break
-    
-    if date_col is None or close_col is None:
-        print("Please specify the correct column names:")
-        print("Available columns:", df.columns.tolist())
-        return None
-    
-    print(f"\nUsing columns - Date: '{date_col}', Close: '{close_col}'")
-    
     # Prepare the data
-    df_clean = df[[date_col, close_col]].copy()
-    df_clean.columns = ['Date', 'Close']
-    
-    # Convert date column to datetime
-    df_clean['Date'] = pd.to_datetime(df_clean['Date'])
+    df_clean = df[['Date', 'Close']].copy()
     
     # Sort by date to ensure proper order
     df_clean = df_clean.sort_values('Date').reset_index(drop=True)
@@ -1,8 +1,14 @@
+import os
+import sys
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 from datetime import datetime, timedelta
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from fyers_indicators import true_range
+from fyers_supertrend_grid import average_true_range, supertrend_grid
+
 
 df_data = pd.read_csv('nifty_Sarea_cal_5min.csv')
 output_csv = df_data.copy()
@@ -18,84 +24,15 @@ class SupertrendAreaCalculator:
         """
         Calculate Average True Range (ATR)
         """
-        # Calculate True Range
-        tr_list = []
-        for i in range(1, len(close)):
-            tr1 = high[i] - low[i]
-            tr2 = abs(high[i] - close[i-1])
-            tr3 = abs(low[i] - close[i-1])
-            tr = max(tr1, tr2, tr3)
-            tr_list.append(tr)
-        
-        # Add first TR as high-low
-        tr_list.insert(0, high[0] - low[0])
-        tr_array = np.array(tr_list)
-        
-        # Calculate ATR using Simple Moving Average
-        atr = np.zeros(len(tr_array))
-        atr[0] = tr_array[0]
-        
-        for i in range(1, len(tr_array)):
-            if i < period:
-                atr[i] = np.mean(tr_array[:i+1])
-            else:
-                atr[i] = np.mean(tr_array[i-period+1:i+1])
-        
-        return atr
+        # True Range (first bar high-low) averaged over the last `period` bars, fewer at the start
+        return average_true_range(true_range(high, low, close), period, method='sma_partial')
     
     def calculate_supertrend(self, high, low, close, period, multiplier):
         """
         Calculate Supertrend indicator
         """
-        # Calculate ATR (Average True Range)
-        atr = self.calculate_atr(high, low, close, period)
-        
-        # Calculate HL2 (High + Low) / 2
-        hl2 = (high + low) / 2
-        
-        # Calculate upper and lower bands
-        upper_band = hl2 + (multiplier * atr)
-        lower_band = hl2 - (multiplier * atr)
-        
-        # Initialize arrays
-        final_upper_band = np.zeros(len(close))
-        final_lower_band = np.zeros(len(close))
-        supertrend = np.zeros(len(close))
-        direction = np.ones(len(close))
-        
-        # Set initial values
-        final_upper_band[0] = upper_band[0]
-        final_lower_band[0] = lower_band[0]
-        supertrend[0] = close[0]
-        
-        for i in range(1, len(close)):
-            # Final Upper Band
-            if upper_band[i] < final_upper_band[i-1] or close[i-1] > final_upper_band[i-1]:
-                final_upper_band[i] = upper_band[i]
-            else:
-                final_upper_band[i] = final_upper_band[i-1]
-            
-            # Final Lower Band
-            if lower_band[i] > final_lower_band[i-1] or close[i-1] < final_lower_band[i-1]:
-                final_lower_band[i] = lower_band[i]
-            else:
-                final_lower_band[i] = final_lower_band[i-1]
-            
-            # Determine Supertrend direction and value
-            if close[i] <= final_lower_band[i]:
-                direction[i] = -1
-                supertrend[i] = final_lower_band[i]
-            elif close[i] >= final_upper_band[i]:
-                direction[i] = 1
-                supertrend[i] = final_upper_band[i]
-            else:
-                direction[i] = direction[i-1]
-                if direction[i] == 1:
-                    supertrend[i] = final_lower_band[i]
-                else:
-                    supertrend[i] = final_upper_band[i]
-        
-        return supertrend, direction
+        grid = supertrend_grid(high, low, close, [(period, multiplier)], atr='sma_partial', rule='area')
+        return grid[(period, multiplier)]
     
     def load_data(self, data_df):
         """
@@ -113,11 +50,11 @@ class SupertrendAreaCalculator:
         low = self.data['low'].values
         close = self.data['close'].values
         
-        # Calculate first Supertrend
-        self.supertrend1, _ = self.calculate_supertrend(high, low, close, period1, multiplier1)
-        
-        # Calculate second Supertrend
-        self.supertrend2, _ = self.calculate_supertrend(high, low, close, period2, multiplier2)
+        # Calculate both Supertrends in one pass (shared True Range)
+        grid = supertrend_grid(high, low, close, [(period1, multiplier1), (period2, multiplier2)],
+                               atr='sma_partial', rule='area')
+        self.supertrend1, _ = grid[(period1, multiplier1)]
+        self.supertrend2, _ = grid[(period2, multiplier2)]
         
         # Add to dataframe
         self.data['supertrend1'] = self.supertrend1
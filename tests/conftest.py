@@ -0,0 +1,9 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# the repo's modules are imported by bare name, the websocket scripts from their own folder
+for path in (ROOT, os.path.join(ROOT, "websocket")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
@@ -0,0 +1,45 @@
+import fyers_async_history
+from fyers_async_history import TokenBucket, fetch_history
+
+
+class FakeFyers:
+    # sync client: one candle per call, FAIL raises like a broker error
+    def __init__(self):
+        self.calls = []
+
+    def history(self, data):
+        self.calls.append(data['symbol'])
+        if data['symbol'] == 'FAIL':
+            raise RuntimeError("rate limited")
+        return {'candles': [[1751341500, 1.0, 2.0, 0.5, 1.5, 100]]}
+
+
+class CountingBucket(TokenBucket):
+    def __init__(self):
+        super().__init__()
+        self.acquired = 0
+
+    async def acquire(self):
+        self.acquired += 1
+        await super().acquire()
+
+
+def test_calls_without_a_limiter_share_the_default_quota(monkeypatch):
+    limiter = CountingBucket()
+    monkeypatch.setattr(fyers_async_history, 'DEFAULT_LIMITER', limiter)
+    fyers = FakeFyers()
+    fetch_history(fyers, ['A', 'B'], "5", 1)
+    fetch_history(fyers, ['C'], "15", 1)
+    assert limiter.acquired == 3
+
+
+def test_failures_are_returned_not_printed(capsys):
+    fyers = FakeFyers()
+    errors = {}
+    frames = fetch_history(fyers, ['A', 'FAIL'], "5", 1, limiter=TokenBucket(), errors=errors)
+    assert list(frames) == ['A']
+    assert len(frames['A']) == 1
+    assert list(errors) == ['FAIL']
+    assert isinstance(errors['FAIL'], RuntimeError)
+    assert capsys.readouterr().out == ""
+
@@ -0,0 +1,58 @@
+import threading
+import time
+
+import numpy as np
+
+from fyers_depth_recorder import DepthRecorder, DepthRing, decode_depth
+
+
+class FlakyDepth:
+    # fyers.depth stand-in: raises on the calls listed in fail, answers the rest
+    def __init__(self, fail):
+        self.fail = set(fail)
+        self.calls = 0
+
+    def depth(self, data):
+        self.calls += 1
+        if self.calls in self.fail:
+            raise ConnectionError("connection reset")
+        level = {'price': 100.0 + self.calls, 'volume': 10}
+        return {'s': 'ok', 'd': {data['symbol']: {'ltp': 100.0 + self.calls, 'bids': [level], 'ask': [level],
+                                                  'totalbuyqty': 5, 'totalsellqty': 7}}}
+
+
+def test_poll_keeps_going_after_a_failed_call():
+    recorder = DepthRecorder(FlakyDepth(fail=[2]), ["NSE:SBIN-EQ", "NSE:TCS-EQ"])
+    recorder.poll_once()
+    recorder.poll_once()
+    assert len(recorder.rings["NSE:SBIN-EQ"]) == 2
+    assert len(recorder.rings["NSE:TCS-EQ"]) == 1
+    assert recorder.rings["NSE:TCS-EQ"].latest()['ltp'] == 104.0
+
+
+def test_polling_thread_survives_exceptions():
+    fyers = FlakyDepth(fail=range(1, 4))
+    recorder = DepthRecorder(fyers, ["NSE:SBIN-EQ"], interval=0.001).start()
+    deadline = time.monotonic() + 5
+    while fyers.calls < 10 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    recorder.stop()
+    assert len(recorder.rings["NSE:SBIN-EQ"]) == fyers.calls - 3
+
+
+def test_window_while_appending():
+    ring = DepthRing(capacity=64)
+    depth = {'ltp': 1.0, 'bids': [], 'ask': []}
+
+    def writer():
+        for i in range(5000):
+            ring.append(decode_depth(depth, float(i)))
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    while thread.is_alive():
+        times = ring.window()['time']
+        # a consistent copy is always in arrival order without gaps
+        assert np.all(np.diff(times) == 1)
+    thread.join()
+    assert np.array_equal(ring.window()['time'], np.arange(5000 - 64, 5000))
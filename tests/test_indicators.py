@@ -0,0 +1,138 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from fyers_indicators import adx, atr, supertrend, wilder_rsi
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope="module")
+def ohlc():
+    # random walk around NIFTY levels
+    rng = np.random.default_rng(7)
+    close = 22000 + np.cumsum(rng.normal(0, 15, 5000))
+    high = close + rng.uniform(0, 20, 5000)
+    low = close - rng.uniform(0, 20, 5000)
+    return high, low, close
+
+
+def wilder_sums(values, n):
+    # Wilder's running sums: the plain sum of values[1..n], then sum - sum/n + value
+    out = [np.nan] * len(values)
+    for i in range(n, len(values)):
+        out[i] = sum(values[1:n+1]) if i == n else out[i-1] - out[i-1] / n + values[i]
+    return np.array(out)
+
+
+def true_ranges(high, low, close):
+    return [np.nan] + [max(high[i] - low[i], abs(high[i] - close[i-1]), abs(low[i] - close[i-1])) for i in range(1, len(close))]
+
+
+def reference_adx(high, low, close, n):
+    # the textbook per-bar loops: Wilder sums of TR/+DM/-DM, then the ADX average of DX
+    plus, minus = [0.0], [0.0]
+    for i in range(1, len(close)):
+        up, down = high[i] - high[i-1], low[i-1] - low[i]
+        plus.append(up if up > down and up > 0 else 0.0)
+        minus.append(down if down > up and down > 0 else 0.0)
+    tr_n = wilder_sums(true_ranges(high, low, close), n)
+    di_plus = 100 * wilder_sums(plus, n) / tr_n
+    di_minus = 100 * wilder_sums(minus, n) / tr_n
+    dx = (100 * np.abs(di_plus - di_minus) / np.abs(di_plus + di_minus)).tolist()
+    out = [np.nan] * len(dx)
+    for j in range(2 * n - 1, len(dx)):
+        out[j] = np.mean(dx[j-n+1:j+1]) if j == 2 * n - 1 else ((n - 1) * out[j-1] + dx[j]) / n
+    return np.array(out)
+
+
+def reference_rsi(close, n):
+    # average of the first n gains/losses, then (avg*(n-1) + change)/n
+    delta = np.diff(close).tolist()
+    gain, loss = [max(d, 0.0) for d in delta], [max(-d, 0.0) for d in delta]
+    avg_gain, avg_loss = np.mean(gain[:n]), np.mean(loss[:n])
+    out = [np.nan] * n + [100 - 100 / (1 + avg_gain / avg_loss)]
+    for g, l in zip(gain[n:], loss[n:]):
+        avg_gain, avg_loss = (avg_gain * (n - 1) + g) / n, (avg_loss * (n - 1) + l) / n
+        out.append(100 - 100 / (1 + avg_gain / avg_loss))
+    return np.array(out)
+
+
+def test_adx_matches_per_bar_loops(ohlc):
+    high, low, close = ohlc
+    np.testing.assert_allclose(adx(high, low, close, 14)[3], reference_adx(high, low, close, 14), rtol=1e-9, equal_nan=True)
+
+
+def test_wilder_rsi_matches_per_bar_loop(ohlc):
+    close = ohlc[2]
+    np.testing.assert_allclose(wilder_rsi(close, 14), reference_rsi(close, 14), rtol=1e-9, equal_nan=True)
+
+
+def test_wilder_atr_is_seeded_with_the_mean_true_range(ohlc):
+    high, low, close = ohlc
+    result = atr(high, low, close, 14, wilder=True)
+    assert np.isnan(result[:14]).all()
+    np.testing.assert_allclose(result, wilder_sums(true_ranges(high, low, close), 14) / 14, rtol=1e-9, equal_nan=True)
+
+
+def reference_ewm_atr(DF, n):
+    # the pandas ATR the strategy scripts used before the array kernels
+    df = DF.copy()
+    df['High-Low'] = abs(df['High'] - df['Low'])
+    df['High-PrevClose'] = abs(df['High'] - df['Close'].shift(1))
+    df['Low-PrevClose'] = abs(df['Low'] - df['Close'].shift(1))
+    df['TR'] = df[['High-Low', 'High-PrevClose', 'Low-PrevClose']].max(axis=1, skipna=False)
+    return df['TR'].ewm(com=n, min_periods=n).mean()
+
+
+def reference_supertrend(DF, period, multiplier):
+    # the df.loc band and line loops of fyers_strategy_indicator_ohlc.py before the kernel
+    df = DF.copy()
+    df['ATR'] = reference_ewm_atr(df, period)
+    df["BasicUpper"] = ((df['High'] + df['Low']) / 2) + multiplier * df['ATR']
+    df["BasicLower"] = ((df['High'] + df['Low']) / 2) - multiplier * df['ATR']
+    df["FinalUpper"] = df["BasicUpper"]
+    df["FinalLower"] = df["BasicLower"]
+    ind = df.index
+    for i in range(period, len(df)):
+        if df['Close'][i-1] <= df['FinalUpper'][i-1]:
+            df.loc[ind[i], 'FinalUpper'] = min(df['BasicUpper'][i], df['FinalUpper'][i-1])
+        else:
+            df.loc[ind[i], 'FinalUpper'] = df['BasicUpper'][i]
+    for i in range(period, len(df)):
+        if df['Close'][i-1] >= df['FinalLower'][i-1]:
+            df.loc[ind[i], 'FinalLower'] = max(df['BasicLower'][i], df['FinalLower'][i-1])
+        else:
+            df.loc[ind[i], 'FinalLower'] = df['BasicLower'][i]
+    df['Strend'] = np.nan
+    for test in range(period, len(df)):
+        if df['Close'][test-1] <= df['FinalUpper'][test-1] and df['Close'][test] > df['FinalUpper'][test]:
+            df.loc[ind[test], 'Strend'] = df['FinalLower'][test]
+            break
+        if df['Close'][test-1] >= df['FinalLower'][test-1] and df['Close'][test] < df['FinalLower'][test]:
+            df.loc[ind[test], 'Strend'] = df['FinalUpper'][test]
+            break
+    for i in range(test+1, len(df)):
+        if df['Strend'][i-1] == df['FinalUpper'][i-1] and df['Close'][i] <= df['FinalUpper'][i]:
+            df.loc[ind[i], 'Strend'] = df['FinalUpper'][i]
+        elif df['Strend'][i-1] == df['FinalUpper'][i-1] and df['Close'][i] >= df['FinalUpper'][i]:
+            df.loc[ind[i], 'Strend'] = df['FinalLower'][i]
+        elif df['Strend'][i-1] == df['FinalLower'][i-1] and df['Close'][i] >= df['FinalLower'][i]:
+            df.loc[ind[i], 'Strend'] = df['FinalLower'][i]
+        elif df['Strend'][i-1] == df['FinalLower'][i-1] and df['Close'][i] <= df['FinalLower'][i]:
+            df.loc[ind[i], 'Strend'] = df['FinalUpper'][i]
+    return df
+
+
+@pytest.mark.parametrize("period", [7, 10, 14])
+@pytest.mark.parametrize("name", ["nifty50_1d.csv", "nifty_1d_data_3Y.csv"])
+def test_ewm_atr_and_supertrend_match_the_pandas_loops(name, period):
+    df = pd.read_csv(os.path.join(ROOT, name))
+    expected = reference_supertrend(df, period, 3)
+    np.testing.assert_array_equal(atr(df['High'], df['Low'], df['Close'], period), expected['ATR'].to_numpy())
+    upper, lower, strend, direction = supertrend(df['High'], df['Low'], df['Close'], period, 3)
+    np.testing.assert_array_equal(upper, expected['FinalUpper'].to_numpy())
+    np.testing.assert_array_equal(lower, expected['FinalLower'].to_numpy())
+    np.testing.assert_array_equal(strend, expected['Strend'].to_numpy())
@@ -0,0 +1,92 @@
+import datetime as dt
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import instrument_master
+from instrument_master import IST, InstrumentMaster, is_fresh, last_refresh, load_instrument_list, parse_instrument_list
+
+SAMPLE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "nse_fo_sample.csv")
+
+
+@pytest.fixture(scope="module")
+def master():
+    return InstrumentMaster(parse_instrument_list(SAMPLE))
+
+
+def test_parse_keeps_first_row_and_named_columns():
+    df = parse_instrument_list(SAMPLE)
+    assert len(df) == 51
+    assert df['ticker'].iloc[0] == "NSE:NIFTY26102024800CE"
+    assert df['expiry'].iloc[0] == pd.Timestamp(2026, 10, 20)
+    assert not set(instrument_master.DROP_COLUMNS) & set(df.columns)
+
+
+def test_index_keeps_only_options_sorted(master):
+    assert set(master.df['cepe']) == {'CE', 'PE'}
+    chain = master.contracts("NIFTY", "CE")
+    assert len(chain) == 18
+    assert list(chain['expiry']) == sorted(chain['expiry'])
+
+
+def test_expiries_and_chain(master):
+    expiries = master.expiries("NIFTY", "CE", today=dt.date(2026, 10, 21))
+    assert list(expiries) == [np.datetime64('2026-10-27', 'ns')]
+    assert master.expiry("NIFTY", 1, "PE", today=dt.date(2026, 10, 1)) == pd.Timestamp(2026, 10, 27)
+    strikes = master.strikes("NIFTY", "2026-10-20", "CE")
+    assert list(strikes) == list(range(24800, 25201, 50))
+    assert master.strike_step("BANKNIFTY", "2026-11-24", "PE") == 100
+
+
+def test_lookup(master):
+    row = master.lookup("NIFTY", "PE", "2026-10-27", 25050)
+    assert row['ticker'] == "NSE:NIFTY26102725050PE"
+    assert master.lookup("NIFTY", "PE", "2026-10-27", 25060) is None
+    assert master.lookup("SENSEX", "CE", "2026-10-27", 25050) is None
+
+
+def test_single_strike_expiry(master):
+    assert np.isnan(master.strike_step("RELIANCE", "2026-11-24", "CE"))
+    assert np.isnan(master.strike_step("RELIANCE", "2026-11-24", "PE"))
+
+
+def test_last_refresh_skips_weekend_and_pre_open():
+    saturday = dt.datetime(2026, 10, 17, 12, 0, tzinfo=IST)
+    assert last_refresh(saturday) == dt.datetime(2026, 10, 16, 8, 30, tzinfo=IST)
+    monday_early = dt.datetime(2026, 10, 19, 7, 0, tzinfo=IST)
+    assert last_refresh(monday_early) == dt.datetime(2026, 10, 16, 8, 30, tzinfo=IST)
+
+
+def test_cache_freshness(tmp_path):
+    cache = str(tmp_path / "NSE_FO.csv")
+    assert not is_fresh(cache)
+    with open(SAMPLE) as src, open(cache, "w") as dst:
+        dst.write(src.read())
+    written = dt.datetime(2026, 10, 16, 9, 0, tzinfo=IST).timestamp()
+    os.utime(cache, (written, written))
+    assert is_fresh(cache, now=dt.datetime(2026, 10, 17, 12, 0, tzinfo=IST))
+    assert not is_fresh(cache, now=dt.datetime(2026, 10, 19, 9, 0, tzinfo=IST))
+
+
+def test_fresh_cache_is_used_instead_of_download(tmp_path, monkeypatch):
+    cache = str(tmp_path / "NSE_FO.csv")
+    with open(SAMPLE) as src, open(cache, "w") as dst:
+        dst.write(src.read())
+    read_csv = pd.read_csv
+
+    def offline_read_csv(source, *args, **kwargs):
+        assert not str(source).startswith("http"), "fresh cache must not be downloaded again"
+        return read_csv(source, *args, **kwargs)
+
+    monkeypatch.setattr(instrument_master.pd, "read_csv", offline_read_csv)
+    assert len(load_instrument_list(cache_path=cache)) == 51
+
+
+def test_explicit_source_wins_over_cache(tmp_path):
+    cache = str(tmp_path / "NSE_FO.csv")
+    with open(SAMPLE) as src, open(cache, "w") as dst:
+        dst.write("".join(src.readlines()[:5]))
+    assert is_fresh(cache)
+    assert len(load_instrument_list(SAMPLE, cache_path=cache)) == 51
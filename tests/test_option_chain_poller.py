@@ -0,0 +1,56 @@
+import threading
+
+import pytest
+
+from option_chain_poller import OptionChainClient, ReplayServer
+
+FIRST = {'records': {'timestamp': '01-Jul-2025 09:15:00', 'data': [{'strikePrice': 25000}]}}
+SECOND = {'records': {'timestamp': '01-Jul-2025 09:15:03', 'data': [{'strikePrice': 25050}]}}
+
+
+@pytest.fixture
+def server():
+    server = ReplayServer({'NIFTY': [FIRST], 'BANKNIFTY': [FIRST, SECOND]}).start()
+    yield server
+    server.stop()
+
+
+def test_concurrent_callers_share_one_request(server):
+    client = OptionChainClient(base_url=server.url, ttl=60)
+    callers = 8
+    start = threading.Barrier(callers)
+    results = [None] * callers
+
+    def call(i):
+        start.wait()
+        results[i] = client.get('NIFTY')
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(callers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert server.hits == 1
+    assert client.stats['requests'] == 1
+    assert client.stats['cache_hits'] == callers - 1
+    assert all(result is results[0] for result in results)
+    assert results[0] == FIRST
+
+
+def test_unchanged_chain_revalidates_with_304(server):
+    client = OptionChainClient(base_url=server.url, ttl=60)
+    first = client.get('NIFTY')
+    # past max_age the client asks again with If-None-Match and keeps its copy on 304
+    again = client.get('NIFTY', max_age=0)
+    assert again is first
+    assert server.hits == 2
+    assert client.stats['not_modified'] == 1
+    assert client.stats['primes'] == 1
+
+
+def test_changed_chain_replaces_the_cached_copy(server):
+    client = OptionChainClient(base_url=server.url, ttl=60)
+    assert client.get('BANKNIFTY') == FIRST
+    assert client.get('BANKNIFTY', max_age=0) == SECOND
+    assert client.stats['not_modified'] == 0
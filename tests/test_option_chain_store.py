@@ -0,0 +1,70 @@
+import os
+
+import numpy as np
+
+from fyers_epoch import ist_date, ist_midnight
+from option_chain_store import CHAIN_DTYPE, DELTA_DTYPE, ChainSnapshotStore, decode_cells, encode_cells
+
+DAY = np.datetime64('2025-07-01', 'D').astype(object)
+T0 = ist_midnight(DAY) + 9 * 3600 + 15 * 60
+
+
+def make_chains(polls, strikes=20, seed=0):
+    # a random walk of one expiry's chain, prices on the 0.05 tick
+    rng = np.random.default_rng(seed)
+    chain = np.zeros(strikes * 2, dtype=CHAIN_DTYPE)
+    chain['strike'] = np.repeat(np.arange(24000, 24000 + 50 * strikes, 50), 2)
+    chain['expiry'] = np.datetime64('2025-07-03')
+    chain['side'] = np.tile([0, 1], strikes)
+    chain['oi'] = rng.integers(1000, 200000, len(chain)) * 75
+    chain['ltp'] = np.round(rng.integers(20, 16000, len(chain)) * 0.05, 2)
+    chain['iv'] = np.round(rng.uniform(8, 30, len(chain)), 2)
+    chains = []
+    for _ in range(polls):
+        chain = chain.copy()
+        moved = rng.random(len(chain)) < 0.3
+        chain['ltp'][moved] = np.round(chain['ltp'][moved] + rng.integers(-6, 7, moved.sum()) * 0.05, 2)
+        chain['volume'][moved] += rng.integers(1, 40, moved.sum()) * 75
+        chain['iv'][moved] = np.round(chain['iv'][moved] + rng.integers(-3, 4, moved.sum()) * 0.01, 2)
+        chains.append(chain)
+    return chains
+
+
+def test_snapshots_round_trip(tmp_path):
+    chains = make_chains(25)
+    store = ChainSnapshotStore(str(tmp_path), keyframe_every=10)
+    for i, chain in enumerate(chains):
+        store.append('NIFTY', T0 + 3 * i, chain, underlying=24500.0 + i)
+    for i, chain in enumerate(chains):
+        timestamp, underlying, snapshot = store.snapshot('NIFTY', T0 + 3 * i + 1)
+        assert timestamp == T0 + 3 * i
+        assert underlying == 24500.0 + i
+        assert np.array_equal(snapshot, chain)
+
+
+def test_append_after_interrupted_write(tmp_path):
+    chains = make_chains(30)
+    store = ChainSnapshotStore(str(tmp_path), keyframe_every=10)
+    for i, chain in enumerate(chains[:15]):
+        store.append('NIFTY', T0 + 3 * i, chain)
+    # a crash mid-append leaves a partial record at the end of every file
+    folder = os.path.join(str(tmp_path), 'NIFTY')
+    for name in os.listdir(folder):
+        with open(os.path.join(folder, name), 'ab') as f:
+            f.write(b'\x01\x02\x03')
+
+    store = ChainSnapshotStore(str(tmp_path), keyframe_every=10)
+    assert len(store.day('NIFTY', ist_date(T0))[0]) == 15
+    for i, chain in enumerate(chains[15:], 15):
+        store.append('NIFTY', T0 + 3 * i, chain)
+    for i, chain in enumerate(chains):
+        assert np.array_equal(store.snapshot('NIFTY', T0 + 3 * i)[2], chain)
+
+
+def test_cells_round_trip_with_wide_diffs():
+    cells = np.zeros(6, dtype=DELTA_DTYPE)
+    cells['row'] = [0, 1, 7, 300, 301, 65535]
+    cells['field'] = [0, 0, 2, 4, 4, 8]
+    cells['diff'] = [1, -1, 32767, -32768, 40000, -2 ** 31]
+    assert np.array_equal(decode_cells(encode_cells(cells), len(cells)), cells)
+
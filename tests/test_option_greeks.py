@@ -0,0 +1,32 @@
+import numpy as np
+
+from option_greeks import RISK_FREE_RATE, bs_price, implied_vol
+
+
+def test_implied_vol_round_trips_across_moneyness():
+    # deep ITM to deep OTM calls and puts, a day to a year out, 2% to 200% vol
+    rng = np.random.default_rng(3)
+    n = 4000
+    spot = np.full(n, 22000.0)
+    strike = spot * np.exp(rng.uniform(-0.5, 0.5, n))
+    years = rng.uniform(1 / 365, 1.0, n)
+    vol = rng.uniform(0.02, 2.0, n)
+    is_call = rng.random(n) < 0.5
+    price = bs_price(spot, strike, years, RISK_FREE_RATE, vol, is_call)
+
+    # a vol is only recoverable from a price with at least a tick (0.05) of time value
+    discount = strike * np.exp(-RISK_FREE_RATE * years)
+    intrinsic = np.where(is_call, np.maximum(spot - discount, 0), np.maximum(discount - spot, 0))
+    priced = price - intrinsic >= 0.05
+    assert priced.sum() > 3000
+
+    solved = implied_vol(price[priced], spot[priced], strike[priced], years[priced], is_call=is_call[priced])
+    assert not np.isnan(solved).any()
+    np.testing.assert_allclose(solved, vol[priced], rtol=0, atol=1e-8)
+
+
+def test_implied_vol_nan_outside_bounds():
+    spot, strike, years = 22000.0, 21000.0, 30 / 365
+    below_intrinsic = spot - strike * np.exp(-RISK_FREE_RATE * years) - 1
+    solved = implied_vol([below_intrinsic, 0.0, spot + 1, 500.0], spot, strike, [years, years, years, 0.0])
+    assert np.isnan(solved).all()
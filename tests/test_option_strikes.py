@@ -0,0 +1,72 @@
+import datetime as dt
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from instrument_master import InstrumentMaster, parse_instrument_list
+from option_strikes import StrikeTable
+
+SAMPLE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "nse_fo_sample.csv")
+TODAY = dt.date(2026, 10, 1)
+
+
+@pytest.fixture(scope="module")
+def table():
+    # groups: NIFTY 20 Oct, NIFTY 27 Oct, BANKNIFTY 24 Nov, BANKNIFTY none, RELIANCE 24 Nov, RELIANCE none
+    master = InstrumentMaster(parse_instrument_list(SAMPLE))
+    return StrikeTable(master, ["NIFTY", "BANKNIFTY", "RELIANCE"], expiries=2, today=TODAY)
+
+
+def test_atm_is_the_nearest_strike(table):
+    picked = table.select([25012, 55240, 1400], n_strikes=1)
+    np.testing.assert_array_equal(picked['atm'], [25000, 25000, 55200, np.nan, 1400, np.nan])
+    np.testing.assert_array_equal(picked['strike'][0], [24950, 25000, 25050])
+    assert picked['valid'][0].all()
+
+
+def test_atm_at_a_grid_edge(table):
+    # NIFTY lists 24800..25200: spots beyond either end pin ATM to the end strike
+    low = table.select([24500, 55000, 1400], n_strikes=2)
+    np.testing.assert_array_equal(low['strike'][0], [np.nan, np.nan, 24800, 24850, 24900])
+    np.testing.assert_array_equal(low['valid'][0], [False, False, True, True, True])
+    np.testing.assert_array_equal(low['ce_pos'][0][:2], [-1, -1])
+    high = table.select([25600, 55000, 1400], n_strikes=2)
+    np.testing.assert_array_equal(high['strike'][1], [25100, 25150, 25200, np.nan, np.nan])
+    np.testing.assert_array_equal(high['pe_pos'][1][3:], [-1, -1])
+
+
+def test_missing_expiry_selects_nothing(table):
+    picked = table.select([25000, 55200, 1400])
+    assert np.isnat(table.expiry[3]) and np.isnat(table.expiry[5])
+    for group in (3, 5):
+        assert not picked['valid'][group].any()
+        assert np.isnan(picked['strike'][group]).all()
+        assert (picked['ce_pos'][group] == -1).all() and (picked['pe_pos'][group] == -1).all()
+    frame = table.select_frame({"NIFTY": 25000, "BANKNIFTY": 55200, "RELIANCE": 1400})
+    assert list(frame.loc[frame['symbol'] == "BANKNIFTY", 'expiry_rank'].unique()) == [0]
+
+
+def test_one_sided_strike(table):
+    # RELIANCE 1400 is listed as a CE only
+    picked = table.select([25000, 55200, 1400], n_strikes=1)
+    assert picked['valid'][4].tolist() == [False, True, False]
+    assert picked['ce_pos'][4][1] >= 0
+    assert picked['pe_pos'][4][1] == -1
+    frame = table.select_frame({"NIFTY": 25000, "BANKNIFTY": 55200, "RELIANCE": 1400}, n_strikes=1)
+    row = frame[frame['symbol'] == "RELIANCE"].iloc[0]
+    assert row['CE'] == "NSE:RELIANCE2611241400CE"
+    assert pd.isna(row['PE'])
+
+
+def test_nan_spot_selects_nothing(table):
+    picked = table.select([np.nan, 55200, 1400])
+    assert np.isnan(picked['atm'][:2]).all()
+    assert not picked['valid'][:2].any()
+    assert picked['valid'][2].any()
+    # an underlying missing from the spots dict is a NaN spot
+    frame = table.select_frame({"BANKNIFTY": 55200})
+    assert set(frame['symbol']) == {"BANKNIFTY"}
+    assert list(frame['strike']) == [55000, 55100, 55200, 55300, 55400]
+    assert list(frame['expiry']) == [pd.Timestamp(2026, 11, 24)] * 5
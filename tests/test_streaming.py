@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import fyers_indicators
+from fyers_streaming import ATR, RSI, Bollinger, RollingMean, RollingVar
+
+
+def walk_with_constant_runs(seed, bars=3000):
+    # 2 dp random walk with flat stretches shorter and longer than the window
+    rng = np.random.default_rng(seed)
+    close = np.round(100 + np.cumsum(rng.normal(0, 1, bars)), 2)
+    for start, length in ((500, 40), (1000, 3), (2000, 30), (2499, 101)):
+        close[start:start + length] = close[start]
+    return close
+
+
+def stream(indicator, values):
+    return np.array([indicator.update(value) for value in values])
+
+
+@pytest.mark.parametrize('seed', range(6))
+def test_rolling_mean_and_var_match_pandas(seed):
+    close = walk_with_constant_runs(seed)
+    series = pd.Series(close)
+    np.testing.assert_allclose(stream(RollingMean(20), close), series.rolling(20).mean().to_numpy(), rtol=1e-12, atol=1e-9, equal_nan=True)
+    # a flat window is 0 in exact arithmetic, compare the std there in absolute terms
+    np.testing.assert_allclose(np.sqrt(stream(RollingVar(20), close)), series.rolling(20).std().to_numpy(),
+                               rtol=1e-9, atol=1e-5, equal_nan=True)
+
+
+def test_bollinger_matches_pandas():
+    close = walk_with_constant_runs(0)
+    series = pd.Series(close)
+    bands = Bollinger(20, 2.0)
+    upper = np.array([(bands.update(value), bands.upper)[1] for value in close])
+    np.testing.assert_allclose(upper, (series.rolling(20).mean() + 2.0 * series.rolling(20).std()).to_numpy(),
+                               rtol=1e-9, atol=1e-5, equal_nan=True)
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_rolling_var_with_gaps_and_min_periods(seed):
+    # one tick moves, flat stretches and missing values
+    rng = np.random.default_rng(seed)
+    close = np.round(100 + rng.integers(0, 2, 4000) * 0.01, 2)
+    for start in rng.integers(0, 3800, 15):
+        close[start:start + rng.integers(1, 150)] = close[start]
+    close[rng.integers(0, 4000, 30)] = np.nan
+    window = int(rng.integers(2, 60))
+    expected = pd.Series(close).rolling(window, min_periods=1).var(ddof=0).to_numpy()
+    result = stream(RollingVar(window, min_periods=1, ddof=0), close)
+    np.testing.assert_array_equal(np.isnan(result), np.isnan(expected))
+    np.testing.assert_allclose(np.sqrt(result), np.sqrt(expected), rtol=0, atol=1e-5, equal_nan=True)
+
+
+def test_rsi_matches_batch():
+    close = walk_with_constant_runs(1)
+    indicator = RSI(14)
+    np.testing.assert_allclose(stream(indicator, close), fyers_indicators.rsi(close, 14), rtol=1e-9, atol=1e-6, equal_nan=True)
+
+
+@pytest.mark.parametrize('wilder', [False, True])
+def test_atr_matches_batch(wilder):
+    rng = np.random.default_rng(3)
+    close = 500 + np.cumsum(rng.normal(0, 2, 2000))
+    high, low = close + rng.uniform(0, 3, 2000), close - rng.uniform(0, 3, 2000)
+    indicator = ATR(14, wilder=wilder)
+    result = np.array([indicator.update(h, l, c) for h, l, c in zip(high, low, close)])
+    np.testing.assert_array_equal(result, fyers_indicators.atr(high, low, close, 14, wilder=wilder))
@@ -0,0 +1,113 @@
+import numpy as np
+import pytest
+
+from fyers_indicators import supertrend
+from fyers_supertrend_grid import param_grid, supertrend_grid
+
+PAIRS = param_grid([7, 14, 21], [1, 2, 3])
+
+
+@pytest.fixture(scope="module")
+def ohlc():
+    # random walk around NIFTY levels
+    rng = np.random.default_rng(11)
+    close = 22000 + np.cumsum(rng.normal(0, 15, 3000))
+    high = close + rng.uniform(0, 20, 3000)
+    low = close - rng.uniform(0, 20, 3000)
+    return high, low, close
+
+
+def true_ranges(high, low, close):
+    # the scripts' TR: high-low on the first bar
+    return [high[0] - low[0]] + [max(high[i] - low[i], abs(high[i] - close[i-1]), abs(low[i] - close[i-1])) for i in range(1, len(close))]
+
+
+def reference_ha(high, low, close, period, multiplier):
+    # heikin-ashi_supertrend.py: rolling mean ATR, flip on a close beyond the previous band
+    tr = true_ranges(high, low, close)
+    atr = [np.nan] * (period - 1) + [np.mean(tr[i-period+1:i+1]) for i in range(period - 1, len(tr))]
+    upper = [(high[i] + low[i]) / 2 + multiplier * atr[i] for i in range(len(close))]
+    lower = [(high[i] + low[i]) / 2 - multiplier * atr[i] for i in range(len(close))]
+    line = [np.nan] * len(close)
+    direction = [True] * len(close)
+    for i in range(period, len(close)):
+        if close[i] > upper[i-1]:
+            direction[i] = True
+        elif close[i] < lower[i-1]:
+            direction[i] = False
+        else:
+            direction[i] = direction[i-1]
+            if direction[i] and lower[i] < lower[i-1]:
+                lower[i] = lower[i-1]
+            if not direction[i] and upper[i] > upper[i-1]:
+                upper[i] = upper[i-1]
+        line[i] = lower[i] if direction[i] else upper[i]
+    return np.array(line), np.where(direction, 1, -1)
+
+
+def reference_classic(high, low, close, period, multiplier):
+    # heikin_ashi_backtest.py: Wilder ATR, final bands, the line follows the band the close respects
+    tr = true_ranges(high, low, close)
+    atr = [np.nan] * len(tr)
+    for i in range(period, len(tr)):
+        atr[i] = np.mean(tr[1:period+1]) if i == period else (atr[i-1] * (period - 1) + tr[i]) / period
+    upper = [(high[i] + low[i]) / 2 + multiplier * atr[i] for i in range(len(close))]
+    lower = [(high[i] + low[i]) / 2 - multiplier * atr[i] for i in range(len(close))]
+    line = [np.nan] * len(close)
+    trend = [True] * len(close)
+    for i in range(period + 1, len(close)):
+        if not (upper[i] < upper[i-1] or close[i-1] > upper[i-1]):
+            upper[i] = upper[i-1]
+        if not (lower[i] > lower[i-1] or close[i-1] < lower[i-1]):
+            lower[i] = lower[i-1]
+        if line[i-1] == upper[i-1]:
+            line[i], trend[i] = (upper[i], False) if close[i] <= upper[i] else (lower[i], True)
+        elif line[i-1] == lower[i-1]:
+            line[i], trend[i] = (lower[i], True) if close[i] >= lower[i] else (upper[i], False)
+        else:
+            line[i] = upper[i]
+    return np.array(line), np.where(trend, 1, -1)
+
+
+def reference_area(high, low, close, period, multiplier):
+    # supertrend_area_calculator.py: mean of up to the last n TRs, close beyond a band sets the direction
+    tr = true_ranges(high, low, close)
+    atr = [np.mean(tr[max(0, i-period+1):i+1]) for i in range(len(tr))]
+    upper = [(high[i] + low[i]) / 2 + multiplier * atr[i] for i in range(len(close))]
+    lower = [(high[i] + low[i]) / 2 - multiplier * atr[i] for i in range(len(close))]
+    line = [close[0]] + [np.nan] * (len(close) - 1)
+    direction = [1] * len(close)
+    for i in range(1, len(close)):
+        if not (upper[i] < upper[i-1] or close[i-1] > upper[i-1]):
+            upper[i] = upper[i-1]
+        if not (lower[i] > lower[i-1] or close[i-1] < lower[i-1]):
+            lower[i] = lower[i-1]
+        if close[i] <= lower[i]:
+            direction[i], line[i] = -1, lower[i]
+        elif close[i] >= upper[i]:
+            direction[i], line[i] = 1, upper[i]
+        else:
+            direction[i] = direction[i-1]
+            line[i] = lower[i] if direction[i] == 1 else upper[i]
+    return np.array(line), np.array(direction)
+
+
+def reference_fyers(high, low, close, period, multiplier):
+    upper, lower, line, direction = supertrend(high, low, close, period, multiplier)
+    return line, direction
+
+
+@pytest.mark.parametrize("atr, rule, reference", [
+    ('ewm', 'fyers', reference_fyers),
+    ('sma', 'ha', reference_ha),
+    ('wilder', 'classic', reference_classic),
+    ('sma_partial', 'area', reference_area),
+])
+def test_grid_matches_script_loops(ohlc, atr, rule, reference):
+    high, low, close = ohlc
+    grid = supertrend_grid(high, low, close, PAIRS, atr=atr, rule=rule)
+    for period, multiplier in PAIRS:
+        line, direction = grid[(period, multiplier)]
+        expected_line, expected_direction = reference(high, low, close, period, multiplier)
+        np.testing.assert_allclose(line, expected_line, rtol=1e-12, equal_nan=True)
+        np.testing.assert_array_equal(direction, expected_direction)
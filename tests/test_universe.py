@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import fyers_indicators
+import fyers_universe
+
+BARS = 600
+
+
+def frame(seed, keep):
+    # random walk OHLC on a 1 minute epoch axis, only the bars in keep
+    rng = np.random.default_rng(seed)
+    close = 500 + np.cumsum(rng.normal(0, 2, BARS))
+    high = close + rng.uniform(0, 3, BARS)
+    low = close - rng.uniform(0, 3, BARS)
+    df = pd.DataFrame({'Timestamp': 1751341500 + 60 * np.arange(BARS), 'Open': close + rng.normal(0, 1, BARS),
+                       'High': high, 'Low': low, 'Close': close, 'Volume': rng.integers(100, 10000, BARS)})
+    return df[keep].reset_index(drop=True)
+
+
+@pytest.fixture(scope="module")
+def universe():
+    bars = np.arange(BARS)
+    data = {
+        'FULL': frame(1, bars >= 0),
+        'DROP200': frame(2, bars != 200),
+        'LATE': frame(3, bars >= 50),
+        'HALTED': frame(4, (bars < 300) | (bars >= 320)),
+    }
+    symbols, timestamps, m = fyers_universe.align(data)
+    return data, symbols, timestamps, m
+
+
+def own(m, row, timestamps, df):
+    # the row's values on the symbol's own bars
+    return m[row, np.searchsorted(timestamps, df['Timestamp'].to_numpy())]
+
+
+def test_gaps_stay_nan(universe):
+    data, symbols, timestamps, m = universe
+    strend = fyers_universe.supertrend(m['High'], m['Low'], m['Close'])[2]
+    row = symbols.index('DROP200')
+    assert np.isnan(m['Close'][row, 200]) and np.isnan(strend[row, 200])
+
+
+def test_recursions_match_per_ticker_functions(universe):
+    data, symbols, timestamps, m = universe
+    upper, lower, strend, direction = fyers_universe.supertrend(m['High'], m['Low'], m['Close'], 7, 3)
+    atr = fyers_universe.atr(m['High'], m['Low'], m['Close'], 14)
+    atr_wilder = fyers_universe.atr(m['High'], m['Low'], m['Close'], 14, wilder=True)
+    ema = fyers_universe.ema(m['Close'], 20)
+    rsi = fyers_universe.rsi(m['Close'], 14)
+    for row, symbol in enumerate(symbols):
+        df = data[symbol]
+        expected = fyers_indicators.supertrend(df['High'], df['Low'], df['Close'], 7, 3)
+        for got, want in zip((upper, lower, strend, direction), expected):
+            np.testing.assert_array_equal(own(got, row, timestamps, df), want)
+        np.testing.assert_array_equal(own(atr, row, timestamps, df), fyers_indicators.atr(df['High'], df['Low'], df['Close'], 14))
+        np.testing.assert_array_equal(own(atr_wilder, row, timestamps, df),
+                                      fyers_indicators.atr(df['High'], df['Low'], df['Close'], 14, wilder=True))
+        np.testing.assert_array_equal(own(ema, row, timestamps, df), df['Close'].ewm(span=20).mean().to_numpy())
+        np.testing.assert_allclose(own(rsi, row, timestamps, df), fyers_indicators.rsi(df['Close'], 14), rtol=1e-9)
+
+
+def test_windows_match_pandas_per_ticker(universe):
+    data, symbols, timestamps, m = universe
+    bands = fyers_universe.bollinger(m['Close'], 20, 2.0)
+    line, signal = fyers_universe.macd(m['Close'])
+    for row, symbol in enumerate(symbols):
+        close = data[symbol]['Close']
+        middle, std = close.rolling(20).mean(), close.rolling(20).std()
+        np.testing.assert_allclose(own(bands['middle'], row, timestamps, data[symbol]), middle, rtol=1e-12)
+        np.testing.assert_allclose(own(bands['upper'], row, timestamps, data[symbol]), middle + 2.0 * std, rtol=1e-12)
+        want = close.ewm(span=12, min_periods=12).mean() - close.ewm(span=26, min_periods=26).mean()
+        np.testing.assert_array_equal(own(line, row, timestamps, data[symbol]), want.to_numpy())
+        np.testing.assert_array_equal(own(signal, row, timestamps, data[symbol]), want.ewm(span=9, min_periods=9).mean().to_numpy())
+
+
+def test_scan_after_a_dropped_bar(universe):
+    data, symbols, timestamps, m = universe
+    result = fyers_universe.scan(data).set_index('symbol')
+    for symbol, df in data.items():
+        st = fyers_indicators.supertrend(df['High'], df['Low'], df['Close'], 7, 3)[2]
+        assert result.loc[symbol, 'st'] == st[-1]
+        assert result.loc[symbol, 'rsi'] == pytest.approx(fyers_indicators.rsi(df['Close'], 14)[-1], rel=1e-9)
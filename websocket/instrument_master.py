@@ -0,0 +1,172 @@
+"""
+Cached, indexed fyers instrument master (NSE_FO.csv).
+
+The symbol master is downloaded at most once per trading day: the raw CSV is
+kept at cache_path and reused until the next daily refresh (08:30 IST, the
+master is republished before the open). Rows are sorted by
+(underlying, CE/PE, expiry, strike), so every lookup is a dict hit for the
+(underlying, CE/PE) block plus binary searches on expiry and strike instead
+of an iterrows scan over the whole table.
+
+Pass a saved copy of NSE_FO.csv as `source` to work offline.
+"""
+
+import os
+import datetime as dt
+import numpy as np
+import pandas as pd
+
+FO_URL = "https://public.fyers.in/sym_details/NSE_FO.csv"
+
+COLUMN_NAMES = ["token","description", "temp1", "temp2", "temp3", "temp4", "updatedOn", "updatedAt", "ticker",
+                "temp6", "temp7", "token2", "symbol", "token_spot", "strike", "cepe", "temp8", "temp9", "temp10"]
+DROP_COLUMNS = ['temp1', 'temp2', 'temp3','temp4','temp6','temp7','temp8','temp9']
+
+IST = dt.timezone(dt.timedelta(hours=5, minutes=30))
+REFRESH_TIME = dt.time(8, 30)
+
+
+def last_refresh(now=None):
+    """most recent daily refresh point (08:30 IST on a weekday) at or before now"""
+    if now is None:
+        now = dt.datetime.now(IST)
+    boundary = dt.datetime.combine(now.date(), REFRESH_TIME, tzinfo=IST)
+    if now < boundary:
+        boundary -= dt.timedelta(1)
+    while boundary.weekday() >= 5:
+        boundary -= dt.timedelta(1)
+    return boundary
+
+
+def is_fresh(cache_path, now=None):
+    """True if cache_path was written after the last daily refresh"""
+    if not os.path.isfile(cache_path):
+        return False
+    modified = dt.datetime.fromtimestamp(os.path.getmtime(cache_path), IST)
+    return modified >= last_refresh(now)
+
+
+def parse_instrument_list(source):
+    """raw NSE_FO.csv (url or path) -> DataFrame with the named columns and a parsed expiry"""
+    df = pd.read_csv(source, header=None)
+    df.dropna(axis=1, how='all', inplace=True)
+    df.columns = COLUMN_NAMES
+    df = df.drop(columns=DROP_COLUMNS, errors='ignore')
+    df['extractedDate'] = df['description'].str.extract(r'(\d{2} \w{3} \d{2})')
+    # Convert the "ExtractedDate" column to datetime format
+    df['expiry'] = pd.to_datetime(df['extractedDate'], format='%y %b %d')
+    return df
+
+
+def load_instrument_list(source=None, cache_path="NSE_FO.csv", refresh=False):
+    """
+    Instrument list from a local source file when one is given. Otherwise
+    from cache_path if it is from the current trading day, else downloaded
+    from source (FO_URL by default) and saved to cache_path.
+    """
+    if source is None:
+        source = FO_URL
+    if not source.startswith("http"):
+        # an explicitly passed saved copy always wins over the cache
+        return parse_instrument_list(source)
+    if not refresh and is_fresh(cache_path):
+        return parse_instrument_list(cache_path)
+    raw = pd.read_csv(source, header=None)
+    tmp_path = cache_path + ".tmp"
+    raw.to_csv(tmp_path, header=False, index=False)
+    os.replace(tmp_path, cache_path)
+    return parse_instrument_list(cache_path)
+
+
+class InstrumentMaster:
+    """
+    Option contracts indexed by (underlying, CE/PE, expiry, strike).
+
+    self.df holds the rows sorted by that key; self.blocks maps
+    (underlying, CE/PE) to its row range and the expiry/strike arrays are
+    searched inside a block.
+    """
+
+    def __init__(self, df):
+        df = df[df['cepe'].isin(['CE', 'PE'])]
+        self.df = df.sort_values(['symbol', 'cepe', 'expiry', 'strike'], kind='stable').reset_index(drop=True)
+        self.expiry_values = self.df['expiry'].to_numpy(dtype='datetime64[ns]')
+        self.strike_values = self.df['strike'].to_numpy(dtype=np.float64)
+        self.blocks = {}
+        keys = list(zip(self.df['symbol'], self.df['cepe']))
+        start = 0
+        for i in range(1, len(keys) + 1):
+            if i == len(keys) or keys[i] != keys[start]:
+                self.blocks[keys[start]] = (start, i)
+                start = i
+
+    @classmethod
+    def load(cls, source=None, cache_path="NSE_FO.csv", refresh=False):
+        return cls(load_instrument_list(source, cache_path, refresh))
+
+    def _block(self, symbol, option_type):
+        return self.blocks.get((symbol, option_type), (0, 0))
+
+    def _expiry_range(self, symbol, option_type, expiry):
+        start, end = self._block(symbol, option_type)
+        expiry = np.datetime64(pd.Timestamp(expiry).normalize().to_datetime64(), 'ns')
+        lo = start + np.searchsorted(self.expiry_values[start:end], expiry, side='left')
+        hi = start + np.searchsorted(self.expiry_values[start:end], expiry, side='right')
+        return lo, hi
+
+    def contracts(self, symbol, option_type="CE"):
+        """all option_type contracts on an underlying, sorted by expiry and strike"""
+        start, end = self._block(symbol, option_type)
+        return self.df.iloc[start:end]
+
+    def expiries(self, symbol, option_type="CE", today=None):
+        """sorted expiries that have not passed yet"""
+        start, end = self._block(symbol, option_type)
+        if today is None:
+            today = dt.date.today()
+        expiries = np.unique(self.expiry_values[start:end])
+        return expiries[expiries >= np.datetime64(today, 'ns')]
+
+    def expiry(self, symbol, duration=0, option_type="CE", today=None):
+        """duration = 0 means the closest expiry, 1 means the next closest"""
+        return pd.Timestamp(self.expiries(symbol, option_type, today)[duration])
+
+    def chain(self, symbol, expiry, option_type="CE"):
+        """contracts of one expiry, sorted by strike"""
+        lo, hi = self._expiry_range(symbol, option_type, expiry)
+        return self.df.iloc[lo:hi]
+
+    def strikes(self, symbol, expiry, option_type="CE"):
+        lo, hi = self._expiry_range(symbol, option_type, expiry)
+        return self.strike_values[lo:hi]
+
+    def strike_step(self, symbol, expiry, option_type="CE"):
+        """smallest gap between two listed strikes, NaN with fewer than two strikes"""
+        strikes = np.unique(self.strikes(symbol, expiry, option_type))
+        if len(strikes) < 2:
+            return np.nan
+        return np.diff(strikes).min()
+
+    def position(self, symbol, option_type, expiry, strike):
+        """row position of the contract in self.df, or None"""
+        lo, hi = self._expiry_range(symbol, option_type, expiry)
+        i = lo + np.searchsorted(self.strike_values[lo:hi], strike, side='left')
+        if i < hi and self.strike_values[i] == strike:
+            return int(i)
+        return None
+
+    def lookup(self, symbol, option_type, expiry, strike):
+        """contract row for (underlying, CE/PE, expiry, strike), or None"""
+        i = self.position(symbol, option_type, expiry, strike)
+        return None if i is None else self.df.iloc[i]
+
+    def atm(self, symbol, underlying_price, duration=0, option_type="CE"):
+        """contract with the strike closest to underlying_price on the duration-th expiry"""
+        expiry = self.expiry(symbol, duration, option_type)
+        step = self.strike_step(symbol, expiry, option_type)
+        if step != step:
+            # a single listed strike (or none) is the closest there is
+            strikes = self.strikes(symbol, expiry, option_type)
+            return self.lookup(symbol, option_type, expiry, strikes[0]) if len(strikes) else None
+        closest_atm = round(underlying_price / step, 0) * step
+        return self.lookup(symbol, option_type, expiry, closest_atm)
@@ -1,60 +1,52 @@
 
+import time
 import requests
-import csv
+from option_chain_poller import OptionChainClient
+from option_greeks import chain_greeks
+from option_chain_analytics import ChainAnalytics
+from option_chain_store import ChainSnapshotStore, chain_to_frame, flatten_chain, parse_chain_timestamp
 
-def getOptionChain(symbol, expiry):
-    # Define the URL
-    url = "https://www.nseindia.com/api/option-chain-indices?symbol="+symbol
-
-    # Set headers to mimic a browser request
-    headers = {
-        "User-Agent": "Mozilla/5.0",
-    }
-
-    # Send a GET request to the URL with headers
-    response = requests.get(url, headers=headers)
-
-    # Check if the request was successful (status code 200)
-    if response.status_code == 200:
-        # Parse the JSON data from the response
-        data = response.json()
-        #print(data)
+chain_store = ChainSnapshotStore()
+# base_url can point at a ReplayServer for offline runs
+client = OptionChainClient()
+analytics = {}  # (symbol, expiry) -> ChainAnalytics, updated with every snapshot
 
+def getOptionChain(symbol, expiry):
+    # One keep-alive session with primed cookies, responses cached for client.ttl seconds
+    try:
+        data = client.get(symbol)
+    except requests.RequestException as e:
+        print("Failed to retrieve data.", e)
+        return
+
+    if data:
         # Extract the relevant data from the JSON response
         records = data['records']['data']
         #print(records)
 
+        # Flatten the CE/PE dicts of the target expiry into typed columns
+        chain = flatten_chain(records, expiry)
+        print(chain_to_frame(chain))
 
-        target_expiry_date = expiry
-        # Create an empty list to store filtered records
-        filtered_records = []
+        timestamp = data['records'].get('timestamp')
+        timestamp = parse_chain_timestamp(timestamp) if timestamp else int(time.time())
+        underlying = data['records'].get('underlyingValue', float('nan'))
 
-        # Iterate through records and filter based on "expiryDate"
-        for record in records:
-            if record.get("expiryDate") == target_expiry_date:
-                filtered_records.append(record)
+        # IV and Greeks of every strike from its LTP
+        print(chain_greeks(chain, underlying, timestamp))
 
-        # Now, filtered_records contains dictionaries where "expiryDate" is "28-Sep-2023"
-        print(filtered_records)
+        # PCR, max pain and OI support/resistance, updated from the strikes that changed
+        chain_analytics = analytics.setdefault((symbol, expiry), ChainAnalytics(expiry))
+        print(chain_analytics.update(chain))
 
+        # Append the snapshot to the delta-compressed store (option_chain_store/<symbol>/<date>.*)
+        chain_store.append(symbol, timestamp, chain, underlying)
 
         # Define the CSV file name
         csv_file = "option_chain_data.csv"
-        # Define the CSV header fields
-        csv_fields = filtered_records[0].keys()
-        # Write the filtered data to the CSV file
-        with open(csv_file, 'w', newline='') as csvfile:
-            csvwriter = csv.DictWriter(csvfile, fieldnames=csv_fields)
-
-            # Write the header
-            csvwriter.writeheader()
-
-            # Write the filtered records
-            csvwriter.writerows(filtered_records)
+        chain_to_frame(chain).to_csv(csv_file, index=False)
         print(f"Filtered data has been saved to '{csv_file}'.")
 
-    else:
-        print("Failed to retrieve data. Status code:", response.status_code)
 
 symbol = "NIFTY"
 expiry = "03-Jul-2025"  #DD-Mmm-YYYY
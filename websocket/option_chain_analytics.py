@@ -0,0 +1,131 @@
+"""
+Streaming PCR, max pain and OI support/resistance over chain snapshots.
+
+ChainAnalytics keeps call/put OI per strike for one expiry. Each update()
+compares the new snapshot with the stored OI and applies only the strikes
+that changed to the running totals (PCR, OI-weighted levels) and to the
+OI-change arrays. Max pain is evaluated for every strike with prefix sums:
+
+    pain(K_j) = K_j * sum(c_i, i<j) - sum(c_i k_i, i<j)
+              + sum(p_i k_i, i>j) - K_j * sum(p_i, i>j)
+
+so it costs O(strikes) instead of a strikes x strikes loop, and it is only
+redone when some OI actually changed.
+"""
+
+import numpy as np
+import pandas as pd
+
+from option_chain_store import parse_expiry
+
+
+def max_pain(strikes, call_oi, put_oi):
+    """
+    (max pain strike, pain at every strike) for sorted strikes: the total
+    value of open calls and puts at expiry if the underlying settles at each strike.
+    """
+    strikes = np.asarray(strikes, dtype=np.float64)
+    call_oi = np.asarray(call_oi, dtype=np.float64)
+    put_oi = np.asarray(put_oi, dtype=np.float64)
+    # calls with strikes below K_j and puts with strikes above K_j finish in the money
+    call_count = np.concatenate([[0], np.cumsum(call_oi)[:-1]])
+    call_value = np.concatenate([[0], np.cumsum(call_oi * strikes)[:-1]])
+    put_count = np.concatenate([np.cumsum(put_oi[::-1])[::-1][1:], [0]])
+    put_value = np.concatenate([np.cumsum((put_oi * strikes)[::-1])[::-1][1:], [0]])
+    pain = strikes * call_count - call_value + put_value - strikes * put_count
+    return strikes[np.argmin(pain)], pain
+
+
+class ChainAnalytics:
+    """
+    Incremental option chain analytics for one expiry. Feed it CHAIN_DTYPE
+    snapshots (option_chain_store.flatten_chain) with update().
+    """
+
+    def __init__(self, expiry=None):
+        self.expiry = None if expiry is None else parse_expiry(expiry)
+        self.strikes = np.empty(0)
+        self.call_oi = np.empty(0, dtype=np.int64)
+        self.put_oi = np.empty(0, dtype=np.int64)
+        self.open_call_oi = np.empty(0, dtype=np.int64)  # first snapshot of the session
+        self.open_put_oi = np.empty(0, dtype=np.int64)
+        self.last_call_change = np.empty(0, dtype=np.int64)  # change applied by the last update
+        self.last_put_change = np.empty(0, dtype=np.int64)
+        self.totals = {'call': 0, 'put': 0, 'call_strike': 0.0, 'put_strike': 0.0}
+        self.max_pain_strike = np.nan
+        self.pain = np.empty(0)
+        self.changed_strikes = np.empty(0)
+
+    def _reindex(self, strikes):
+        """grow the per-strike arrays to a new strike list (new strikes start at 0 OI)"""
+        merged = np.union1d(self.strikes, strikes)
+        position = np.searchsorted(merged, self.strikes)
+        for name in ('call_oi', 'put_oi', 'open_call_oi', 'open_put_oi', 'last_call_change', 'last_put_change'):
+            grown = np.zeros(len(merged), dtype=np.int64)
+            grown[position] = getattr(self, name)
+            setattr(self, name, grown)
+        self.strikes = merged
+
+    def _side_oi(self, chain, side):
+        rows = chain[chain['side'] == side]
+        oi = np.zeros(len(self.strikes), dtype=np.int64)
+        oi[np.searchsorted(self.strikes, rows['strike'])] = rows['oi']
+        return oi
+
+    def update(self, chain):
+        """apply one snapshot and return the summary()"""
+        if self.expiry is not None:
+            chain = chain[chain['expiry'] == self.expiry]
+        first = len(self.strikes) == 0
+        if not np.isin(chain['strike'], self.strikes).all():
+            self._reindex(np.unique(chain['strike']))
+
+        call_oi = self._side_oi(chain, 0)
+        put_oi = self._side_oi(chain, 1)
+        if first:
+            self.open_call_oi, self.open_put_oi = call_oi.copy(), put_oi.copy()
+
+        # only the strikes whose OI moved touch the running totals
+        self.last_call_change = call_oi - self.call_oi
+        self.last_put_change = put_oi - self.put_oi
+        changed = np.flatnonzero(self.last_call_change | self.last_put_change)
+        if len(changed):
+            dc, dp, k = self.last_call_change[changed], self.last_put_change[changed], self.strikes[changed]
+            self.totals['call'] += int(dc.sum())
+            self.totals['put'] += int(dp.sum())
+            self.totals['call_strike'] += float((dc * k).sum())
+            self.totals['put_strike'] += float((dp * k).sum())
+            self.call_oi[changed] = call_oi[changed]
+            self.put_oi[changed] = put_oi[changed]
+            self.max_pain_strike, self.pain = max_pain(self.strikes, self.call_oi, self.put_oi)
+        self.changed_strikes = self.strikes[changed]
+        return self.summary()
+
+    def summary(self):
+        """
+        PCR (put OI / call OI), max pain, the highest put/call OI strikes as
+        support/resistance and their OI-weighted averages.
+        """
+        calls, puts = self.totals['call'], self.totals['put']
+        has_oi = len(self.strikes) > 0
+        return {
+            'pcr': puts / calls if calls else np.nan,
+            'max_pain': self.max_pain_strike,
+            'support': self.strikes[np.argmax(self.put_oi)] if has_oi else np.nan,
+            'resistance': self.strikes[np.argmax(self.call_oi)] if has_oi else np.nan,
+            'support_weighted': self.totals['put_strike'] / puts if puts else np.nan,
+            'resistance_weighted': self.totals['call_strike'] / calls if calls else np.nan,
+            'changed_strikes': len(self.changed_strikes),
+        }
+
+    def oi_change(self):
+        """per strike OI, change since the first snapshot and change in the last update"""
+        return pd.DataFrame({
+            'strike': self.strikes,
+            'call_oi': self.call_oi,
+            'put_oi': self.put_oi,
+            'call_oi_change': self.call_oi - self.open_call_oi,
+            'put_oi_change': self.put_oi - self.open_put_oi,
+            'call_oi_last_change': self.last_call_change,
+            'put_oi_last_change': self.last_put_change,
+        })
@@ -0,0 +1,240 @@
+"""
+Pooled, cached NSE option-chain client and poll scheduler.
+
+OptionChainClient keeps one keep-alive requests.Session, primes the NSE
+cookies from the option-chain page once (and again after a 401/403),
+revalidates with ETag/Last-Modified and caches each symbol's chain for `ttl`
+seconds. Concurrent callers asking for the same symbol share one in-flight
+request. ChainPoller refreshes a set of symbols on a fixed interval and
+hands every new chain to its subscribers.
+
+ReplayServer is a local HTTP stand-in that serves saved option-chain JSON
+responses, so the client can run against it instead of nseindia.com:
+
+    server = ReplayServer.from_dir("saved_chains").start()
+    client = OptionChainClient(base_url=server.url)
+"""
+
+import os
+import json
+import glob
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+import requests
+from requests.adapters import HTTPAdapter
+
+NSE_BASE_URL = "https://www.nseindia.com"
+PRIME_PATH = "/option-chain"
+CHAIN_PATH = "/api/option-chain-indices"
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0",
+    "Accept": "application/json, text/plain, */*",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Referer": NSE_BASE_URL + PRIME_PATH,
+}
+
+
+class OptionChainClient:
+    """thread-safe option-chain fetcher with cookie priming, TTL cache and single-flight requests"""
+
+    def __init__(self, base_url=NSE_BASE_URL, ttl=3.0, timeout=10, pool_size=4, session=None):
+        self.base_url = base_url.rstrip("/")
+        self.ttl = ttl
+        self.timeout = timeout
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+        session.headers.update(HEADERS)
+        self.session = session
+        self.primed = False
+        self.cache = {}       # symbol -> (fetched_at, data, validators)
+        self.stats = {'requests': 0, 'cache_hits': 0, 'not_modified': 0, 'primes': 0}
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+        self._prime_lock = threading.Lock()
+
+    def _lock(self, symbol):
+        with self._locks_guard:
+            return self._locks.setdefault(symbol, threading.Lock())
+
+    def prime(self):
+        """load the option-chain page so the session carries the cookies the API expects"""
+        with self._prime_lock:
+            self.session.get(self.base_url + PRIME_PATH, timeout=self.timeout)
+            self.stats['primes'] += 1
+            self.primed = True
+
+    def _request(self, symbol, validators):
+        headers = {}
+        if 'ETag' in validators:
+            headers['If-None-Match'] = validators['ETag']
+        if 'Last-Modified' in validators:
+            headers['If-Modified-Since'] = validators['Last-Modified']
+        self.stats['requests'] += 1
+        return self.session.get(self.base_url + CHAIN_PATH, params={'symbol': symbol},
+                                headers=headers, timeout=self.timeout)
+
+    def get(self, symbol, max_age=None):
+        """
+        Option-chain JSON for symbol, at most max_age (default ttl) seconds
+        old. Raises requests.HTTPError if NSE refuses the request.
+        """
+        if max_age is None:
+            max_age = self.ttl
+        with self._lock(symbol):
+            cached = self.cache.get(symbol)
+            if cached is not None and time.monotonic() - cached[0] < max_age:
+                self.stats['cache_hits'] += 1
+                return cached[1]
+
+            if not self.primed:
+                self.prime()
+            validators = cached[2] if cached is not None else {}
+            response = self._request(symbol, validators)
+            if response.status_code in (401, 403):
+                # cookies expired, prime again and retry once
+                self.prime()
+                response = self._request(symbol, validators)
+
+            if response.status_code == 304 and cached is not None:
+                self.stats['not_modified'] += 1
+                data = cached[1]
+            else:
+                response.raise_for_status()
+                data = response.json()
+                validators = {key: response.headers[key] for key in ('ETag', 'Last-Modified') if key in response.headers}
+            self.cache[symbol] = (time.monotonic(), data, validators)
+            return data
+
+
+class ChainPoller:
+    """
+    Background thread refreshing `symbols` every `interval` seconds through
+    one OptionChainClient. subscribe(callback) registers a
+    callback(symbol, data) that runs after every fetch; latest(symbol)
+    returns the last chain without touching the network.
+    """
+
+    def __init__(self, client, symbols, interval=3.0):
+        self.client = client
+        self.symbols = list(symbols)
+        self.interval = interval
+        self.callbacks = []
+        self.latest_data = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def subscribe(self, callback):
+        self.callbacks.append(callback)
+
+    def latest(self, symbol):
+        return self.latest_data.get(symbol)
+
+    def poll_once(self):
+        for symbol in self.symbols:
+            try:
+                data = self.client.get(symbol, max_age=self.interval / 2)
+            except requests.RequestException as e:
+                print("Option chain poll failed for", symbol, e)
+                continue
+            self.latest_data[symbol] = data
+            for callback in self.callbacks:
+                callback(symbol, data)
+
+    def _run(self):
+        next_poll = time.monotonic()
+        while not self._stop.is_set():
+            self.poll_once()
+            next_poll += self.interval
+            self._stop.wait(max(0.0, next_poll - time.monotonic()))
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+
+class ReplayServer:
+    """
+    Local stand-in for nseindia.com serving saved option-chain responses.
+    responses maps symbol -> list of JSON payloads; each API call returns
+    the next payload (the last one repeats). Like NSE, the API answers 401
+    until the option-chain page has set a cookie, and 304 when the client's
+    If-None-Match matches the current payload.
+    """
+
+    def __init__(self, responses, port=0):
+        self.responses = {symbol: list(payloads) for symbol, payloads in responses.items()}
+        self.position = {symbol: 0 for symbol in self.responses}
+        self.hits = 0
+        replay = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status, body=b"", headers=None):
+                self.send_response(status)
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                if url.path == PRIME_PATH:
+                    self._send(200, b"<html></html>", {"Set-Cookie": "nsit=replay; Path=/"})
+                    return
+                if url.path != CHAIN_PATH or "nsit=replay" not in self.headers.get("Cookie", ""):
+                    self._send(401)
+                    return
+                symbol = parse_qs(url.query).get("symbol", [""])[0]
+                replay.hits += 1
+                body, etag = replay.next_payload(symbol)
+                if body is None:
+                    self._send(404)
+                elif self.headers.get("If-None-Match") == etag:
+                    self._send(304, headers={"ETag": etag})
+                else:
+                    self._send(200, body, {"Content-Type": "application/json", "ETag": etag})
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self.url = "http://127.0.0.1:{}".format(self.server.server_address[1])
+
+    @classmethod
+    def from_dir(cls, path, port=0):
+        """responses from <path>/<SYMBOL>*.json files, replayed in name order"""
+        responses = {}
+        for file_path in sorted(glob.glob(os.path.join(path, "*.json"))):
+            symbol = os.path.basename(file_path).split("_")[0].split(".")[0]
+            with open(file_path) as f:
+                responses.setdefault(symbol, []).append(json.load(f))
+        return cls(responses, port)
+
+    def next_payload(self, symbol):
+        payloads = self.responses.get(symbol)
+        if not payloads:
+            return None, None
+        i = min(self.position[symbol], len(payloads) - 1)
+        self.position[symbol] += 1
+        return json.dumps(payloads[i]).encode(), '"{}-{}"'.format(symbol, i)
+
+    def start(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,347 @@
+"""
+Columnar option chain records and a binary snapshot store.
+
+flatten_chain() turns the NSE option-chain payload (one dict per strike with
+nested CE/PE dicts) into one typed structured array with a row per
+strike/expiry/side. ChainSnapshotStore appends every polled chain to
+per-symbol, per-day files:
+
+    option_chain_store/NIFTY/2025-07-01.keys    CHAIN_DTYPE rows of the keyframe snapshots
+    option_chain_store/NIFTY/2025-07-01.cells   zlib block per snapshot of the cells it changed
+    option_chain_store/NIFTY/2025-07-01.snap    SNAPSHOT_DTYPE entry per snapshot
+
+Between keyframes only the (row, field) cells that changed since the previous
+snapshot are stored, as integer differences (prices and IV in hundredths)
+packed column by column with int16 diffs and compressed, so a day of 3
+second polls of an 85 strike chain is about 4 MB. A chain at any time is its
+keyframe plus the summed cells since, and a per-strike series is a cumsum
+over that strike's cells, all without text parsing.
+"""
+
+import os
+import sys
+import ast
+import zlib
+import datetime as dt
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from fyers_epoch import ist_date, ist_midnight
+
+SIDES = ('CE', 'PE')
+
+# (column, NSE key, dtype)
+CHAIN_FIELDS = [
+    ('oi', 'openInterest', np.int64),
+    ('chg_oi', 'changeinOpenInterest', np.int64),
+    ('volume', 'totalTradedVolume', np.int64),
+    ('iv', 'impliedVolatility', np.float32),
+    ('ltp', 'lastPrice', np.float64),
+    ('bid', 'bidprice', np.float64),
+    ('ask', 'askPrice', np.float64),
+    ('bid_qty', 'bidQty', np.int64),
+    ('ask_qty', 'askQty', np.int64),
+]
+CHAIN_DTYPE = np.dtype([('strike', '<f8'), ('expiry', '<M8[D]'), ('side', 'i1')]
+                       + [(name, np.dtype(dtype).newbyteorder('<')) for name, key, dtype in CHAIN_FIELDS])
+# a snapshot's chain is its keyframe rows plus the delta cells of every snapshot since the keyframe,
+# delta_start/delta_bytes locate the snapshot's compressed block in the .cells file
+SNAPSHOT_DTYPE = np.dtype([('timestamp', '<i8'), ('underlying', '<f8'), ('key_start', '<i8'), ('key_count', '<i8'),
+                           ('delta_start', '<i8'), ('delta_bytes', '<i8'), ('delta_count', '<i8')])
+# change of one field of one row, in FIELD_SCALE units
+DELTA_DTYPE = np.dtype([('row', '<u2'), ('field', 'u1'), ('diff', '<i4')])
+# diffs outside int16 are stored as this marker plus the int32 value after the block's columns
+NARROW_ESCAPE = np.iinfo(np.int16).min
+FIELD_SCALE = {'iv': 100, 'ltp': 100, 'bid': 100, 'ask': 100}
+KEYFRAME_EVERY = 300
+
+
+def parse_expiry(expiry):
+    """'03-Jul-2025' -> numpy day"""
+    return np.datetime64(dt.datetime.strptime(expiry, "%d-%b-%Y").date(), 'D')
+
+
+def parse_chain_timestamp(text):
+    """NSE records timestamp ('01-Jul-2025 15:30:00', IST) -> epoch seconds"""
+    when = dt.datetime.strptime(text, "%d-%b-%Y %H:%M:%S")
+    return ist_midnight(when.date()) + when.hour * 3600 + when.minute * 60 + when.second
+
+
+def flatten_chain(records, expiry=None):
+    """
+    NSE option-chain records (data['records']['data']) -> CHAIN_DTYPE array
+    sorted by expiry, strike and side. expiry ('DD-Mmm-YYYY') keeps a single
+    expiry. Sides missing from a record are left out.
+    """
+    rows = []
+    for record in records:
+        if expiry is not None and record.get("expiryDate") != expiry:
+            continue
+        for side, name in enumerate(SIDES):
+            leg = record.get(name)
+            if leg:
+                rows.append((record['strikePrice'], record['expiryDate'], side, leg))
+
+    chain = np.zeros(len(rows), dtype=CHAIN_DTYPE)
+    if not rows:
+        return chain
+    chain['strike'] = [row[0] for row in rows]
+    expiries = {text: parse_expiry(text) for text in set(row[1] for row in rows)}
+    chain['expiry'] = [expiries[row[1]] for row in rows]
+    chain['side'] = [row[2] for row in rows]
+    for name, key, dtype in CHAIN_FIELDS:
+        chain[name] = [row[3].get(key) or 0 for row in rows]
+    return chain[np.lexsort((chain['side'], chain['strike'], chain['expiry']))]
+
+
+def chain_to_frame(chain):
+    """CHAIN_DTYPE array as a DataFrame with CE/PE labels"""
+    df = pd.DataFrame({name: chain[name] for name in CHAIN_DTYPE.names})
+    df['side'] = np.array(SIDES)[chain['side']]
+    return df
+
+
+def read_option_chain_csv(path):
+    """legacy option_chain_data.csv (CE/PE dicts as repr strings) -> CHAIN_DTYPE array"""
+    df = pd.read_csv(path)
+    records = []
+    for row in df.itertuples(index=False):
+        record = {'strikePrice': row.strikePrice, 'expiryDate': row.expiryDate}
+        for name in SIDES:
+            cell = getattr(row, name)
+            if isinstance(cell, str):
+                record[name] = ast.literal_eval(cell)
+        records.append(record)
+    return flatten_chain(records)
+
+
+def _scaled(values, name):
+    """field values as integers (prices and IV in hundredths)"""
+    return np.round(np.asarray(values, dtype=np.float64) * FIELD_SCALE.get(name, 1)).astype(np.int64)
+
+
+def _unscaled(values, name):
+    return (values / FIELD_SCALE.get(name, 1)).astype(CHAIN_DTYPE[name])
+
+
+def _whole_records(path, dtype):
+    """
+    number of complete dtype records in path; a partial record left by an
+    interrupted write is cut off so the next append starts on a record boundary
+    """
+    if not os.path.isfile(path):
+        return 0
+    size = os.path.getsize(path)
+    count = size // dtype.itemsize
+    if size != count * dtype.itemsize:
+        os.truncate(path, count * dtype.itemsize)
+    return count
+
+
+def _read_records(path, dtype):
+    """whole dtype records of path, an append may be in progress"""
+    return np.fromfile(path, dtype=dtype, count=os.path.getsize(path) // dtype.itemsize)
+
+
+def _map_records(path, dtype):
+    """read-only memory map of the whole dtype records of path"""
+    count = os.path.getsize(path) // dtype.itemsize if os.path.isfile(path) else 0
+    if not count:
+        return np.empty(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode='r', shape=(count,))
+
+
+def _same_rows(a, b):
+    return (len(a) == len(b) and np.array_equal(a['strike'], b['strike'])
+            and np.array_equal(a['expiry'], b['expiry']) and np.array_equal(a['side'], b['side']))
+
+
+def chain_delta(previous, chain):
+    """
+    DELTA_DTYPE cells (row, field, change) turning previous into chain, or
+    None if the rows differ or a change does not fit the cell.
+    """
+    if not _same_rows(previous, chain) or len(chain) > np.iinfo(np.uint16).max:
+        return None
+    cells = []
+    for field, (name, key, dtype) in enumerate(CHAIN_FIELDS):
+        diff = _scaled(chain[name], name) - _scaled(previous[name], name)
+        rows = np.flatnonzero(diff)
+        if len(rows) and np.abs(diff[rows]).max() > np.iinfo(np.int32).max:
+            return None
+        part = np.empty(len(rows), dtype=DELTA_DTYPE)
+        part['row'] = rows
+        part['field'] = field
+        part['diff'] = diff[rows]
+        cells.append(part)
+    return np.concatenate(cells)
+
+
+def encode_cells(cells):
+    """
+    DELTA_DTYPE cells -> compressed block: rows, fields and int16 diffs as
+    separate columns, then the int32 value of every escaped diff
+    """
+    diff = cells['diff'].astype(np.int64)
+    wide = (diff <= NARROW_ESCAPE) | (diff > np.iinfo(np.int16).max)
+    narrow = np.where(wide, NARROW_ESCAPE, diff)
+    return zlib.compress(cells['row'].astype('<u2').tobytes() + cells['field'].astype('u1').tobytes()
+                         + narrow.astype('<i2').tobytes() + diff[wide].astype('<i4').tobytes())
+
+
+def decode_cells(block, count):
+    """compressed block of count cells -> DELTA_DTYPE array"""
+    raw = zlib.decompress(block)
+    cells = np.empty(count, dtype=DELTA_DTYPE)
+    cells['row'] = np.frombuffer(raw, dtype='<u2', count=count)
+    cells['field'] = np.frombuffer(raw, dtype='u1', count=count, offset=2 * count)
+    narrow = np.frombuffer(raw, dtype='<i2', count=count, offset=3 * count)
+    wide = narrow == NARROW_ESCAPE
+    cells['diff'] = narrow
+    cells['diff'][wide] = np.frombuffer(raw, dtype='<i4', count=int(wide.sum()), offset=5 * count)
+    return cells
+
+
+class ChainSnapshotStore:
+    """
+    Delta-compressed daily files of option chain snapshots per symbol.
+
+    Every keyframe_every-th snapshot (and any snapshot whose strikes differ
+    from the keyframe) is stored in full; the ones in between only store the
+    cells that changed since the previous snapshot. The last chain per
+    symbol is kept in memory to compute the next delta, after a restart the
+    first snapshot is a keyframe.
+    """
+
+    def __init__(self, root="option_chain_store", keyframe_every=KEYFRAME_EVERY):
+        self.root = root
+        self.keyframe_every = keyframe_every
+        self._last = {}  # symbol -> (day, chain, snapshots since keyframe, key_start)
+
+    def _base(self, symbol, day):
+        return os.path.join(self.root, symbol, day.isoformat())
+
+    def append(self, symbol, timestamp, chain, underlying=np.nan):
+        """
+        Append one snapshot. Keyframe rows and the cell block are written
+        before the index entry, so an interrupted append is never visible to
+        readers.
+        """
+        chain = np.asarray(chain, dtype=CHAIN_DTYPE)
+        day = ist_date(timestamp)
+        base = self._base(symbol, day)
+        os.makedirs(os.path.dirname(base), exist_ok=True)
+        _whole_records(base + ".snap", SNAPSHOT_DTYPE)
+        key_start = _whole_records(base + ".keys", CHAIN_DTYPE)
+        # bytes past the last indexed block are an interrupted append, the index never points at them
+        delta_start = os.path.getsize(base + ".cells") if os.path.isfile(base + ".cells") else 0
+
+        last = self._last.get(symbol)
+        delta = None
+        if last is not None and last[0] == day and last[2] + 1 < self.keyframe_every:
+            delta = chain_delta(last[1], chain)
+
+        if delta is None:
+            with open(base + ".keys", 'ab') as f:
+                chain.tofile(f)
+            entry = (timestamp, underlying, key_start, len(chain), delta_start, 0, 0)
+            self._last[symbol] = (day, chain, 0, key_start)
+        else:
+            block = encode_cells(delta)
+            with open(base + ".cells", 'ab') as f:
+                f.write(block)
+            entry = (timestamp, underlying, last[3], len(chain), delta_start, len(block), len(delta))
+            self._last[symbol] = (day, chain, last[2] + 1, last[3])
+        with open(base + ".snap", 'ab') as f:
+            np.array([entry], dtype=SNAPSHOT_DTYPE).tofile(f)
+
+    def _index(self, symbol, day):
+        """(snapshot index, keyframe rows) of one day, both empty when nothing is stored"""
+        base = self._base(symbol, day)
+        if not os.path.isfile(base + ".snap"):
+            return np.empty(0, dtype=SNAPSHOT_DTYPE), np.empty(0, dtype=CHAIN_DTYPE)
+        return _read_records(base + ".snap", SNAPSHOT_DTYPE), _map_records(base + ".keys", CHAIN_DTYPE)
+
+    def _cells(self, symbol, day, index, first, end):
+        """delta cells of snapshots first..end-1 back to back"""
+        counts = index['delta_count'][first:end]
+        if not counts.sum():
+            return np.empty(0, dtype=DELTA_DTYPE)
+        starts = index['delta_start'][first:end]
+        blocks = index['delta_bytes'][first:end]
+        with open(self._base(symbol, day) + ".cells", 'rb') as f:
+            f.seek(starts[0])
+            raw = f.read(starts[-1] + blocks[-1] - starts[0])
+        offsets = starts - starts[0]
+        return np.concatenate([decode_cells(raw[offset:offset + size], count)
+                               for offset, size, count in zip(offsets, blocks, counts) if count])
+
+    def day(self, symbol, day):
+        """
+        (snapshot index, keyframe rows, delta cells) of one day; rows are a
+        read-only memory map, cells are decoded for all snapshots back to back.
+        """
+        index, keys = self._index(symbol, day)
+        return index, keys, self._cells(symbol, day, index, 0, len(index))
+
+    def snapshot(self, symbol, timestamp):
+        """(timestamp, underlying, chain) of the latest snapshot at or before timestamp, or None"""
+        day = ist_date(timestamp)
+        index, keys = self._index(symbol, day)
+        i = np.searchsorted(index['timestamp'], timestamp, side='right') - 1
+        if i < 0:
+            return None
+        first = np.searchsorted(index['key_start'], index['key_start'][i], side='left')
+        cells = self._cells(symbol, day, index, first, i + 1)
+
+        start, count = index['key_start'][i], index['key_count'][i]
+        chain = np.array(keys[start:start + count])
+        for field, (name, key, dtype) in enumerate(CHAIN_FIELDS):
+            picked = cells[cells['field'] == field]
+            values = _scaled(chain[name], name)
+            np.add.at(values, picked['row'].astype(np.int64), picked['diff'])
+            chain[name] = _unscaled(values, name)
+        return int(index['timestamp'][i]), float(index['underlying'][i]), chain
+
+    def series(self, symbol, day, strike, side, fields=('oi', 'iv', 'ltp'), expiry=None):
+        """
+        DataFrame of `fields` over the day for one strike/side (side is 'CE'
+        or 'PE'), one row per snapshot (NaN where the strike was not listed).
+        Pass expiry ('DD-Mmm-YYYY') when the snapshots hold more than one expiry.
+        """
+        index, keys, cells = self.day(symbol, day)
+        n = len(index)
+        cell_snapshot = np.repeat(np.arange(n), index['delta_count'])
+
+        # keyframe segments are runs of snapshots sharing key_start; find the strike's row in each
+        bounds = np.concatenate([[0], np.flatnonzero(np.diff(index['key_start'])) + 1, [n]])
+        target = np.full(len(bounds) - 1, -1)
+        for segment, first in enumerate(bounds[:-1]):
+            start, count = index['key_start'][first], index['key_count'][first]
+            rows = keys[start:start + count]
+            mask = (rows['strike'] == strike) & (rows['side'] == SIDES.index(side))
+            if expiry is not None:
+                mask &= rows['expiry'] == parse_expiry(expiry)
+            found = np.flatnonzero(mask)
+            if len(found):
+                target[segment] = found[0]
+        segment_of = np.repeat(np.arange(len(target)), np.diff(bounds))
+        match = cells['row'] == target[segment_of[cell_snapshot]]
+        cells, cell_snapshot = cells[match], cell_snapshot[match]
+
+        df = pd.DataFrame({'timestamp': index['timestamp']})
+        for name in fields:
+            field = [field_name for field_name, key, dtype in CHAIN_FIELDS].index(name)
+            picked = cells['field'] == field
+            changes = np.zeros(n, dtype=np.int64)
+            np.add.at(changes, cell_snapshot[picked], cells['diff'][picked])
+            values = np.full(n, np.nan)
+            for segment, (first, end) in enumerate(zip(bounds[:-1], bounds[1:])):
+                if target[segment] < 0:
+                    continue
+                start = index['key_start'][first]
+                base = _scaled(keys[start + target[segment]][name], name)
+                values[first:end] = _unscaled(base + np.cumsum(changes[first:end]), name)
+            df[name] = values
+        return df
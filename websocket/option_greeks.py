@@ -0,0 +1,160 @@
+"""
+Vectorized Black-Scholes implied volatility and Greeks for a whole option chain.
+
+Every function takes numpy arrays (or scalars) and works element-wise, so
+one call covers all strikes and expiries of a chain. implied_vol() runs
+Newton steps on vega and falls back to bisection inside a shrinking bracket
+whenever a Newton step leaves it, which keeps deep ITM/OTM strikes (tiny
+vega) from diverging. It stops on the change in volatility, not in price,
+so a tiny vega cannot end the search early. The normal CDF uses a rational erfc approximation
+(fractional error < 1.2e-7), so no scipy is needed.
+"""
+
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from fyers_epoch import DAY, IST_OFFSET
+
+RISK_FREE_RATE = 0.065          # annualised, continuously compounded
+EXPIRY_TIME = 15 * 3600 + 1800  # options expire at 15:30 IST
+YEAR = 365 * DAY
+MIN_VOL, MAX_VOL = 1e-6, 10.0
+
+
+def norm_pdf(x):
+    return np.exp(-0.5 * x * x) / np.sqrt(2 * np.pi)
+
+
+def norm_cdf(x):
+    """standard normal CDF via the Numerical Recipes erfc approximation"""
+    z = np.abs(x) / np.sqrt(2)
+    t = 1.0 / (1.0 + 0.5 * z)
+    poly = (-z * z - 1.26551223 + t * (1.00002368 + t * (0.37409196 + t * (0.09678418 + t * (-0.18628806
+            + t * (0.27886807 + t * (-1.13520398 + t * (1.48851587 + t * (-0.82215223 + t * 0.17087277)))))))))
+    erfc = t * np.exp(poly)
+    return np.where(x >= 0, 1.0 - 0.5 * erfc, 0.5 * erfc)
+
+
+def _d1_d2(spot, strike, years, rate, vol):
+    sqrt_t = np.sqrt(years)
+    d1 = (np.log(spot / strike) + (rate + 0.5 * vol * vol) * years) / (vol * sqrt_t)
+    return d1, d1 - vol * sqrt_t
+
+
+def bs_price(spot, strike, years, rate, vol, is_call):
+    """Black-Scholes price; is_call is a bool array (False = put)"""
+    d1, d2 = _d1_d2(spot, strike, years, rate, vol)
+    discount = strike * np.exp(-rate * years)
+    call = spot * norm_cdf(d1) - discount * norm_cdf(d2)
+    put = discount * norm_cdf(-d2) - spot * norm_cdf(-d1)
+    return np.where(is_call, call, put)
+
+
+def bs_vega(spot, strike, years, rate, vol):
+    """price change per 1.0 (100 points) of volatility"""
+    d1, d2 = _d1_d2(spot, strike, years, rate, vol)
+    return spot * norm_pdf(d1) * np.sqrt(years)
+
+
+def implied_vol(price, spot, strike, years, rate=RISK_FREE_RATE, is_call=True, tol=1e-8, max_iter=100):
+    """
+    Implied volatility (annualised, 0.15 = 15%) of every option, solved to
+    within tol in volatility. Prices outside the no-arbitrage bounds,
+    expired options and zero prices are NaN.
+    """
+    price, spot, strike, years, is_call = np.broadcast_arrays(
+        np.asarray(price, dtype=np.float64), np.asarray(spot, dtype=np.float64),
+        np.asarray(strike, dtype=np.float64), np.asarray(years, dtype=np.float64), np.asarray(is_call, dtype=bool))
+    discount = strike * np.exp(-rate * np.maximum(years, 0))
+    lower = np.where(is_call, np.maximum(spot - discount, 0), np.maximum(discount - spot, 0))
+    upper = np.where(is_call, spot, discount)
+    valid = (years > 0) & (price > 0) & (price > lower) & (price < upper)
+
+    # solve on the out of the money side (put-call parity): its price is all
+    # time value, so no digits are lost to the intrinsic value
+    otm_call = spot <= discount
+    otm_price = np.where(is_call == otm_call, price, price + np.where(is_call, discount - spot, spot - discount))
+
+    # Brenner-Subrahmanyam near the money, the vega peak sqrt(2|ln(F/K)|/t)
+    # away from it; Newton from there does not overshoot
+    safe_years = np.where(valid, years, 1.0)
+    moneyness = np.abs(np.log(spot / strike) + rate * safe_years)
+    vol = np.maximum(np.sqrt(2 * np.pi / safe_years) * otm_price / spot, np.sqrt(2 * moneyness / safe_years))
+    vol = np.clip(vol, MIN_VOL, MAX_VOL)
+    lo = np.full(price.shape, MIN_VOL)
+    hi = np.full(price.shape, MAX_VOL)
+    active = valid.copy()
+
+    for _ in range(max_iter):
+        if not active.any():
+            break
+        s, k, t, c, v = spot[active], strike[active], safe_years[active], otm_call[active], vol[active]
+        diff = bs_price(s, k, t, rate, v, c) - otm_price[active]
+        vega = bs_vega(s, k, t, rate, v)
+
+        # shrink the bracket around the root
+        lo[active] = np.where(diff < 0, v, lo[active])
+        hi[active] = np.where(diff > 0, v, hi[active])
+
+        newton = v - diff / np.where(vega > 0, vega, np.nan)
+        inside = np.isfinite(newton) & (newton > lo[active]) & (newton < hi[active])
+        step = np.where(inside, newton, 0.5 * (lo[active] + hi[active]))
+
+        # converged once the volatility itself stops moving
+        done = (diff == 0) | (inside & (np.abs(newton - v) < tol)) | (hi[active] - lo[active] < tol)
+        vol[active] = np.where(done & ~inside, v, step)
+        active[active] = ~done
+
+    return np.where(valid, vol, np.nan)
+
+
+def greeks(spot, strike, years, vol, rate=RISK_FREE_RATE, is_call=True):
+    """
+    dict of delta, gamma, theta (per calendar day) and vega (per 1 point of
+    volatility, i.e. 1%) arrays.
+    """
+    spot, strike, years, vol, is_call = np.broadcast_arrays(
+        np.asarray(spot, dtype=np.float64), np.asarray(strike, dtype=np.float64),
+        np.asarray(years, dtype=np.float64), np.asarray(vol, dtype=np.float64), np.asarray(is_call, dtype=bool))
+    d1, d2 = _d1_d2(spot, strike, years, rate, vol)
+    sqrt_t = np.sqrt(years)
+    pdf = norm_pdf(d1)
+    discount = strike * np.exp(-rate * years)
+    decay = -spot * pdf * vol / (2 * sqrt_t)
+    theta = np.where(is_call, decay - rate * discount * norm_cdf(d2), decay + rate * discount * norm_cdf(-d2))
+    return {
+        'delta': np.where(is_call, norm_cdf(d1), norm_cdf(d1) - 1),
+        'gamma': pdf / (spot * vol * sqrt_t),
+        'theta': theta / 365,
+        'vega': spot * pdf * sqrt_t / 100,
+    }
+
+
+def years_to_expiry(expiry, timestamp):
+    """years from epoch timestamp to 15:30 IST of each expiry day (datetime64[D] array)"""
+    expiry_ts = np.asarray(expiry, dtype='datetime64[D]').astype(np.int64) * DAY - IST_OFFSET + EXPIRY_TIME
+    return (expiry_ts - timestamp) / YEAR
+
+
+def chain_greeks(chain, spot, timestamp, rate=RISK_FREE_RATE):
+    """
+    IV and Greeks for a CHAIN_DTYPE array (see option_chain_store) priced
+    at its LTP, with spot the underlying value at epoch `timestamp`.
+    Returns a DataFrame with strike, expiry, side, ltp, iv (in %) and the Greeks.
+    """
+    is_call = chain['side'] == 0
+    years = years_to_expiry(chain['expiry'], timestamp)
+    vol = implied_vol(chain['ltp'], spot, chain['strike'], years, rate, is_call)
+    df = pd.DataFrame({
+        'strike': chain['strike'],
+        'expiry': chain['expiry'],
+        'side': np.where(is_call, 'CE', 'PE'),
+        'ltp': chain['ltp'],
+        'iv': vol * 100,
+    })
+    for name, values in greeks(spot, chain['strike'], years, vol, rate, is_call).items():
+        df[name] = values
+    return df
@@ -0,0 +1,132 @@
+"""
+Batch ATM/OTM strike selection for many underlyings at once.
+
+StrikeTable is built once from an InstrumentMaster for a set of underlyings
+and their nearest K expiries. All strike grids are laid out in one sorted
+array of composite keys (group * KEY_SCALE + strike, a group being one
+underlying/expiry), so resolving ATM +/- N strikes for every underlying on a
+spot tick is a single searchsorted over that array plus fancy indexing,
+with no per-underlying loop.
+"""
+
+import numpy as np
+import pandas as pd
+
+KEY_SCALE = 1e7  # larger than any listed strike
+
+SPOT_SYMBOLS = {
+    'NIFTY': 'NSE:NIFTY50-INDEX',
+    'BANKNIFTY': 'NSE:NIFTYBANK-INDEX',
+    'FINNIFTY': 'NSE:FINNIFTY-INDEX',
+    'MIDCPNIFTY': 'NSE:MIDCPNIFTY-INDEX',
+}
+
+
+def spot_symbol(underlying):
+    """quote symbol of an option underlying (index or NSE equity)"""
+    return SPOT_SYMBOLS.get(underlying, "NSE:{}-EQ".format(underlying))
+
+
+class StrikeTable:
+    """
+    Strike grids of `underlyings` for their nearest `expiries` expiries.
+
+    Per group g (underlying index * expiries + expiry rank) the listed
+    strikes occupy strikes[start[g]:end[g]], and ce_pos/pe_pos give the row
+    of the matching contract in master.df (-1 where only one side is listed).
+    """
+
+    def __init__(self, master, underlyings, expiries=1, today=None):
+        self.master = master
+        self.underlyings = list(underlyings)
+        self.n_expiries = expiries
+        n_groups = len(self.underlyings) * expiries
+        self.expiry = np.full(n_groups, np.datetime64('NaT'), dtype='datetime64[ns]')
+        self.start = np.zeros(n_groups, dtype=np.int64)
+        self.end = np.zeros(n_groups, dtype=np.int64)
+
+        grids, ce_pos, pe_pos = [], [], []
+        size = 0
+        for u, underlying in enumerate(self.underlyings):
+            listed = master.expiries(underlying, "CE", today)
+            for k, expiry in enumerate(listed[:expiries]):
+                g = u * expiries + k
+                grid = np.union1d(master.strikes(underlying, expiry, "CE"), master.strikes(underlying, expiry, "PE"))
+                self.expiry[g] = expiry
+                self.start[g], self.end[g] = size, size + len(grid)
+                size += len(grid)
+                grids.append(grid)
+                ce_pos.append(self._positions(underlying, "CE", expiry, grid))
+                pe_pos.append(self._positions(underlying, "PE", expiry, grid))
+
+        if not grids:
+            raise ValueError("No listed options for {}".format(self.underlyings))
+        self.strikes = np.concatenate(grids)
+        self.ce_pos = np.concatenate(ce_pos)
+        self.pe_pos = np.concatenate(pe_pos)
+        group = np.repeat(np.arange(n_groups), self.end - self.start)
+        self.keys = group * KEY_SCALE + self.strikes
+
+    def _positions(self, underlying, option_type, expiry, grid):
+        lo, hi = self.master._expiry_range(underlying, option_type, expiry)
+        listed = self.master.strike_values[lo:hi]
+        i = np.minimum(np.searchsorted(listed, grid), max(len(listed) - 1, 0))
+        found = listed[i] == grid if len(listed) else np.zeros(len(grid), dtype=bool)
+        return np.where(found, lo + i, -1)
+
+    def select(self, spots, n_strikes=2):
+        """
+        spots: array of spot prices aligned with self.underlyings.
+        Returns dict of (groups, 2N+1) arrays: 'strike', 'ce_pos', 'pe_pos'
+        and 'valid' (False past the edge of a grid or for a missing expiry),
+        plus the per-group 'atm' strike. Offset j - N is j strikes above ATM.
+        """
+        spot = np.repeat(np.asarray(spots, dtype=np.float64), self.n_expiries)
+        group = np.arange(len(spot))
+        has_grid = (self.end > self.start) & np.isfinite(spot)
+        last = np.maximum(self.end - 1, self.start)
+
+        # nearest listed strike: compare the neighbours around the insertion point
+        i = np.searchsorted(self.keys, group * KEY_SCALE + np.nan_to_num(spot))
+        above = np.clip(i, self.start, last)
+        below = np.clip(i - 1, self.start, last)
+        atm = np.where(np.abs(self.strikes[below] - spot) < np.abs(self.strikes[above] - spot), below, above)
+
+        idx = atm[:, None] + np.arange(-n_strikes, n_strikes + 1)
+        valid = has_grid[:, None] & (idx >= self.start[:, None]) & (idx < self.end[:, None])
+        idx = np.where(valid, idx, 0)
+        return {
+            'atm': np.where(has_grid, self.strikes[atm], np.nan),
+            'strike': np.where(valid, self.strikes[idx], np.nan),
+            'ce_pos': np.where(valid, self.ce_pos[idx], -1),
+            'pe_pos': np.where(valid, self.pe_pos[idx], -1),
+            'valid': valid,
+        }
+
+    def select_frame(self, spots, n_strikes=2):
+        """
+        select() as a long DataFrame: one row per underlying/expiry/offset
+        with the strike and the CE/PE tickers. spots may be a dict keyed by
+        underlying.
+        """
+        if isinstance(spots, dict):
+            spots = [spots.get(underlying, np.nan) for underlying in self.underlyings]
+        picked = self.select(spots, n_strikes)
+        groups, width = picked['strike'].shape
+        rows = picked['valid'].ravel()
+        tickers = self.master.df['ticker'].to_numpy()
+
+        def ticker(pos):
+            pos = pos.ravel()[rows]
+            return np.where(pos >= 0, tickers[np.maximum(pos, 0)], None)
+
+        group = np.repeat(np.arange(groups), width)[rows]
+        return pd.DataFrame({
+            'symbol': np.array(self.underlyings, dtype=object)[group // self.n_expiries],
+            'expiry': self.expiry[group],
+            'expiry_rank': group % self.n_expiries,
+            'offset': np.tile(np.arange(-n_strikes, n_strikes + 1), groups)[rows],
+            'strike': picked['strike'].ravel()[rows],
+            'CE': ticker(picked['ce_pos']),
+            'PE': ticker(picked['pe_pos']),
+        })